@@ -0,0 +1,89 @@
+"""
+DataDungeon — Sampling Strategy Benchmark
+
+Compares the Monte Carlo sampling strategies in services/sampling.py on a project
+whose failure probability sits near the 15% threshold, where estimator noise
+decides the verdict.
+
+For each strategy and run count it repeats the estimate with independent seeds,
+then reports:
+  - standard error of p_failure across the repeats
+  - wall-clock milliseconds per estimate (sampling + evaluation, no caches)
+  - efficiency = 1 / (standard_error² × ms) — higher is better. It is invariant to
+    run count for plain Monte Carlo, so it says directly how much accuracy each
+    millisecond of compute buys.
+  - speedup over "random" at the same run count
+
+Run from backend/:
+    python -m benchmarks.sampling_benchmark
+    python -m benchmarks.sampling_benchmark --units 575 --runs 250 500 1000 --repeats 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.sampling import SAMPLING_METHODS
+from services.simulation_engine import simulate_batch
+
+
+def _estimate(method: str, n_runs: int, seed: int, levers: dict) -> tuple:
+    """One p_failure estimate from fresh draws. Returns (p_failure, elapsed_ms)."""
+    rng = np.random.default_rng(seed)  # a Generator bypasses the scenario cache
+    started = time.perf_counter()
+    first_failure_idx, _ = simulate_batch(0, n_runs, n_runs, rng, sampling=method, **levers)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return float(np.mean(first_failure_idx >= 0)), elapsed_ms
+
+
+def benchmark(levers: dict, run_counts, repeats: int, methods=SAMPLING_METHODS) -> list:
+    rows = []
+    for n_runs in run_counts:
+        baseline_efficiency = None
+        for method in methods:
+            _estimate(method, n_runs, repeats, levers)  # warm-up, seed outside the measured range
+            estimates, timings = zip(*(
+                _estimate(method, n_runs, seed, levers) for seed in range(repeats)
+            ))
+            standard_error = float(np.std(estimates, ddof=1))
+            ms = float(np.mean(timings))
+            efficiency = 1 / (standard_error ** 2 * ms) if standard_error > 0 else float("inf")
+            if method == "random":
+                baseline_efficiency = efficiency
+            rows.append({
+                "method": method,
+                "n_runs": n_runs,
+                "p_failure": float(np.mean(estimates)),
+                "standard_error": standard_error,
+                "ms": ms,
+                "efficiency": efficiency,
+                "speedup": efficiency / baseline_efficiency if baseline_efficiency else None,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--units", type=int, default=575, help="unit count (default sits near the threshold)")
+    parser.add_argument("--build-year", type=int, default=2030)
+    parser.add_argument("--runs", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--repeats", type=int, default=100, help="independent estimates per cell")
+    parser.add_argument("--methods", nargs="+", default=list(SAMPLING_METHODS), choices=SAMPLING_METHODS)
+    args = parser.parse_args()
+
+    levers = {"unit_count": args.units, "build_year": args.build_year}
+    rows = benchmark(levers, args.runs, args.repeats, args.methods)
+
+    print(f"{args.units} units, build year {args.build_year}, {args.repeats} repeats per cell\n")
+    print(f"{'method':<16}{'runs':>6}{'p_failure':>11}{'std err':>10}{'ms':>9}{'efficiency':>13}{'speedup':>9}")
+    for row in rows:
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] is not None else "-"
+        print(
+            f"{row['method']:<16}{row['n_runs']:>6}{row['p_failure']:>11.4f}"
+            f"{row['standard_error']:>10.4f}{row['ms']:>9.2f}{row['efficiency']:>13.1f}{speedup:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
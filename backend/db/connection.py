@@ -1,5 +1,7 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from dotenv import load_dotenv
 
@@ -10,10 +12,33 @@ load_dotenv()
 # Inside Docker, "postgres" is the hostname because that's the service name in docker-compose.yml
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# The engine is the single connection to Postgres for the entire app.
+# Connection pool sizing — shared by both engines below, so the total number of
+# Postgres connections one API process can open is 2 × (pool size + overflow).
+# pool size:    connections kept open and reused between requests
+# max overflow: extra connections opened under burst load, closed again afterwards
+# pool timeout: seconds a request waits for a free connection before erroring
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Prepared statements cached per connection by the async driver. The hot queries
+# (/results, /whatif lookups) are the same handful of statements, so after the first
+# request they skip Postgres' parse/plan step. Set to 0 behind PgBouncer in
+# transaction mode, which can't keep prepared statements across transactions.
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+_pool_options = {
+    "pool_pre_ping": True,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+}
+
+# The sync engine — used by the simulation executor's dispatcher threads, the CPU-bound
+# routes that already run on the threadpool, and the Alembic migrations at startup.
 # pool_pre_ping=True means SQLAlchemy will test the connection before using it —
 # important because the backend might start before Postgres is fully ready.
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(DATABASE_URL, **_pool_options)
 
 # SessionLocal is a factory. Calling SessionLocal() gives you one session (one "conversation"
 # with the database). autocommit=False means changes don't save until you explicitly commit.
@@ -21,6 +46,25 @@ engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# The async engine — used by the request-heavy routes (/results polling, the /whatif
+# project lookup, project CRUD) so waiting on Postgres never ties up a threadpool thread.
+# Same database, async driver: postgresql:// → postgresql+asyncpg://
+def _async_url(url: str):
+    url = make_url(url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2", "postgres"):
+        return url.set(drivername="postgresql+asyncpg").update_query_dict(
+            {"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)}
+        )
+    return url
+
+
+async_engine = create_async_engine(_async_url(DATABASE_URL), **_pool_options)
+
+# expire_on_commit=False — after a commit, attributes stay readable without another
+# round trip (lazy loads aren't possible on an async session).
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
 # Base is the class all models inherit from.
 # SQLAlchemy uses it to track which Python classes map to which database tables.
 class Base(DeclarativeBase):
@@ -38,3 +82,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# The async version of get_db, for async routes. Queries are awaited:
+#     project = (await db.execute(select(Project).where(Project.id == project_id))).scalar_one_or_none()
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
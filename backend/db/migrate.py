@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+
+def upgrade_database():
+    """
+    Bring the database schema up to date. Called once at startup by main.py.
+
+    The schema is migrated with Alembic (backend/migrations/), so an existing database
+    keeps its data when the schema changes.
+    """
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    # Leave the API's logging setup alone
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
@@ -1,20 +1,42 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db.connection import engine, Base
+from db.connection import async_engine
+from db.migrate import upgrade_database
 import models.project  # noqa: F401 — must import so SQLAlchemy registers the table
-from routers import projects, simulation, whatif, agent, report
+import models.simulation_run  # noqa: F401
+from routers import projects, simulation, whatif, agent, report, portfolio
+from services.llm_client import llm_client
+from services.project_cache import project_cache
+from services.report_cache import report_cache
+from services.report_export import report_exporter
+from services.report_generator import report_template
+from services.result_cache import result_cache
+from services.run_store import run_store
+from services.scenario_cache import scenario_cache
+from services.simulation_executor import simulation_executor
+from services.whatif_runner import whatif_runner
 
 
 # lifespan runs once when the app starts and once when it shuts down.
-# Base.metadata.create_all() looks at every model that inherits from Base
-# and creates its table in Postgres if it doesn't already exist.
-# This means the first time the app boots, the "projects" table is created automatically —
-# no manual SQL needed.
+# upgrade_database() applies any pending Alembic migrations (backend/migrations/),
+# so the first boot creates the tables and later boots bring an existing database
+# up to the current schema — no manual SQL needed, and no data lost.
+# (Migration 0005 also switches on the PostGIS extension — parcels are stored as geometries.)
+#
+# The simulation executor's and report exporter's process pools are started here too, and shut down when the app stops.
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    upgrade_database()
+    simulation_executor.start()
+    # Draw the report's static header and embed the logo now, not on the first download
+    report_template()
+    report_exporter.start()
     yield
+    simulation_executor.shutdown()
+    report_exporter.shutdown()
+    whatif_runner.shutdown()
+    await async_engine.dispose()
 
 
 app = FastAPI(title="DataDungeon API", lifespan=lifespan)
@@ -32,8 +54,22 @@ app.include_router(simulation.router)
 app.include_router(whatif.router)
 app.include_router(agent.router)
 app.include_router(report.router)
+app.include_router(portfolio.router)
 
 
 @app.get("/health", tags=["Health"])
 def health():
     return {"status": "ok"}
+
+
+# Hit/miss counters for the in-process caches — used to size them.
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    return {
+        "results": result_cache.stats(),
+        "scenarios": scenario_cache.stats(),
+        "runs": run_store.stats(),
+        "projects": project_cache.stats(),
+        "llm": llm_client.stats(),
+        "reports": report_cache.stats(),
+    }
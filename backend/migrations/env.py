@@ -0,0 +1,53 @@
+"""
+DataDungeon — Alembic environment
+
+Migrations run on the app's own sync engine (db/connection.py), so they always
+target the DATABASE_URL the API uses. On Postgres the whole upgrade holds an
+advisory lock, so several API processes starting at once apply it only once.
+"""
+
+import logging.config
+
+from alembic import context
+from sqlalchemy import text
+
+from db.connection import Base, engine
+import models.project  # noqa: F401 — registers the tables on Base.metadata
+import models.simulation_run  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    logging.config.fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Arbitrary constant shared by every process that migrates this database
+MIGRATION_LOCK_ID = 7_301_944
+
+
+def run_migrations_offline():
+    """Emit the SQL instead of running it: alembic upgrade head --sql"""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            if connection.dialect.name == "postgresql":
+                # Released when the migration transaction commits
+                connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,44 @@
+"""Baseline — the projects table as the app first created it
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-16
+
+Before migrations existed the API created its tables with create_all() at
+startup. A database from that time already has this table, so it is left alone
+and only stamped; an empty database gets it created here.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("projects"):
+        return
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_name", sa.String(), nullable=False),
+        sa.Column("unit_count", sa.Integer(), nullable=False),
+        sa.Column("build_year", sa.Integer(), nullable=False),
+        sa.Column("parcel_geojson", sa.JSON(), nullable=False),
+        sa.Column("greywater_recycling", sa.Boolean(), nullable=False),
+        sa.Column("pipeline_added", sa.Boolean(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("simulation_results", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_projects_id", table_name="projects")
+    op.drop_table("projects")
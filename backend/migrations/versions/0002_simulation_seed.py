@@ -0,0 +1,46 @@
+"""Per-project Monte Carlo seed
+
+Revision ID: 0002_simulation_seed
+Revises: 0001_baseline
+Create Date: 2026-10-16
+
+Adds projects.simulation_seed and gives every existing project its own random
+31-bit seed before making the column NOT NULL. A database whose table already
+has the column (created by create_all() after the seed was introduced) is left
+as it is.
+"""
+
+import secrets
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_simulation_seed"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if "simulation_seed" in {c["name"] for c in sa.inspect(bind).get_columns("projects")}:
+        return
+
+    op.add_column("projects", sa.Column("simulation_seed", sa.Integer(), nullable=True))
+
+    projects = sa.table("projects", sa.column("id", sa.Integer), sa.column("simulation_seed", sa.Integer))
+    ids = bind.execute(sa.select(projects.c.id)).scalars().all()
+    if ids:
+        bind.execute(
+            projects.update().where(projects.c.id == sa.bindparam("project_id")),
+            [{"project_id": project_id, "simulation_seed": secrets.randbits(31)} for project_id in ids],
+        )
+
+    with op.batch_alter_table("projects") as batch:
+        batch.alter_column("simulation_seed", existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table("projects") as batch:
+        batch.drop_column("simulation_seed")
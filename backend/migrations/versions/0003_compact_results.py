@@ -0,0 +1,125 @@
+"""Compact result columns in place of the simulation_results JSON blob
+
+Revision ID: 0003_compact_results
+Revises: 0002_simulation_seed
+Create Date: 2026-10-16
+
+Every stored projects.simulation_results is packed into the new layout
+(services/result_storage.py) — the small fields into result_summary, the failure
+curve into float32 bytes — before the old column is dropped. Legacy results
+never kept per-run outcomes, so run_first_failure / run_deficits stay NULL.
+Downgrade unpacks the columns back into one JSON blob.
+
+The packing is written out here rather than imported from result_storage, so
+this migration keeps producing the same layout when that module changes.
+"""
+
+import numpy as np
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_compact_results"
+down_revision = "0002_simulation_seed"
+branch_labels = None
+depends_on = None
+
+# result_storage.SUMMARY_FIELDS when this layout was introduced
+SUMMARY_FIELDS = (
+    "verdict",
+    "p_failure_by_end_year",
+    "simulation_end_year",
+    "first_failure_year",
+    "median_deficit_acre_feet",
+    "scenario_results",
+    "scenario_details",
+    "n_simulations_run",
+    "p_failure_ci_low",
+    "p_failure_ci_high",
+)
+
+projects = sa.table(
+    "projects",
+    sa.column("id", sa.Integer),
+    sa.column("simulation_results", sa.JSON),
+    sa.column("result_summary", sa.JSON),
+    sa.column("failure_curve_start_year", sa.Integer),
+    sa.column("failure_curve", sa.LargeBinary),
+)
+
+
+def _columns() -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("projects")}
+
+
+def upgrade():
+    existing = _columns()
+    new_columns = [
+        sa.Column("result_summary", sa.JSON(), nullable=True),
+        sa.Column("failure_curve_start_year", sa.Integer(), nullable=True),
+        sa.Column("failure_curve", sa.LargeBinary(), nullable=True),
+        sa.Column("run_first_failure", sa.LargeBinary(), nullable=True),
+        sa.Column("run_deficits", sa.LargeBinary(), nullable=True),
+    ]
+    for column in new_columns:
+        if column.name not in existing:
+            op.add_column("projects", column)
+
+    if "simulation_results" not in existing:
+        return
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(projects.c.id, projects.c.simulation_results)
+        .where(projects.c.simulation_results.isnot(None))
+    ).all()
+    packed = [{"project_id": project_id, **_pack(results)} for project_id, results in rows if results]
+    if packed:
+        bind.execute(projects.update().where(projects.c.id == sa.bindparam("project_id")), packed)
+
+    with op.batch_alter_table("projects") as batch:
+        batch.drop_column("simulation_results")
+
+
+def downgrade():
+    op.add_column("projects", sa.Column("simulation_results", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            projects.c.id,
+            projects.c.result_summary,
+            projects.c.failure_curve_start_year,
+            projects.c.failure_curve,
+        ).where(projects.c.result_summary.isnot(None))
+    ).all()
+    unpacked = [
+        {"project_id": row.id, "simulation_results": _unpack(row.result_summary, row.failure_curve_start_year, row.failure_curve)}
+        for row in rows
+    ]
+    if unpacked:
+        bind.execute(projects.update().where(projects.c.id == sa.bindparam("project_id")), unpacked)
+
+    with op.batch_alter_table("projects") as batch:
+        for name in ("run_deficits", "run_first_failure", "failure_curve", "failure_curve_start_year", "result_summary"):
+            batch.drop_column(name)
+
+
+def _pack(results: dict) -> dict:
+    curve = results.get("failure_curve") or []
+    return {
+        "result_summary": {key: results.get(key) for key in SUMMARY_FIELDS},
+        "failure_curve_start_year": curve[0]["year"] if curve else None,
+        "failure_curve": np.array([pt["p_failure"] for pt in curve], dtype="<f4").tobytes(),
+    }
+
+
+def _unpack(summary: dict, start_year, curve_bytes) -> dict:
+    curve = np.frombuffer(curve_bytes or b"", dtype="<f4")
+    return {
+        **summary,
+        "failure_curve": [
+            {"year": start_year + i, "p_failure": round(float(p), 4)}
+            for i, p in enumerate(curve)
+        ],
+    }
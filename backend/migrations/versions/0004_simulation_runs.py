@@ -0,0 +1,53 @@
+"""simulation_runs — durable history and second-level cache of simulation results
+
+Revision ID: 0004_simulation_runs
+Revises: 0003_compact_results
+Create Date: 2026-10-16
+
+New table only; nothing to backfill — it fills up as simulations are requested.
+Skipped when create_all() already made the table.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_simulation_runs"
+down_revision = "0003_compact_results"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("simulation_runs"):
+        return
+
+    op.create_table(
+        "simulation_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("lever_hash", sa.String(64), nullable=False),
+        sa.Column("levers", sa.JSON(), nullable=False),
+        sa.Column("input_hash", sa.String(64), nullable=False),
+        sa.Column("engine_version", sa.String(), nullable=False),
+        sa.Column("sampling", sa.String(), nullable=False),
+        sa.Column("seed", sa.Integer(), nullable=False),
+        sa.Column("n_simulations", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("result_summary", sa.JSON(), nullable=False),
+        sa.Column("failure_curve_start_year", sa.Integer(), nullable=True),
+        sa.Column("failure_curve", sa.LargeBinary(), nullable=True),
+        sa.Column("run_first_failure", sa.LargeBinary(), nullable=True),
+        sa.Column("run_deficits", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "project_id", "lever_hash", "input_hash", "engine_version", "sampling", "seed", "n_simulations",
+            name="uq_simulation_runs_key",
+        ),
+    )
+    op.create_index("ix_simulation_runs_project_lever", "simulation_runs", ["project_id", "lever_hash"])
+
+
+def downgrade():
+    op.drop_index("ix_simulation_runs_project_lever", table_name="simulation_runs")
+    op.drop_table("simulation_runs")
@@ -0,0 +1,125 @@
+"""Parcel as a PostGIS geometry, measured once and stored
+
+Revision ID: 0005_parcel_geometry
+Revises: 0004_simulation_runs
+Create Date: 2026-10-16
+
+Adds projects.parcel_geom (MultiPolygon, WGS 84) plus the stored measurements —
+parcel_acres, parcel_centroid_lat/lng, parcel_bbox, irrigated_acres — and fills
+them for every existing project from its parcel_geojson, the same way
+create_project does for a new one (services/spatial.py):
+
+  1. parcel_geom    — ST_MakeValid'd polygonal part of the GeoJSON. Parsed one row
+                      at a time inside a savepoint, so a parcel PostGIS can't read
+                      is logged and stored as an empty MultiPolygon (area 0) instead
+                      of failing the whole upgrade.
+  2. measurements   — area and centroid on the spheroid, bounding box; centroid and
+                      bounding box stay NULL for an empty parcel.
+  3. irrigated_acres — the water_demand.irrigated_acres() formula at that time.
+
+parcel_geom, parcel_acres and irrigated_acres become NOT NULL only after the
+backfill. Then the two GiST indexes are built: on the geometry (map bounding box)
+and on geography(parcel_geom) (distance in metres).
+"""
+
+import json
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+from sqlalchemy.exc import DBAPIError
+
+
+revision = "0005_parcel_geometry"
+down_revision = "0004_simulation_runs"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# parcel_geometry.SQ_M_PER_ACRE and the water_demand irrigation constants
+SQ_M_PER_ACRE = 4047.0
+IRRIGATED_LOT_FRACTION = 0.45
+MAX_IRRIGATED_ACRES_PER_UNIT = 0.25
+
+
+def _parcel_columns() -> list:
+    # Nullable until the backfill; the GiST indexes are created explicitly at the end
+    return [
+        sa.Column("parcel_geom", Geometry("MULTIPOLYGON", srid=4326, spatial_index=False), nullable=True),
+        sa.Column("parcel_acres", sa.Float(), nullable=True),
+        sa.Column("parcel_centroid_lat", sa.Float(), nullable=True),
+        sa.Column("parcel_centroid_lng", sa.Float(), nullable=True),
+        sa.Column("parcel_bbox", sa.JSON(), nullable=True),
+        sa.Column("irrigated_acres", sa.Float(), nullable=True),
+    ]
+
+
+SET_GEOM = sa.text(
+    "UPDATE projects SET parcel_geom = "
+    "ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SetSRID(ST_GeomFromGeoJSON(:geojson), 4326)), 3)) "
+    "WHERE id = :id"
+)
+SET_EMPTY_GEOM = sa.text(
+    "UPDATE projects SET parcel_geom = ST_SetSRID(ST_GeomFromText('MULTIPOLYGON EMPTY'), 4326) WHERE id = :id"
+)
+
+MEASURE = sa.text(f"""
+    UPDATE projects SET
+        parcel_acres = ST_Area(geography(parcel_geom)) / {SQ_M_PER_ACRE},
+        parcel_centroid_lat = CASE WHEN ST_Area(geography(parcel_geom)) > 0
+            THEN ST_Y(geometry(ST_Centroid(geography(parcel_geom)))) END,
+        parcel_centroid_lng = CASE WHEN ST_Area(geography(parcel_geom)) > 0
+            THEN ST_X(geometry(ST_Centroid(geography(parcel_geom)))) END,
+        parcel_bbox = CASE WHEN ST_Area(geography(parcel_geom)) > 0
+            THEN json_build_array(ST_XMin(parcel_geom), ST_YMin(parcel_geom), ST_XMax(parcel_geom), ST_YMax(parcel_geom)) END
+    WHERE parcel_acres IS NULL
+""")
+
+SET_IRRIGATED = sa.text(f"""
+    UPDATE projects SET irrigated_acres = CASE
+        WHEN unit_count > 0 AND parcel_acres > 0
+        THEN LEAST(parcel_acres / unit_count * {IRRIGATED_LOT_FRACTION}, {MAX_IRRIGATED_ACRES_PER_UNIT}) * unit_count
+        ELSE 0 END
+    WHERE irrigated_acres IS NULL
+""")
+
+
+def upgrade():
+    # The postgis/postgis image enables it in POSTGRES_DB; this covers databases created any other way
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    bind = op.get_bind()
+    existing = {c["name"] for c in sa.inspect(bind).get_columns("projects")}
+    for column in _parcel_columns():
+        if column.name not in existing:
+            op.add_column("projects", column)
+
+    rows = bind.execute(sa.text("SELECT id, parcel_geojson FROM projects WHERE parcel_geom IS NULL")).all()
+    for project_id, parcel_geojson in rows:
+        geometry = parcel_geojson if isinstance(parcel_geojson, dict) else {}
+        if geometry.get("type") == "Feature":
+            geometry = geometry.get("geometry") or {}
+        try:
+            with bind.begin_nested():
+                bind.execute(SET_GEOM, {"id": project_id, "geojson": json.dumps(geometry)})
+        except DBAPIError as e:
+            logger.warning("Project %s: parcel GeoJSON is not a valid polygon (%s) — stored as empty", project_id, e.orig)
+            bind.execute(SET_EMPTY_GEOM, {"id": project_id})
+
+    bind.execute(MEASURE)
+    bind.execute(SET_IRRIGATED)
+
+    for name in ("parcel_geom", "parcel_acres", "irrigated_acres"):
+        op.alter_column("projects", name, nullable=False)
+
+    op.execute("CREATE INDEX IF NOT EXISTS idx_projects_parcel_geom ON projects USING gist (parcel_geom)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_projects_parcel_geog ON projects USING gist (geography(parcel_geom))")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_projects_parcel_geog")
+    op.execute("DROP INDEX IF EXISTS idx_projects_parcel_geom")
+    for column in reversed(_parcel_columns()):
+        op.drop_column("projects", column.name)
@@ -1,8 +1,16 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, JSON
+import secrets
+from geoalchemy2 import Geometry
+from sqlalchemy import Boolean, Column, Float, Index, Integer, String, DateTime, JSON, LargeBinary
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from db.connection import Base
 
 
+def new_simulation_seed() -> int:
+    # 31 bits so the value fits in a signed Postgres INTEGER column.
+    return secrets.randbits(31)
+
+
 class Project(Base):
     # __tablename__ tells SQLAlchemy what to call this table in Postgres.
     __tablename__ = "projects"
@@ -24,21 +32,62 @@ class Project(Base):
     # send it straight back to Mapbox on the frontend without any transformation.
     parcel_geojson = Column(JSON, nullable=False)
 
+    # The same parcel as a PostGIS MultiPolygon (WGS 84), for spatial queries — the
+    # map view's bounding box and the nearby-projects search (services/spatial.py).
+    # spatial_index=True gives it a GiST index; a second one on geography(parcel_geom)
+    # is declared below the class. Deferred: only the spatial queries need it.
+    parcel_geom = deferred(Column(Geometry("MULTIPOLYGON", srid=4326, spatial_index=True), nullable=False))
+
+    # The parcel measured once at creation by PostGIS (services/spatial.py), so the
+    # simulation, /whatif and the report never re-walk the polygon:
+    #   parcel_acres          — area on the spheroid; drives outdoor irrigation demand
+    #   parcel_centroid_*     — area-weighted centroid, null for an empty parcel
+    #   parcel_bbox           — [west, south, east, north] in degrees
+    #   irrigated_acres       — estimated lawn and garden area at unit_count homes
+    parcel_acres = Column(Float, default=0.0, nullable=False)
+    parcel_centroid_lat = Column(Float, nullable=True)
+    parcel_centroid_lng = Column(Float, nullable=True)
+    parcel_bbox = Column(JSON, nullable=True)
+    irrigated_acres = Column(Float, default=0.0, nullable=False)
+
     # Whether the developer is including greywater recycling (reduces demand 28%)
     # or an additional pipeline/water-rights purchase (adds 500 AF/yr to supply).
     # Set at project creation and used as the baseline for the initial simulation.
     greywater_recycling = Column(Boolean, default=False, nullable=False)
     pipeline_added = Column(Boolean, default=False, nullable=False)
 
+    # Seed for the Monte Carlo draws. Picked once when the project is created so
+    # /simulate, /whatif, /report and the AI agent all evaluate the same 1,000
+    # simulated futures — a lever change then shows its real effect, not sampling noise.
+    simulation_seed = Column(Integer, default=new_simulation_seed, nullable=False)
+
     # Tracks where this project is in its lifecycle.
-    # Flow: "pending" → "running" → "complete" (or "failed" if something breaks)
+    # Flow: "pending" → "queued" → "running" → "complete" (or "failed" if something breaks)
     status = Column(String, default="pending", nullable=False)
 
-    # Null until the simulation finishes. Then stores the full SimulationResult
-    # as JSON so we don't have to rerun it every time the user comes back.
-    simulation_results = Column(JSON, nullable=True)
+    # Null until the simulation finishes. Then stores the SimulationResult so we don't
+    # have to rerun it every time the user comes back — split by how often it's read:
+    #   result_summary            — verdict, p_failure, scenario verdicts... as small JSON
+    #   failure_curve_start_year  — first year of the failure curve
+    #   failure_curve             — P(failure by year) as packed float32, 4 bytes per year
+    #   run_first_failure         — per Monte Carlo run: int16 years from the start to the
+    #                               first deficit, -1 if the run never failed
+    #   run_deficits              — per run: float32 deficit in that year, NaN if none
+    # The binary columns are deferred — SQLAlchemy only fetches them when the attribute
+    # is read, so a /results poll that just wants the verdict never loads them.
+    # Read and write these through services/result_storage.py, not directly.
+    result_summary = Column(JSON, nullable=True)
+    failure_curve_start_year = Column(Integer, nullable=True)
+    failure_curve = deferred(Column(LargeBinary, nullable=True), group="failure_curve")
+    run_first_failure = deferred(Column(LargeBinary, nullable=True), group="runs")
+    run_deficits = deferred(Column(LargeBinary, nullable=True), group="runs")
 
     # Set automatically by the database when the row is first inserted.
     # server_default=func.now() means Postgres sets this, not Python —
     # so it's always accurate regardless of server timezone settings.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# GiST index on the parcel as geography — lets ST_DWithin / ST_Distance in metres
+# use an index. Queries must spell the expression the same way: geography(parcel_geom).
+Index("ix_projects_parcel_geog", func.geography(Project.parcel_geom), postgresql_using="gist")
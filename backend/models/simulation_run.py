@@ -0,0 +1,57 @@
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, JSON, LargeBinary, String, UniqueConstraint,
+)
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from db.connection import Base
+
+
+class SimulationRun(Base):
+    # One row per distinct simulation ever computed for a project — the initial
+    # /simulate run and every lever combination tried through /whatif, /report
+    # or the AI agent. Nothing is overwritten, so this is the project's result history,
+    # and because the row is keyed by everything that determines the output, it is
+    # also a durable cache: an identical request later just reads the row back.
+    __tablename__ = "simulation_runs"
+
+    id = Column(Integer, primary_key=True)
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+
+    # --- Everything that determines the result (the lookup key) ---
+
+    # sha256 of the normalized lever dict, plus the levers themselves for provenance.
+    lever_hash = Column(String(64), nullable=False)
+    levers = Column(JSON, nullable=False)
+
+    # sha256 of the project inputs the run used (unit count, build year, parcel).
+    # Editing a project changes this, so old rows stay as history but never match.
+    input_hash = Column(String(64), nullable=False)
+
+    # services/simulation_engine.ENGINE_VERSION — bumped whenever the model changes,
+    # so results from an older engine are never served as current.
+    engine_version = Column(String, nullable=False)
+    sampling = Column(String, nullable=False)
+    seed = Column(Integer, nullable=False)
+    n_simulations = Column(Integer, nullable=False)
+
+    # Which endpoint first computed it: "simulate", "whatif", "report" or "agent"
+    source = Column(String, nullable=False)
+
+    # --- The result, in the same compact layout as Project (services/result_storage.py) ---
+    result_summary = Column(JSON, nullable=False)
+    failure_curve_start_year = Column(Integer, nullable=True)
+    failure_curve = deferred(Column(LargeBinary, nullable=True), group="failure_curve")
+    run_first_failure = deferred(Column(LargeBinary, nullable=True), group="runs")
+    run_deficits = deferred(Column(LargeBinary, nullable=True), group="runs")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Lookups always filter on project + levers first
+        Index("ix_simulation_runs_project_lever", "project_id", "lever_hash"),
+        UniqueConstraint(
+            "project_id", "lever_hash", "input_hash", "engine_version", "sampling", "seed", "n_simulations",
+            name="uq_simulation_runs_key",
+        ),
+    )
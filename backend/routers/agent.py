@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from db.connection import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from db.connection import get_async_db
 from models.project import Project
 from schemas.agent import RecommendationResponse
 from services.ai_agent import get_recommendations
+from services.project_cache import project_cache
+from services.result_storage import SUMMARY_FIELDS, load_results
 
 router = APIRouter(prefix="/projects", tags=["AI Agent"])
 
 
 @router.post("/{project_id}/recommend", response_model=RecommendationResponse)
-def recommend(project_id: int, db: Session = Depends(get_db)):
+async def recommend(project_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Ask the AI agent for ranked intervention recommendations.
 
@@ -17,8 +21,11 @@ def recommend(project_id: int, db: Session = Depends(get_db)):
       - Simulation must be complete (status == "complete")
       - Verdict must be "FAIL" — recommendations are only useful for failed projects
       - Returns 2–3 ranked lever combinations with real simulated outcomes
+
+    Async end to end: the model call is awaited and the simulations run on the
+    what-if pool, so waiting on the LLM doesn't hold a worker thread.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await project_cache.aget(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
@@ -28,7 +35,13 @@ def recommend(project_id: int, db: Session = Depends(get_db)):
             detail="Simulation must be complete before requesting recommendations.",
         )
 
-    results = project.simulation_results
+    # The agent only needs the headline numbers — skip the curve and per-run columns
+    stored = (await db.execute(
+        select(Project)
+        .options(load_only(Project.result_summary, Project.failure_curve_start_year))
+        .where(Project.id == project_id)
+    )).scalar_one_or_none()
+    results = load_results(stored, SUMMARY_FIELDS) if stored else None
     if not results:
         raise HTTPException(
             status_code=400,
@@ -41,8 +54,11 @@ def recommend(project_id: int, db: Session = Depends(get_db)):
             detail="Recommendations are only generated for projects that failed the simulation.",
         )
 
-    return get_recommendations(
+    return await get_recommendations(
+        project_id=project.id,
         unit_count=project.unit_count,
         build_year=project.build_year,
         simulation_result=results,
+        seed=project.simulation_seed,
+        parcel_acres=project.parcel_acres,
     )
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, load_only
+from db.connection import get_db
+from models.project import Project
+from schemas.portfolio import PortfolioRequest, PortfolioResponse
+from services.simulation_engine import COUNTY_DATA, run_portfolio_simulation
+
+router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+
+
+@router.post("/simulate", response_model=PortfolioResponse)
+def simulate_portfolio(body: PortfolioRequest = PortfolioRequest(), db: Session = Depends(get_db)):
+    """
+    Simulate every completed project together against the one development allocation
+    they all draw on.
+
+    /simulate checks each project against the full allocation as if it were the only
+    one; this runs a single joint Monte Carlo where every project sees the same
+    supply shocks and their demands add up year by year. A project that passes alone
+    can fail here once the projects approved before it are counted.
+    """
+    projects = (
+        db.query(Project)
+        # Only the sizing columns — not the parcel GeoJSON, geometry or stored results
+        .options(load_only(
+            Project.project_name,
+            Project.unit_count,
+            Project.build_year,
+            Project.greywater_recycling,
+            Project.pipeline_added,
+            Project.parcel_acres,
+        ))
+        .filter(Project.status == "complete")
+        .order_by(Project.id)
+        .all()
+    )
+    if not projects:
+        raise HTTPException(status_code=404, detail="No completed projects to simulate.")
+
+    result = run_portfolio_simulation(
+        [
+            {
+                "unit_count": p.unit_count,
+                "build_year": p.build_year,
+                "greywater_recycling": p.greywater_recycling,
+                "pipeline_added": p.pipeline_added,
+                "parcel_acres": p.parcel_acres,
+            }
+            for p in projects
+        ],
+        n_simulations=body.n_simulations,
+        seed=body.seed,
+    )
+
+    return {
+        "project_count": len(projects),
+        "development_allocation_acre_feet": COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"],
+        "simulation_start_year": result["simulation_start_year"],
+        "simulation_end_year": result["simulation_end_year"],
+        "aggregate": result["aggregate"],
+        "projects": [
+            {
+                "project_id": p.id,
+                "project_name": p.project_name,
+                "unit_count": p.unit_count,
+                "build_year": p.build_year,
+                **project_result,
+            }
+            for p, project_result in zip(projects, result["projects"])
+        ],
+    }
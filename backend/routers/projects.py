@@ -1,14 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from db.connection import get_db
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.connection import get_async_db
 from models.project import Project
-from schemas.project import ProjectCreate, ProjectResponse
+from schemas.project import NearbyProject, ProjectCreate, ProjectMapItem, ProjectResponse
+from services import spatial
+from services.project_cache import project_cache
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Upper bound on parcels returned by one map query
+MAX_MAP_RESULTS = 5000
+
 
 @router.post("", response_model=ProjectResponse, status_code=201)
-def create_project(body: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(body: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
+    # The parcel is measured here, once, by PostGIS — area, centroid, bounding box and
+    # irrigated area are stored alongside the polygon so no later request has to walk it again.
+    try:
+        parcel_geom = spatial.parcel_geom_expr(body.parcel_geojson)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        geometry = await spatial.measure_parcel(db, body.parcel_geojson)
+    except DBAPIError as e:
+        # Shapes that pass the checks above but PostGIS still can't parse, e.g. an unclosed ring
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=f"Invalid parcel geometry: {e.orig}")
+    if geometry.area_acres <= 0:
+        raise HTTPException(status_code=422, detail="The parcel has no area.")
+
     # Create a Python object from the request body.
     # At this point it exists in memory only — nothing has been written to the database yet.
     project = Project(
@@ -16,6 +39,8 @@ def create_project(body: ProjectCreate, db: Session = Depends(get_db)):
         unit_count=body.unit_count,
         build_year=body.build_year,
         parcel_geojson=body.parcel_geojson,
+        parcel_geom=parcel_geom,
+        **geometry.columns(body.unit_count),
         greywater_recycling=body.greywater_recycling,
         pipeline_added=body.pipeline_added,
         status="pending",
@@ -25,11 +50,11 @@ def create_project(body: ProjectCreate, db: Session = Depends(get_db)):
     db.add(project)
 
     # Write to the database. Postgres generates the id and created_at here.
-    db.commit()
+    await db.commit()
 
     # Re-read the row from the database so our Python object has the generated id and created_at.
     # Without this, project.id would still be None.
-    db.refresh(project)
+    await db.refresh(project)
 
     # FastAPI sees response_model=ProjectResponse and uses it to serialize the
     # SQLAlchemy model into JSON. This works because we set model_config = {"from_attributes": True}
@@ -37,14 +62,52 @@ def create_project(body: ProjectCreate, db: Session = Depends(get_db)):
     return project
 
 
+@router.get("", response_model=List[ProjectMapItem])
+async def list_projects_in_bbox(
+    bbox: str = Query(description="west,south,east,north in degrees (WGS 84)"),
+    limit: int = Query(default=1000, ge=1, le=MAX_MAP_RESULTS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Every project whose parcel intersects the bounding box — the map view.
+    One query against the parcel's GiST index, however many projects exist.
+    """
+    try:
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="bbox must be four numbers: west,south,east,north")
+    if west >= east or south >= north:
+        raise HTTPException(status_code=422, detail="bbox must have west < east and south < north")
+
+    return await spatial.projects_in_bbox(db, west, south, east, north, limit)
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_async_db)):
     # Query the projects table for a row where id matches.
-    # .first() returns the object if found, or None if not.
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # scalar_one_or_none() returns the object if found, or None if not.
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
 
     # If nothing came back, return a 404. FastAPI turns this into a proper JSON error response.
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
     return project
+
+
+@router.get("/{project_id}/nearby", response_model=List[NearbyProject])
+async def nearby_projects(
+    project_id: int,
+    radius_m: float = Query(default=5000, gt=0, le=100_000, description="search radius in metres"),
+    limit: int = Query(default=50, ge=1, le=MAX_MAP_RESULTS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Other projects within radius_m metres of this project's parcel, nearest first —
+    the developments this one would share a water district with.
+    """
+    if await project_cache.aget(db, project_id) is None:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
+    return await spatial.projects_near(db, project_id, radius_m, limit)
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.connection import get_db
+from db.connection import get_async_db, get_db
 from models.project import Project
-from services.report_generator import generate_report
-from services.simulation_engine import run_simulation
+from schemas.report import BulkReportRequest
+from services.report_cache import report_cache, report_key
+from services.report_export import ExportJob, project_snapshot, report_exporter
+from services.report_generator import generate_report, report_filename
+from services.result_cache import cached_simulation, normalize_levers
+from services.result_storage import has_results, load_results, loader_options
 
 router = APIRouter(prefix="/projects", tags=["Report"])
 
@@ -17,6 +25,7 @@ def download_report(
     greywater_recycling: bool = Query(default=False),
     pipeline_added: bool = Query(default=False),
     build_delay_years: int = Query(default=0, ge=0, le=20),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """
     Generate and download a PDF report for a completed project.
@@ -24,6 +33,11 @@ def download_report(
 
     Optional lever query params can be passed to generate the PDF with
     what-if adjustments applied (mirrors the live slider state in the UI).
+
+    The response carries an ETag — a hash of the project, levers and results the
+    report is drawn from. Send it back as If-None-Match to get a 304 when nothing
+    changed; otherwise a report already rendered for that ETag is served from
+    the report cache.
     """
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
@@ -35,13 +49,14 @@ def download_report(
             detail="Simulation must be complete before generating a report.",
         )
 
-    if not project.simulation_results:
+    if not has_results(project):
         raise HTTPException(
             status_code=400,
             detail="No simulation results found for this project.",
         )
 
-    # If any lever differs from default, re-run simulation with adjustments
+    # If any lever differs from default, re-run simulation with adjustments.
+    # The slider state was usually just evaluated by /whatif, so this is normally a cache hit.
     has_levers = (
         unit_reduction_pct > 0
         or greywater_recycling
@@ -50,14 +65,17 @@ def download_report(
     )
 
     if has_levers:
-        sim_results = run_simulation(
+        sim_results = cached_simulation(
+            project_id=project.id,
             unit_count=project.unit_count,
             build_year=project.build_year,
             greywater_recycling=greywater_recycling,
             pipeline_added=pipeline_added,
             unit_reduction_pct=unit_reduction_pct,
             build_delay_years=build_delay_years,
-            parcel_geojson=project.parcel_geojson,
+            parcel_acres=project.parcel_acres,
+            seed=project.simulation_seed,
+            source="report",
         )
         levers = {
             "unit_reduction_pct": unit_reduction_pct,
@@ -66,15 +84,87 @@ def download_report(
             "build_delay_years": build_delay_years,
         }
     else:
-        sim_results = project.simulation_results
+        sim_results = load_results(project)
         levers = None
 
-    pdf_bytes = generate_report(project, sim_results, levers=levers)
+    key = report_key(project, sim_results, levers)
+    etag = f'"{key}"'
+    # The client revalidates every time; the ETag changes whenever the report would
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if _etag_matches(if_none_match, etag):
+        report_cache.record_not_modified()
+        return Response(status_code=304, headers=cache_headers)
+
+    pdf_bytes = report_cache.get_or_render(key, lambda: generate_report(project, sim_results, levers=levers))
 
-    filename = f"thallo-report-{project.project_name.lower().replace(' ', '-')}.pdf"
+    filename = report_filename(project.project_name)
 
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **cache_headers},
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison — weak and strong validators match alike (RFC 9110 §13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+@router.post("/reports/export")
+async def export_reports(body: BulkReportRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Download reports for many projects as one ZIP archive — each item is a project
+    and, optionally, the levers to apply, exactly like the single-report query params.
+
+    Every project is checked before anything is sent. The reports are then rendered
+    in parallel and streamed back as they finish, in request order, ending with a
+    manifest.json that lists each file's project, levers and ETag.
+    """
+    project_ids = {item.project_id for item in body.items}
+    result = await db.execute(
+        select(Project).options(*loader_options()).where(Project.id.in_(project_ids))
+    )
+    projects = {project.id: project for project in result.scalars()}
+
+    missing = sorted(project_ids - projects.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Projects not found: {', '.join(map(str, missing))}")
+
+    not_ready = sorted(
+        project.id for project in projects.values()
+        if project.status != "complete" or not has_results(project)
+    )
+    if not_ready:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Simulation must be complete before generating a report. Not complete: {', '.join(map(str, not_ready))}",
+        )
+
+    # Stored results are read once per project, while the session is open.
+    # Lever sets that differ from default are simulated by the exporter.
+    snapshots = {project.id: project_snapshot(project) for project in projects.values()}
+    stored = {project.id: load_results(project) for project in projects.values()}
+    jobs = []
+    for item in body.items:
+        levers = normalize_levers(**item.levers.model_dump()) if item.levers else None
+        if levers == normalize_levers():
+            levers = None
+        jobs.append(ExportJob(
+            project=snapshots[item.project_id],
+            levers=levers,
+            results=None if levers else stored[item.project_id],
+        ))
+
+    filename = f"thallo-reports-{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        report_exporter.stream_zip(jobs),
+        media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -1,56 +1,44 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy.orm import Session
-from db.connection import get_db, SessionLocal
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.connection import AsyncSessionLocal, get_async_db
 from models.project import Project
 from schemas.simulation import SimulationStatusResponse
-from services.simulation_engine import run_simulation
+from services.progress_broker import progress_broker
+from services.result_storage import load_results, loader_options, parse_fields
+from services.simulation_executor import QueueFullError, simulation_executor
 
 router = APIRouter(prefix="/projects", tags=["Simulation"])
 
+# Seconds between SSE keep-alive comments. Each keep-alive also re-reads the
+# project's status, which covers jobs run by a different API process.
+STREAM_KEEPALIVE_SECONDS = 15
+
 
 # ---------------------------------------------------------------------------
-# Background task — runs after the route has already returned 202
+# SSE helpers
 # ---------------------------------------------------------------------------
 
-def _run_simulation_task(
-    project_id: int,
-    unit_count: int,
-    build_year: int,
-    greywater_recycling: bool,
-    pipeline_added: bool,
-    parcel_geojson: dict,
-):
-    """
-    Runs in the background after POST /simulate returns.
-    Opens its own database session — the request session is already closed by the time
-    this function executes, so we can't reuse it.
-    """
-    db = SessionLocal()
-    try:
-        results = run_simulation(
-            unit_count=unit_count,
-            build_year=build_year,
-            greywater_recycling=greywater_recycling,
-            pipeline_added=pipeline_added,
-            parcel_geojson=parcel_geojson,
-        )
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
-        project = db.query(Project).filter(Project.id == project_id).first()
-        project.simulation_results = results
-        project.status = "complete"
-        db.commit()
+async def _find_project(db: AsyncSession, project_id: int, options=()):
+    result = await db.execute(select(Project).where(Project.id == project_id).options(*options))
+    return result.scalar_one_or_none()
 
-    except Exception as e:
-        # If anything goes wrong, mark the project as failed so the frontend
-        # doesn't poll forever waiting for a result that will never come.
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if project:
-            project.status = "failed"
-            db.commit()
-        raise e
 
-    finally:
-        db.close()
+async def _load_status(project_id: int):
+    """Return (status, results) for a project, or None if it doesn't exist."""
+    async with AsyncSessionLocal() as db:
+        project = await _find_project(db, project_id, loader_options())
+        if not project:
+            return None
+        return project.status, load_results(project)
 
 
 # ---------------------------------------------------------------------------
@@ -58,55 +46,143 @@ def _run_simulation_task(
 # ---------------------------------------------------------------------------
 
 @router.post("/{project_id}/simulate", status_code=202)
-def start_simulation(
-    project_id: int,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-):
+async def start_simulation(project_id: int, adaptive: bool = False, db: AsyncSession = Depends(get_async_db)):
     """
     Kick off the 50-year water simulation for a project.
-    Returns 202 immediately — simulation runs in the background.
-    Poll GET /projects/{id}/results until status == "complete".
+    Returns 202 immediately — the simulation is queued on the simulation executor's
+    process pool. Poll GET /projects/{id}/results until status == "complete".
+    Returns 503 if the simulation queue is full; retry after a short wait.
+
+    ?adaptive=true runs until the verdict is statistically settled instead of a
+    fixed 1,000 runs — fewer for clear-cut projects, up to 10,000 near the threshold.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await _find_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
-    # Mark as running before returning so the frontend knows it started
-    project.status = "running"
-    db.commit()
-
-    # Schedule the simulation to run after this response is sent
-    background_tasks.add_task(
-        _run_simulation_task,
-        project_id,
-        project.unit_count,
-        project.build_year,
-        project.greywater_recycling,
-        project.pipeline_added,
-        project.parcel_geojson,
-    )
+    # Mark as queued before submitting so the dispatcher's "running" write can't be
+    # overwritten by this request. Restore the old status if the queue turns us away.
+    previous_status = project.status
+    project.status = "queued"
+    await db.commit()
+
+    try:
+        simulation_executor.submit(project_id, {
+            "unit_count": project.unit_count,
+            "build_year": project.build_year,
+            "greywater_recycling": project.greywater_recycling,
+            "pipeline_added": project.pipeline_added,
+            "parcel_acres": project.parcel_acres,
+            "seed": project.simulation_seed,
+        }, adaptive=adaptive)
+    except QueueFullError:
+        project.status = previous_status
+        await db.commit()
+        raise HTTPException(
+            status_code=503,
+            detail="The simulation queue is full. Please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
 
+    progress_broker.publish(project_id, "status", {"status": "queued"})
     return {"message": "Simulation started", "project_id": project_id}
 
 
 @router.get("/{project_id}/results", response_model=SimulationStatusResponse)
-def get_results(project_id: int, db: Session = Depends(get_db)):
+async def get_results(project_id: int, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """
-    Poll this endpoint every 2 seconds after calling POST /simulate.
+    Poll this endpoint every 2 seconds after calling POST /simulate — or, better,
+    subscribe to GET /projects/{id}/results/stream and get pushed updates instead.
     Returns the current status and results once the simulation is complete.
 
     Status values:
       "pending"  — simulation hasn't been started yet
+      "queued"   — waiting for a free simulation worker
       "running"  — simulation is in progress
       "complete" — results are ready, check the results field
       "failed"   — something went wrong, try again
+
+    ?fields=verdict,p_failure_by_end_year returns only those result fields — pollers
+    that just wait for a verdict skip the failure curve entirely. The per-run
+    distributions (run_first_failure_years, run_deficits_acre_feet) are only
+    returned when asked for by name.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    try:
+        requested = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # One SELECT, fetching only the column groups the requested fields need
+    project = await _find_project(db, project_id, loader_options(requested))
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
-    return {
+    # The stored fields are already in response shape — return them as-is rather
+    # than re-validating every field of every poll through the response model.
+    return JSONResponse({
         "status": project.status,
-        "results": project.simulation_results,
-    }
+        "results": load_results(project, requested),
+    })
+
+
+@router.get("/{project_id}/results/stream")
+async def stream_results(project_id: int):
+    """
+    Server-Sent Events stream of a project's simulation, replacing 2-second polling.
+
+    Events:
+      status   — {"status": ...} on every transition (sent once on connect too)
+      progress — {"completed_runs", "n_simulations", "estimate"} after each Monte Carlo
+                 batch; "estimate" is a SimulationResult over the runs finished so far
+      result   — the final SimulationResult; the stream closes after it
+
+    The stream also closes after a "failed" status. A project that is already
+    complete gets its status and result immediately.
+    """
+    # Subscribe before reading the current state so no transition slips between the two
+    subscription = progress_broker.subscribe(project_id)
+    snapshot = await _load_status(project_id)
+    if snapshot is None:
+        progress_broker.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
+    async def events():
+        try:
+            status, results = snapshot
+            yield _sse("status", {"status": status})
+            if status == "complete" and results:
+                yield _sse("result", results)
+                return
+            if status == "failed":
+                return
+
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(subscription.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    current = await _load_status(project_id)
+                    if current is None:
+                        return
+                    if current[0] != status:
+                        status, results = current
+                        yield _sse("status", {"status": status})
+                        if status == "complete" and results:
+                            yield _sse("result", results)
+                        if status in ("complete", "failed"):
+                            return
+                    continue
+
+                yield _sse(event, data)
+                if event == "status":
+                    status = data["status"]
+                if event == "result" or status == "failed":
+                    return
+        finally:
+            progress_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
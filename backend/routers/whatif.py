@@ -1,24 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from functools import partial
+from typing import Optional
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.connection import get_db
-from models.project import Project
-from schemas.whatif import WhatIfRequest
+from db.connection import get_async_db, get_db
+from schemas.whatif import SweepRequest, SweepResponse, WhatIfRequest
 from schemas.simulation import SimulationResult
-from services.simulation_engine import run_simulation
+from services.result_cache import cached_simulation
+from services.project_cache import project_cache
+from services.simulation_engine import FAIL_THRESHOLD, sweep_levers
+from services.whatif_runner import SupersededError, whatif_runner
 
 router = APIRouter(prefix="/projects", tags=["What-If"])
 
 
 @router.patch("/{project_id}/whatif", response_model=SimulationResult)
-def whatif(project_id: int, body: WhatIfRequest, db: Session = Depends(get_db)):
+async def whatif(
+    project_id: int,
+    body: WhatIfRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    x_client_id: Optional[str] = Header(default=None),
+    x_whatif_seq: Optional[int] = Header(default=None),
+):
     """
     Re-run the simulation with adjusted lever values and return the updated result.
 
-    Unlike /simulate this runs synchronously and returns immediately — no polling needed.
-    Results are NOT saved to the database. This endpoint is purely for live what-if exploration.
+    Unlike /simulate this returns the result directly — no polling needed.
+    Results are NOT saved to the database, but they are memoized in the result cache so
+    /report and the AI agent can reuse the same lever combination without recomputing.
     The frontend calls this every time a slider changes and updates the chart in real time.
+
+    The simulation runs on the what-if thread pool, never on the event loop.
+    Send X-Whatif-Seq (increasing per client, plus X-Client-Id to tell tabs apart)
+    and older in-flight requests are cancelled when a newer one arrives — they
+    return 409 and their result should be ignored.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Served from the project cache after the first tick — no database round trip
+    project = await project_cache.aget(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
@@ -28,14 +48,68 @@ def whatif(project_id: int, body: WhatIfRequest, db: Session = Depends(get_db)):
             detail="Simulation must be complete before running what-if scenarios.",
         )
 
-    results = run_simulation(
+    compute = partial(
+        cached_simulation,
+        project_id=project.id,
         unit_count=project.unit_count,
         build_year=project.build_year,
         greywater_recycling=body.greywater_recycling,
         pipeline_added=body.pipeline_added,
         unit_reduction_pct=body.unit_reduction_pct,
         build_delay_years=body.build_delay_years,
-        parcel_geojson=project.parcel_geojson,
+        parcel_acres=project.parcel_acres,
+        seed=project.simulation_seed,
+    )
+
+    client = x_client_id or (request.client.host if request.client else None)
+    try:
+        return await whatif_runner.run(compute, client_key=(client, project_id), seq=x_whatif_seq)
+    except SupersededError:
+        raise HTTPException(status_code=409, detail="Superseded by a newer what-if request.")
+
+
+@router.post("/{project_id}/sweep", response_model=SweepResponse)
+def sweep(project_id: int, body: SweepRequest, db: Session = Depends(get_db)):
+    """
+    Evaluate a whole grid of lever combinations in one request.
+
+    Rows are build delays, columns are unit reductions; the boolean levers apply to
+    every cell. Every cell is scored against the project's shared random draws, so
+    the grid answers questions like "what is the smallest unit cut that passes with
+    greywater on?" without dozens of /whatif round trips.
+    """
+    project = project_cache.get(db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
+    if project.status not in ("complete", "failed"):
+        raise HTTPException(
+            status_code=400,
+            detail="Simulation must be complete before running what-if scenarios.",
+        )
+
+    units = body.unit_reduction_pct
+    delays = body.build_delay_years
+    if units.stop < units.start or delays.stop < delays.start:
+        raise HTTPException(status_code=422, detail="Range stop must be >= start.")
+
+    unit_reduction_pcts = [round(float(x), 4) for x in np.linspace(units.start, units.stop, units.steps)]
+    build_delay_years = list(range(delays.start, delays.stop + 1, delays.step))
+
+    p_failure = sweep_levers(
+        unit_count=project.unit_count,
+        build_year=project.build_year,
+        unit_reduction_pcts=unit_reduction_pcts,
+        build_delay_years=build_delay_years,
+        greywater_recycling=body.greywater_recycling,
+        pipeline_added=body.pipeline_added,
+        parcel_acres=project.parcel_acres,
+        seed=project.simulation_seed,
     )
 
-    return results
+    return {
+        "unit_reduction_pct": unit_reduction_pcts,
+        "build_delay_years": build_delay_years,
+        "p_failure": np.round(p_failure, 4).tolist(),
+        "fail_threshold": FAIL_THRESHOLD,
+    }
@@ -17,7 +17,19 @@ class Recommendation(BaseModel):
     explanation: str                # plain-English explanation for the developer
 
 
+class RecommendationTiming(BaseModel):
+    total_ms: float                 # whole request, end to end
+    model_ms: float                 # waiting on the LLM (0 on a cache hit or skipped call)
+    simulation_ms: float            # solver + verifying the suggestions
+    fallback: bool                  # True if the local solver's suggestions were returned instead
+    fallback_reason: Optional[str] = None  # "timeout" | "model_error" | "no_suggestions" | "budget_exhausted" | "verification_timeout"
+
+    # model_ms is ours, not a pydantic "model_" attribute
+    model_config = {"protected_namespaces": ()}
+
+
 class RecommendationResponse(BaseModel):
     recommendations: List[Recommendation]
     unfixable: bool = False         # True if Claude determines no combination of levers can fix it
     unfixable_reason: Optional[str] = None
+    timing: Optional[RecommendationTiming] = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from schemas.simulation import FailurePoint
+
+
+class PortfolioRequest(BaseModel):
+    n_simulations: int = Field(default=1000, ge=100, le=20000, description="Joint Monte Carlo runs.")
+    seed: Optional[int] = Field(
+        default=None, ge=0,
+        description="Seed for the shared draws. Leave empty for fresh randomness.",
+    )
+
+
+class PortfolioAggregate(BaseModel):
+    verdict: str                              # "PASS" | "FAIL" for the pool as a whole
+    p_failure_by_end_year: float              # P(pool runs short at any point in the window)
+    first_failure_year: Optional[int]         # median first shortfall year; None if none
+    median_deficit_acre_feet: Optional[float] # None if the pool never runs short
+    failure_curve: List[FailurePoint]         # one entry per calendar year of the window
+
+
+class PortfolioProjectResult(BaseModel):
+    project_id: int
+    project_name: str
+    unit_count: int
+    build_year: int
+    verdict: str                              # "PASS" | "FAIL"
+    p_failure_by_end_year: float              # over this project's own 50-year window
+    simulation_end_year: int                  # build_year + 49
+    first_failure_year: Optional[int]         # None if PASS
+    failure_curve: List[FailurePoint]
+
+
+class PortfolioResponse(BaseModel):
+    project_count: int
+    development_allocation_acre_feet: float   # the shared pool every project draws on
+    simulation_start_year: int                # earliest build year
+    simulation_end_year: int                  # latest build year + 49
+    aggregate: PortfolioAggregate
+    projects: List[PortfolioProjectResult]
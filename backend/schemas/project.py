@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -8,7 +8,7 @@ class ProjectCreate(BaseModel):
     unit_count: int = Field(gt=0, description="Number of homes in the development")
     build_year: int = Field(ge=2025, le=2075, description="Year the development comes online")
     parcel_geojson: Dict[str, Any] = Field(
-        description="GeoJSON Feature object with a Polygon geometry representing the parcel"
+        description="GeoJSON Feature object with a Polygon or MultiPolygon geometry representing the parcel"
     )
     greywater_recycling: bool = False
     pipeline_added: bool = False
@@ -20,9 +20,34 @@ class ProjectResponse(BaseModel):
     unit_count: int
     build_year: int
     parcel_geojson: Dict[str, Any]
+    parcel_acres: float
+    parcel_centroid_lat: Optional[float] = None
+    parcel_centroid_lng: Optional[float] = None
+    parcel_bbox: Optional[List[float]] = None  # [west, south, east, north]
+    irrigated_acres: float
     greywater_recycling: bool
     pipeline_added: bool
-    status: str  # "pending" | "running" | "complete" | "failed"
+    simulation_seed: int
+    status: str  # "pending" | "queued" | "running" | "complete" | "failed"
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ProjectMapItem(BaseModel):
+    """One parcel on the map view — enough to draw it and colour it by verdict."""
+    id: int
+    project_name: str
+    unit_count: int
+    build_year: int
+    status: str
+    verdict: Optional[str] = None  # "PASS" | "FAIL", null until the simulation completes
+    parcel_acres: float
+    parcel_centroid_lat: Optional[float] = None
+    parcel_centroid_lng: Optional[float] = None
+    parcel_bbox: Optional[List[float]] = None
+    parcel_geojson: Dict[str, Any]
+
+
+class NearbyProject(ProjectMapItem):
+    distance_m: float  # closest distance between the two parcels, 0 if they touch or overlap
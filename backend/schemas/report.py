@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from schemas.whatif import WhatIfRequest
+
+
+class BulkReportItem(BaseModel):
+    project_id: int
+    # Lever adjustments for this report — leave empty for the stored simulation results
+    levers: Optional[WhatIfRequest] = None
+
+
+class BulkReportRequest(BaseModel):
+    # One report per item, in this order. A project can appear more than once
+    # with different lever sets.
+    items: List[BulkReportItem] = Field(min_length=1, max_length=1000)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class FailurePoint(BaseModel):
@@ -14,6 +14,12 @@ class ScenarioResults(BaseModel):
     reduced_snowpack: str   # "PASS" | "FAIL"
 
 
+class ScenarioDetail(BaseModel):
+    verdict: str                              # "PASS" | "FAIL"
+    first_failure_year: Optional[int]         # None if PASS
+    min_margin_acre_feet: float               # tightest supply − demand; negative = deficit
+
+
 class SimulationResult(BaseModel):
     verdict: str                              # "PASS" | "FAIL"
     p_failure_by_end_year: float              # 0.0 – 1.0
@@ -22,8 +28,15 @@ class SimulationResult(BaseModel):
     median_deficit_acre_feet: Optional[float] # None if PASS
     failure_curve: List[FailurePoint]         # one entry per year of the simulation window
     scenario_results: ScenarioResults
+    scenario_details: Optional[Dict[str, ScenarioDetail]] = None  # per-scenario year + margin
+    n_simulations_run: Optional[int] = None   # Monte Carlo runs behind the estimate
+    p_failure_ci_low: Optional[float] = None  # 99% Wilson interval on p_failure_by_end_year
+    p_failure_ci_high: Optional[float] = None
+    # Per-run distributions — only returned when requested via ?fields=
+    run_first_failure_years: Optional[List[Optional[int]]] = None  # None = run never failed
+    run_deficits_acre_feet: Optional[List[Optional[float]]] = None
 
 
 class SimulationStatusResponse(BaseModel):
-    status: str                              # "pending" | "running" | "complete" | "failed"
+    status: str                              # "pending" | "queued" | "running" | "complete" | "failed"
     results: Optional[SimulationResult]      # None until status is "complete"
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List
 
 
 class WhatIfRequest(BaseModel):
@@ -18,3 +19,29 @@ class WhatIfRequest(BaseModel):
         default=0, ge=0, le=20,
         description="Number of years to delay the build phase start date."
     )
+
+
+class UnitReductionRange(BaseModel):
+    start: float = Field(default=0.0, ge=0.0, le=1.0)
+    stop: float = Field(default=0.5, ge=0.0, le=1.0)
+    steps: int = Field(default=11, ge=1, le=101, description="Evenly spaced points from start to stop, inclusive.")
+
+
+class BuildDelayRange(BaseModel):
+    start: int = Field(default=0, ge=0, le=20)
+    stop: int = Field(default=10, ge=0, le=20)
+    step: int = Field(default=1, ge=1, le=20)
+
+
+class SweepRequest(BaseModel):
+    unit_reduction_pct: UnitReductionRange = UnitReductionRange()
+    build_delay_years: BuildDelayRange = BuildDelayRange()
+    greywater_recycling: bool = False
+    pipeline_added: bool = False
+
+
+class SweepResponse(BaseModel):
+    unit_reduction_pct: List[float]     # column values
+    build_delay_years: List[int]        # row values
+    p_failure: List[List[float]]        # p_failure[row][col] — one row per build delay
+    fail_threshold: float               # cells above this are FAIL
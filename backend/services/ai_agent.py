@@ -2,30 +2,66 @@
 Thallo — AI Agent Service
 
 Calls a Cerebras-hosted LLM to suggest water-use interventions for a failed project.
+The model is reached through services/llm_client.py, which caches responses and can
+swap in a deterministic offline stand-in (AGENT_LLM_BACKEND=local).
 
 Flow:
   1. Build a plain-English prompt describing the failure (p_failure, first failure year, etc.)
   2. Define a tool called `suggest_interventions` — the model must call this tool,
      which forces its response into a structured JSON shape we control.
   3. For each lever combination the model suggests, run the REAL simulation so the
-     projected outcomes are honest numbers, not the model's estimates.
+     projected outcomes are honest numbers, not the model's estimates. The
+     suggestions are verified concurrently on the what-if thread pool, all against
+     the project's parcel and seed — the same simulated futures as the original run.
   4. Sort by projected failure probability and return ranked recommendations.
 
+Before the model is called, the local intervention solver computes the exact
+minimum unit cut / delay that passes for each greywater + pipeline combination.
+Those thresholds go into the prompt, and if the model call fails they are
+returned directly as the recommendations.
+
 Model's job: decide WHICH levers to pull.
 Simulation engine's job: compute WHAT ACTUALLY HAPPENS if you pull them.
+
+Everything here is async: the model call awaits the network and the simulation
+work runs on the what-if pool, so a /recommend request never holds a thread
+while it waits.
+
+Latency budget:
+  A /recommend call gets RECOMMEND_BUDGET_SECONDS end to end, and every stage
+  runs under a deadline:
+    - the solver gets the budget minus RECOMMEND_VERIFY_RESERVE_SECONDS;
+    - the model gets whatever the solver leaves, minus the same reserve; within
+      that the LLM client times out, hedges and retries (services/llm_client.py);
+    - verifying the model's suggestions gets the rest of the budget — at least
+      the reserve when the earlier stages kept to theirs.
+  If the model or the verification runs out of time, the solver's suggestions
+  (which it has already simulated) are returned instead. If the solver itself
+  runs out, the response is empty but not marked unfixable — nothing was ruled
+  out. Every response carries its timings and whether the fallback was used,
+  and the same numbers are logged.
 """
 
-import json
+import asyncio
+import logging
 import os
-from cerebras.cloud.sdk import Cerebras
-from services.simulation_engine import run_simulation
+import time
+from functools import partial
+from services.intervention_solver import MAX_BUILD_DELAY_YEARS, MAX_UNIT_REDUCTION_PCT, find_minimal_interventions
+from services.llm_client import LLMError, LLMTimeoutError, llm_client
+from services.result_cache import cached_simulation, normalize_levers
+from services.whatif_runner import whatif_runner
 
+logger = logging.getLogger(__name__)
 
-# ---------------------------------------------------------------------------
-# Cerebras client — reads CEREBRAS_API_KEY from environment automatically
-# ---------------------------------------------------------------------------
+RECOMMEND_BUDGET_SECONDS = float(os.getenv("RECOMMEND_BUDGET_SECONDS", "10"))
+RECOMMEND_VERIFY_RESERVE_SECONDS = float(os.getenv("RECOMMEND_VERIFY_RESERVE_SECONDS", "1"))
 
-_client = Cerebras()
+UNFIXABLE_REASON = (
+    "No combination of the available interventions reduces the failure "
+    "probability below 15%. The development may need to be significantly "
+    "reduced in scale or relocated to a different water service area."
+)
 
 
 # ---------------------------------------------------------------------------
@@ -59,8 +95,10 @@ _SUGGEST_TOOL = {
                         "properties": {
                             "unit_reduction_pct": {
                                 "type": "number",
+                                "minimum": 0.0,
+                                "maximum": MAX_UNIT_REDUCTION_PCT / 100,
                                 "description": (
-                                    "Fraction of units to cut (0.0–1.0). "
+                                    f"Fraction of units to cut (0.0–{MAX_UNIT_REDUCTION_PCT / 100}). "
                                     "0.2 = 20% fewer homes. 0.0 = no reduction."
                                 ),
                             },
@@ -80,8 +118,10 @@ _SUGGEST_TOOL = {
                             },
                             "build_delay_years": {
                                 "type": "integer",
+                                "minimum": 0,
+                                "maximum": MAX_BUILD_DELAY_YEARS,
                                 "description": (
-                                    "Years to delay construction start (0–10). "
+                                    f"Years to delay construction start (0–{MAX_BUILD_DELAY_YEARS}). "
                                     "Buys time for supply infrastructure to catch up."
                                 ),
                             },
@@ -103,28 +143,134 @@ _SUGGEST_TOOL = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Local solver helpers
+# ---------------------------------------------------------------------------
+
+def _describe_levers(levers: dict) -> str:
+    parts = []
+    if levers["unit_reduction_pct"] > 0:
+        parts.append(f"cut units by {levers['unit_reduction_pct'] * 100:.0f}%")
+    if levers["greywater_recycling"]:
+        parts.append("add greywater recycling")
+    if levers["pipeline_added"]:
+        parts.append("add a pipeline")
+    if levers["build_delay_years"] > 0:
+        parts.append(f"delay the build {levers['build_delay_years']} years")
+    return ", ".join(parts) or "no changes"
+
+
+def _solver_fallback(solutions) -> dict:
+    """
+    The response built from the solver's suggestions alone. solutions is None when
+    the solver didn't finish in time — then nothing is known, so nothing is unfixable.
+    """
+    recommendations = _local_recommendations(solutions or [])
+    unfixable = solutions is not None and not recommendations
+    return {
+        "recommendations": recommendations,
+        "unfixable": unfixable,
+        "unfixable_reason": UNFIXABLE_REASON if unfixable else None,
+    }
+
+
+def _local_recommendations(solutions: list, limit: int = 3) -> list:
+    """Turn solver output into Recommendation dicts — used when the model is unavailable."""
+    return [
+        {
+            "rank": i + 1,
+            "levers": s["levers"],
+            "projected_verdict": s["projected_verdict"],
+            "projected_p_failure": s["projected_p_failure"],
+            "explanation": (
+                f"Smallest passing change found by the local solver: {_describe_levers(s['levers'])}. "
+                f"Projected failure probability {s['projected_p_failure'] * 100:.1f}%."
+            ),
+        }
+        for i, s in enumerate(solutions[:limit])
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+async def _verify(project_id: int, unit_count: int, build_year: int, seed, parcel_acres: float, lever_sets: list) -> list:
+    """
+    Simulate every lever set concurrently on the what-if pool and return the results
+    in the same order. Duplicate suggestions are simulated once.
+    """
+    keys = [tuple(normalize_levers(**levers).values()) for levers in lever_sets]
+    unique = dict(zip(keys, lever_sets))
+
+    results = await asyncio.gather(*(
+        whatif_runner.run(partial(
+            cached_simulation,
+            project_id=project_id,
+            unit_count=unit_count,
+            build_year=build_year,
+            seed=seed,
+            parcel_acres=parcel_acres,
+            source="agent",
+            **levers,
+        ))
+        for levers in unique.values()
+    ))
+    by_key = dict(zip(unique, results))
+    return [by_key[key] for key in keys]
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+def _with_timing(response: dict, project_id: int, started: float, model_s: float, simulation_s: float, fallback_reason) -> dict:
+    response["timing"] = {
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "model_ms": round(model_s * 1000, 1),
+        "simulation_ms": round(simulation_s * 1000, 1),
+        "fallback": fallback_reason is not None,
+        "fallback_reason": fallback_reason,
+    }
+    logger.info("recommend project=%s %s", project_id, " ".join(f"{k}={v}" for k, v in response["timing"].items()))
+    return response
+
+
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
 
-def get_recommendations(
+async def get_recommendations(
+    project_id: int,
     unit_count: int,
     build_year: int,
     simulation_result: dict,
+    seed: int = None,
+    parcel_acres: float = 0.0,
 ) -> dict:
     """
     Ask the Cerebras model for intervention suggestions, then verify each one
     with the real simulation engine before returning results.
 
     Args:
+        project_id:        the project's id — namespaces the result cache
         unit_count:        number of homes in the development
         build_year:        year the development comes online
         simulation_result: the full result dict from run_simulation()
+        seed:              the project's simulation seed, so every suggestion is scored
+                           against the same simulated futures as the original run
+        parcel_acres:      the project's parcel area, for outdoor irrigation demand
 
     Returns:
         dict matching the RecommendationResponse schema in schemas/agent.py
     """
 
+    started = time.perf_counter()
+    deadline = started + RECOMMEND_BUDGET_SECONDS
+
+    def remaining() -> float:
+        return deadline - time.perf_counter()
+
     # --- Step 1: Build the prompt ---
 
     p_fail     = simulation_result["p_failure_by_end_year"]
@@ -136,6 +282,27 @@ def get_recommendations(
         f"{k.replace('_', ' ')}: {v}" for k, v in scenarios.items()
     )
 
+    # Exact pass thresholds from the local solver — grounds the model in real numbers
+    try:
+        solutions = await asyncio.wait_for(
+            whatif_runner.run(partial(
+                find_minimal_interventions,
+                unit_count=unit_count,
+                build_year=build_year,
+                seed=seed,
+                parcel_acres=parcel_acres,
+            )),
+            timeout=max(remaining() - RECOMMEND_VERIFY_RESERVE_SECONDS, 0.0),
+        )
+    except asyncio.TimeoutError:
+        simulation_s = time.perf_counter() - started
+        return _with_timing(_solver_fallback(None), project_id, started, 0.0, simulation_s, "budget_exhausted")
+    simulation_s = time.perf_counter() - started
+    solver_summary = "\n".join(
+        f"- {_describe_levers(s['levers'])} → {s['projected_p_failure'] * 100:.1f}% failure"
+        for s in solutions
+    ) or "- None: no single-axis change within the lever ranges passes."
+
     prompt = f"""
 A proposed housing development in Cache County, Utah has FAILED its 50-year water viability check.
 
@@ -151,13 +318,16 @@ Failure summary:
 - Fixed-scenario outcomes: {scenario_summary}
 
 Available interventions:
-- unit_reduction_pct (0.0–1.0): Reduce the number of homes. 0.2 = 20% fewer units, 20% less demand.
+- unit_reduction_pct (0.0–{MAX_UNIT_REDUCTION_PCT / 100}): Reduce the number of homes. 0.2 = 20% fewer units, 20% less demand.
 - greywater_recycling (true/false): Greywater recycling cuts indoor municipal demand by 28%.
 - pipeline_added (true/false): A new pipeline or water rights purchase adds 500 acre-feet/year to supply.
-- build_delay_years (0–10): Delaying construction shifts when demand starts, giving supply time to catch up.
+- build_delay_years (0–{MAX_BUILD_DELAY_YEARS}): Delaying construction shifts when demand starts, giving supply time to catch up.
 
 The project passes if P(failure by 2074) drops to 15% or below.
 
+Minimum passing changes already verified by the simulation engine:
+{solver_summary}
+
 Suggest 2–3 distinct intervention combinations that could fix this project.
 Rank them from most to least impactful. Consider cost and practicality in your explanations.
     """.strip()
@@ -165,48 +335,72 @@ Rank them from most to least impactful. Consider cost and practicality in your e
     # --- Step 2: Call the model ---
     # tool_choice forces the model to call our tool rather than writing a free-text reply.
     # This guarantees the response has the exact structure we need.
-
-    response = _client.chat.completions.create(
-        model="gpt-oss-120b",
-        max_tokens=1024,
-        tools=[_SUGGEST_TOOL],
-        tool_choice={"type": "function", "function": {"name": "suggest_interventions"}},
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    # --- Step 3: Extract the model's suggestions ---
-    # With forced tool use there will be exactly one tool call in the response.
-
-    tool_call = response.choices[0].message.tool_calls[0]
-    data = json.loads(tool_call.function.arguments)
-    interventions = data.get("interventions", [])
+    # The same prompt always asks the same question, so a repeat is answered from the
+    # LLM response cache without a model round trip (services/llm_client.py).
+
+    # If the model is unreachable, too slow for the budget or returns something
+    # unparseable, fall back to the solver's thresholds — they are already verified,
+    # so the response stays honest.
+
+    model_budget = remaining() - RECOMMEND_VERIFY_RESERVE_SECONDS
+    model_started = time.perf_counter()
+    interventions = []
+    fallback_reason = None
+    if model_budget <= 0:
+        fallback_reason = "budget_exhausted"
+    else:
+        try:
+            # --- Step 3: Extract the model's suggestions ---
+            data = await llm_client.call_tool(prompt, _SUGGEST_TOOL, budget_seconds=model_budget)
+            interventions = data.get("interventions") or []
+            if not interventions:
+                fallback_reason = "no_suggestions"
+        except LLMTimeoutError:
+            fallback_reason = "timeout"
+        except LLMError:
+            fallback_reason = "model_error"
+    model_s = time.perf_counter() - model_started
+
+    if not interventions:
+        return _with_timing(_solver_fallback(solutions), project_id, started, model_s, simulation_s, fallback_reason)
 
     # --- Step 4: Run the real simulation for each suggestion ---
     # The model picks levers. The simulation engine computes the real outcome.
     # This means the projected_p_failure numbers are honest — not the model's guess.
+    # Suggestions often repeat a slider state the user already tried, so go through the cache.
+    # Verification gets the rest of the budget; if it can't finish, the solver's
+    # suggestions are returned rather than unverified numbers.
 
-    recommendations = []
-    for suggestion in interventions:
-        levers = {
+    lever_sets = [
+        {
             "unit_reduction_pct": float(suggestion.get("unit_reduction_pct") or 0.0),
             "greywater_recycling": bool(suggestion.get("greywater_recycling") or False),
             "pipeline_added":      bool(suggestion.get("pipeline_added") or False),
             "build_delay_years":   int(suggestion.get("build_delay_years") or 0),
         }
-
-        result = run_simulation(
-            unit_count=unit_count,
-            build_year=build_year,
-            **levers,
+        for suggestion in interventions
+    ]
+    verify_started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(
+            _verify(project_id, unit_count, build_year, seed, parcel_acres, lever_sets),
+            timeout=max(remaining(), 0.0),
         )
+    except asyncio.TimeoutError:
+        simulation_s += time.perf_counter() - verify_started
+        return _with_timing(_solver_fallback(solutions), project_id, started, model_s, simulation_s, "verification_timeout")
+    simulation_s += time.perf_counter() - verify_started
 
-        recommendations.append({
+    recommendations = [
+        {
             "rank": 0,  # set after sorting below
             "levers": levers,
             "projected_verdict":   result["verdict"],
             "projected_p_failure": result["p_failure_by_end_year"],
             "explanation":         suggestion.get("explanation", ""),
-        })
+        }
+        for suggestion, levers, result in zip(interventions, lever_sets, results)
+    ]
 
     # --- Step 5: Sort and assign final ranks ---
     # Sort by projected failure probability ascending — best outcome = rank 1.
@@ -219,12 +413,8 @@ Rank them from most to least impactful. Consider cost and practicality in your e
 
     all_fail = all(r["projected_verdict"] == "FAIL" for r in recommendations)
 
-    return {
+    return _with_timing({
         "recommendations": recommendations,
         "unfixable": all_fail,
-        "unfixable_reason": (
-            "No combination of the available interventions reduces the failure "
-            "probability below 15%. The development may need to be significantly "
-            "reduced in scale or relocated to a different water service area."
-        ) if all_fail else None,
-    }
+        "unfixable_reason": UNFIXABLE_REASON if all_fail else None,
+    }, project_id, started, model_s, simulation_s, fallback_reason)
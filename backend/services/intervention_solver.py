@@ -0,0 +1,150 @@
+"""
+DataDungeon — Minimal-Intervention Solver
+
+Finds the smallest lever change that turns a FAIL into a PASS, using the
+simulation engine directly instead of guessing.
+
+For each of the four greywater / pipeline combinations it searches two axes:
+  - unit_reduction_pct (no delay) — bisection over whole percents. Cutting units
+    only ever lowers demand, and with the project seed fixing the random draws,
+    p_failure is monotone in the cut, so bisection converges on the exact threshold.
+  - build_delay_years (no unit cut) — a single sweep over every whole-year delay.
+    Delay is NOT monotone (the supply trend keeps declining while you wait),
+    so every value is checked and the smallest passing one is kept.
+
+Every candidate is scored against the same cached paths as /whatif, so a
+solution reported here reproduces exactly on the slider.
+"""
+
+from itertools import product
+
+from services.simulation_engine import FAIL_THRESHOLD, N_SIMULATIONS, sweep_levers
+
+# Search bounds — the same ranges the lever panel and the AI agent offer.
+# Unit reductions are searched in whole percent so every candidate is exactly
+# a value the caller can pass back to run_simulation. The cap sits well short of
+# a full cut: 100% fewer homes means no demand at all, which always "passes".
+MAX_UNIT_REDUCTION_PCT = 50
+MAX_BUILD_DELAY_YEARS = 10
+
+
+def _p_failure(inputs: dict, unit_reduction_pct: float, build_delay_years: int, **booleans) -> float:
+    return float(sweep_levers(
+        unit_reduction_pcts=[unit_reduction_pct],
+        build_delay_years=[build_delay_years],
+        **booleans,
+        **inputs,
+    )[0, 0])
+
+
+def _min_unit_reduction(inputs: dict, **booleans):
+    """Smallest whole-percent unit cut that passes with no delay, or None."""
+    def passes(percent: int) -> bool:
+        return _p_failure(inputs, percent / 100, 0, **booleans) <= FAIL_THRESHOLD
+
+    if passes(0):
+        return 0.0
+    if not passes(MAX_UNIT_REDUCTION_PCT):
+        return None
+
+    # Invariant: lo fails, hi passes
+    lo, hi = 0, MAX_UNIT_REDUCTION_PCT
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if passes(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi / 100
+
+
+def _min_build_delay(inputs: dict, **booleans):
+    """Smallest whole-year delay that passes with no unit cut, or None."""
+    delays = list(range(MAX_BUILD_DELAY_YEARS + 1))
+    p_failure = sweep_levers(
+        unit_reduction_pcts=[0.0],
+        build_delay_years=delays,
+        **booleans,
+        **inputs,
+    )[:, 0]
+    for delay, p in zip(delays, p_failure):
+        if p <= FAIL_THRESHOLD:
+            return delay
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Main entry point
+# ---------------------------------------------------------------------------
+
+def find_minimal_interventions(
+    unit_count: int,
+    build_year: int,
+    parcel_geojson: dict = None,
+    seed=None,
+    n_simulations: int = N_SIMULATIONS,
+    parcel_acres: float = None,
+) -> list:
+    """
+    Search every greywater / pipeline combination for the smallest passing
+    unit cut and the smallest passing build delay. Pass parcel_acres (or the
+    parcel itself) so outdoor irrigation demand is included.
+
+    Returns:
+        list of passing solutions, cheapest first. Each entry:
+            {
+                "levers": {unit_reduction_pct, greywater_recycling, pipeline_added, build_delay_years},
+                "projected_p_failure": float,
+                "projected_verdict": "PASS",
+                "searched": "unit_reduction_pct" | "build_delay_years",
+            }
+        Empty if nothing within the search bounds passes.
+    """
+    inputs = {
+        "unit_count": unit_count,
+        "build_year": build_year,
+        "parcel_geojson": parcel_geojson,
+        "parcel_acres": parcel_acres,
+        "seed": seed,
+        "n_simulations": n_simulations,
+    }
+
+    solutions = []
+    seen = set()
+
+    for greywater, pipeline in product((False, True), repeat=2):
+        booleans = {"greywater_recycling": greywater, "pipeline_added": pipeline}
+
+        candidates = [
+            ("unit_reduction_pct", _min_unit_reduction(inputs, **booleans), 0),
+            ("build_delay_years", 0.0, _min_build_delay(inputs, **booleans)),
+        ]
+        for searched, reduction, delay in candidates:
+            if reduction is None or delay is None:
+                continue
+            levers = {
+                "unit_reduction_pct": reduction,
+                "greywater_recycling": greywater,
+                "pipeline_added": pipeline,
+                "build_delay_years": delay,
+            }
+            # Both searches land on the same point when the booleans alone pass
+            key = tuple(levers.values())
+            if key in seen:
+                continue
+            seen.add(key)
+
+            solutions.append({
+                "levers": levers,
+                "projected_p_failure": round(_p_failure(inputs, reduction, delay, **booleans), 4),
+                "projected_verdict": "PASS",
+                "searched": searched,
+            })
+
+    # Cheapest first: fewest infrastructure changes, then smallest cut, then shortest delay
+    solutions.sort(key=lambda s: (
+        s["levers"]["greywater_recycling"] + s["levers"]["pipeline_added"],
+        s["levers"]["unit_reduction_pct"],
+        s["levers"]["build_delay_years"],
+    ))
+    return solutions
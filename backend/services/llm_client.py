@@ -0,0 +1,334 @@
+"""
+DataDungeon — LLM Client
+
+The AI agent's only way to talk to a model. It makes one forced tool call and
+returns the tool's arguments as a dict, behind a content-addressed cache.
+
+Backends (pick with AGENT_LLM_BACKEND in backend/.env):
+  - "cerebras" → the hosted model via the Cerebras SDK (default). The SDK client is
+                 built on the first call, so importing the app never needs network
+                 access or credentials.
+  - "local"    → a deterministic offline stand-in. It fills the tool's JSON schema
+                 from a hash of the prompt, so the same prompt always gets the same
+                 answer. Use it to run or load-test the whole agent path on a box
+                 with no model access.
+Both implement `async call_tool(model, prompt, tool, max_tokens) -> dict`; any
+object with that method can be passed to LLMClient.
+
+Every answer is checked against the tool's JSON schema (types, required
+properties, minimum/maximum and minItems/maxItems) before it is returned or cached. One that doesn't fit counts as a
+failed attempt, so callers only ever see well-formed arguments or an LLMError.
+
+Cache:
+  Key = SHA-256 of (backend, model, prompt, tool schema, max_tokens). The prompt
+  is built from the failure summary and the solver's thresholds, so an identical
+  project state asks an identical question and gets the stored answer back
+  without a model round trip. The store is the same in-process LRU or Redis
+  backend as the result cache (LLM_CACHE_URL, defaulting to RESULT_CACHE_URL).
+  Failed calls are never cached.
+
+Latency:
+  Every call_tool() gets a time budget. Within it each attempt has its own
+  timeout (LLM_CALL_TIMEOUT_SECONDS); an attempt still running after
+  LLM_HEDGE_AFTER_SECONDS is hedged with a duplicate request and the first
+  answer wins. Failed attempts are retried after a full-jitter exponential
+  backoff, up to LLM_MAX_ATTEMPTS. When the budget runs out the call raises
+  LLMTimeoutError instead of waiting on a slow model.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+
+from services.result_cache import RESULT_CACHE_URL, MemoryBackend, RedisBackend
+
+
+# ---------------------------------------------------------------------------
+# Configuration — override through backend/.env
+# ---------------------------------------------------------------------------
+
+AGENT_LLM_BACKEND = os.getenv("AGENT_LLM_BACKEND", "cerebras")
+AGENT_MODEL = os.getenv("AGENT_MODEL", "gpt-oss-120b")
+
+LLM_CACHE_URL = os.getenv("LLM_CACHE_URL", RESULT_CACHE_URL)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "6"))
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "2.5"))  # 0 disables hedging
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.25"))
+
+
+class LLMError(Exception):
+    """The model call failed or returned something that isn't a usable tool call."""
+
+
+class LLMTimeoutError(LLMError):
+    """The call's time budget ran out before the model answered."""
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class CerebrasBackend:
+    name = "cerebras"
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Imported and constructed on first use — reads CEREBRAS_API_KEY from the environment
+            from cerebras.cloud.sdk import AsyncCerebras
+
+            # Retries and timeouts are handled by LLMClient, within the caller's budget
+            self._client = AsyncCerebras(max_retries=0)
+        return self._client
+
+    async def call_tool(self, model: str, prompt: str, tool: dict, max_tokens: int) -> dict:
+        from cerebras.cloud.sdk import CerebrasError
+
+        try:
+            # tool_choice forces the model to call our tool rather than writing a free-text
+            # reply, so there will be exactly one tool call in the response.
+            response = await self.client.chat.completions.create(
+                model=model,
+                max_tokens=max_tokens,
+                tools=[tool],
+                tool_choice={"type": "function", "function": {"name": tool["function"]["name"]}},
+                messages=[{"role": "user", "content": prompt}],
+            )
+            tool_call = response.choices[0].message.tool_calls[0]
+            return json.loads(tool_call.function.arguments)
+        except (CerebrasError, json.JSONDecodeError, IndexError, TypeError) as e:
+            raise LLMError(str(e)) from e
+
+
+class LocalBackend:
+    """
+    Deterministic stand-in: generates arguments that satisfy the tool's JSON schema
+    (types, minItems/maxItems, minimum/maximum) from a generator seeded by the prompt.
+    """
+
+    name = "local"
+
+    async def call_tool(self, model: str, prompt: str, tool: dict, max_tokens: int) -> dict:
+        seed = int.from_bytes(hashlib.sha256(f"{model}\n{prompt}".encode()).digest()[:8], "big")
+        return _fill_schema(tool["function"]["parameters"], random.Random(seed), "suggestion")
+
+
+def _fill_schema(schema: dict, rng: random.Random, label: str):
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _fill_schema(sub, rng, name) for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = rng.randint(schema.get("minItems", 1), schema.get("maxItems", schema.get("minItems", 1)))
+        return [_fill_schema(schema.get("items", {}), rng, f"{label} {i + 1}") for i in range(count)]
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 0), schema.get("maximum", 10))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 2)
+    if kind == "string":
+        return f"Offline stand-in {label} — generated locally, not by a model."
+    return None
+
+
+BACKENDS = {"cerebras": CerebrasBackend, "local": LocalBackend}
+
+
+# ---------------------------------------------------------------------------
+# Answer validation
+# ---------------------------------------------------------------------------
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+    "number": (int, float),
+}
+
+
+def check_arguments(arguments, tool: dict) -> dict:
+    """Return arguments if they fit the tool's parameter schema, else raise LLMError."""
+    _check_value(arguments, tool["function"]["parameters"], "arguments")
+    return arguments
+
+
+def _check_value(value, schema: dict, path: str):
+    kind = schema.get("type")
+    expected = _JSON_TYPES.get(kind)
+    # bool is an int in Python, but not a JSON number
+    if expected and (not isinstance(value, expected) or (kind in ("integer", "number") and isinstance(value, bool))):
+        raise LLMError(f"Tool call {path}: expected {kind}, got {type(value).__name__}")
+    if kind in ("integer", "number"):
+        # An out-of-range lever (a 150% unit cut, a 50-year delay) would be simulated as-is
+        if not math.isfinite(value):
+            raise LLMError(f"Tool call {path}: {value} is not a finite number")
+        if "minimum" in schema and value < schema["minimum"]:
+            raise LLMError(f"Tool call {path}: {value} is below the minimum {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            raise LLMError(f"Tool call {path}: {value} is above the maximum {schema['maximum']}")
+    elif kind == "object":
+        missing = [name for name in schema.get("required", []) if name not in value]
+        if missing:
+            raise LLMError(f"Tool call {path}: missing {', '.join(missing)}")
+        for name, sub in schema.get("properties", {}).items():
+            if name in value and value[name] is not None:
+                _check_value(value[name], sub, f"{path}.{name}")
+    elif kind == "array":
+        if len(value) < schema.get("minItems", 0):
+            raise LLMError(f"Tool call {path}: {len(value)} items, expected at least {schema['minItems']}")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            raise LLMError(f"Tool call {path}: {len(value)} items, expected at most {schema['maxItems']}")
+        for i, item in enumerate(value):
+            _check_value(item, schema.get("items", {}), f"{path}[{i}]")
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class LLMClient:
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, model: str, prompt: str, tool: dict, max_tokens: int) -> str:
+        payload = json.dumps(
+            {"backend": self.backend.name, "model": model, "prompt": prompt, "tool": tool, "max_tokens": max_tokens},
+            sort_keys=True,
+        )
+        return "llm:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    async def call_tool(
+        self,
+        prompt: str,
+        tool: dict,
+        model: str = AGENT_MODEL,
+        max_tokens: int = 1024,
+        budget_seconds: float = None,
+    ) -> dict:
+        """
+        The arguments of a forced call to tool. Raises LLMTimeoutError if no answer
+        arrives within budget_seconds (default: one attempt's timeout per attempt),
+        or LLMError if every attempt fails.
+        """
+        key = self.make_key(model, prompt, tool, max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return json.loads(cached)
+
+        with self._lock:
+            self.misses += 1
+        if budget_seconds is None:
+            budget_seconds = LLM_CALL_TIMEOUT_SECONDS * LLM_MAX_ATTEMPTS
+        arguments = await self._call_with_retries(model, prompt, tool, max_tokens, budget_seconds)
+        self.cache.set(key, json.dumps(arguments))
+        return arguments
+
+    async def _call_with_retries(self, model: str, prompt: str, tool: dict, max_tokens: int, budget_seconds: float) -> dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget_seconds
+        error = None
+        for attempt in range(LLM_MAX_ATTEMPTS):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                return await self._hedged_call(model, prompt, tool, max_tokens, min(LLM_CALL_TIMEOUT_SECONDS, remaining))
+            except LLMError as e:
+                error = e
+            # Full jitter — concurrent callers retrying a struggling backend spread out
+            backoff = random.uniform(0, LLM_RETRY_BASE_SECONDS * 2 ** attempt)
+            if attempt + 1 < LLM_MAX_ATTEMPTS:
+                await asyncio.sleep(max(0.0, min(backoff, deadline - loop.time())))
+
+        if error is None or loop.time() >= deadline:
+            raise LLMTimeoutError(f"No model answer within {budget_seconds:.1f}s") from error
+        raise error
+
+    async def _hedged_call(self, model: str, prompt: str, tool: dict, max_tokens: int, timeout: float) -> dict:
+        """One attempt, plus a duplicate request if the first is still running at the hedge point."""
+        loop = asyncio.get_running_loop()
+        give_up = loop.time() + timeout
+        hedge_at = loop.time() + LLM_HEDGE_AFTER_SECONDS if 0 < LLM_HEDGE_AFTER_SECONDS < timeout else None
+
+        async def attempt():
+            return check_arguments(await self.backend.call_tool(model, prompt, tool, max_tokens), tool)
+
+        def start():
+            return asyncio.ensure_future(attempt())
+
+        pending = {start()}
+        error = None
+        try:
+            while pending:
+                wake = give_up if hedge_at is None else min(give_up, hedge_at)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, wake - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if loop.time() >= give_up:
+                    raise LLMTimeoutError(f"Model call timed out after {timeout:.1f}s")
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    hedge_at = None
+                    with self._lock:
+                        self.hedges += 1
+                    pending.add(start())
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if isinstance(error, LLMError):
+            raise error
+        raise LLMError(str(error)) from error
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, hedges = self.hits, self.misses, self.hedges
+        return {
+            "backend": self.backend.name,
+            "cache": self.cache.name,
+            "entries": self.cache.size(),
+            "hits": hits,
+            "misses": misses,
+            "hedges": hedges,
+        }
+
+
+def _make_cache():
+    if LLM_CACHE_URL:
+        backend = RedisBackend.from_url(LLM_CACHE_URL)
+        backend.ttl_seconds = LLM_CACHE_TTL_SECONDS
+        return backend
+    return MemoryBackend(max_entries=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS)
+
+
+def _make_backend():
+    if AGENT_LLM_BACKEND not in BACKENDS:
+        raise ValueError(f"AGENT_LLM_BACKEND must be one of {sorted(BACKENDS)}, got {AGENT_LLM_BACKEND!r}")
+    return BACKENDS[AGENT_LLM_BACKEND]()
+
+
+# One client per API process
+llm_client = LLMClient(_make_backend(), _make_cache())
@@ -0,0 +1,178 @@
+"""
+DataDungeon — Parcel Geometry
+
+Measures the parcel polygon a developer draws on the map: area, centroid,
+bounding box and the irrigated-area estimate behind outdoor demand.
+
+The parcel never changes after the project is created, so it is measured once
+and the numbers are stored on the Project row. Everything downstream — the
+simulation engine, /whatif, the report, the portfolio — reads those columns
+instead of re-walking the GeoJSON on every request. Stored projects are measured
+by PostGIS (services/spatial.py); this NumPy version serves callers that only
+have GeoJSON, such as calc_parcel_area_acres().
+
+Geometry:
+  - Accepts a GeoJSON Feature, a bare Polygon or a MultiPolygon.
+  - The first ring of each polygon is its outline; any further rings are holes
+    and are subtracted.
+  - Coordinates are projected to metres with an equirectangular projection
+    centred on the parcel's mean latitude — accurate to well under 0.1% at
+    parcel scale in Cache County (~41.75° N).
+  - All rings are concatenated into one vertex array and measured in a single
+    vectorized Shoelace pass, so a hand-traced parcel with thousands of vertices
+    costs the same handful of NumPy calls as a rectangle.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from services.water_demand import irrigated_acres
+
+M_PER_DEG_LAT = 111_139.0
+SQ_M_PER_ACRE = 4_047.0
+
+
+@dataclass(frozen=True)
+class ParcelGeometry:
+    area_acres: float
+    centroid_lat: Optional[float]
+    centroid_lng: Optional[float]
+    bbox: Optional[Tuple[float, float, float, float]]  # GeoJSON order: west, south, east, north
+
+    def irrigated_acres(self, unit_count: int) -> float:
+        """Irrigated lawn and garden area for unit_count homes on this parcel."""
+        return float(irrigated_acres(unit_count, self.area_acres))
+
+    def columns(self, unit_count: int) -> dict:
+        """The Project column values for this parcel."""
+        return {
+            "parcel_acres": self.area_acres,
+            "parcel_centroid_lat": self.centroid_lat,
+            "parcel_centroid_lng": self.centroid_lng,
+            "parcel_bbox": list(self.bbox) if self.bbox else None,
+            "irrigated_acres": self.irrigated_acres(unit_count),
+        }
+
+
+EMPTY_PARCEL = ParcelGeometry(area_acres=0.0, centroid_lat=None, centroid_lng=None, bbox=None)
+
+
+def measure_parcel(parcel_geojson: dict) -> ParcelGeometry:
+    """
+    Area, centroid and bounding box of a GeoJSON parcel.
+    Returns EMPTY_PARCEL if the geometry is missing or malformed.
+    """
+    try:
+        polygons = _polygons(parcel_geojson)
+        xy, ring_ids, ring_signs = _flatten(polygons)
+    except (KeyError, IndexError, TypeError, ValueError):
+        return EMPTY_PARCEL
+    if not len(xy):
+        return EMPTY_PARCEL
+
+    lng, lat = xy[:, 0], xy[:, 1]
+    bbox = (float(lng.min()), float(lat.min()), float(lng.max()), float(lat.max()))
+
+    # Equirectangular projection around the mean latitude of the outlines
+    outline = ring_signs[ring_ids] > 0
+    ref_lat = float(lat[outline].mean())
+    m_per_deg_lng = M_PER_DEG_LAT * math.cos(math.radians(ref_lat))
+    x = lng * m_per_deg_lng
+    y = lat * M_PER_DEG_LAT
+
+    # Each vertex's successor within its own ring — the last vertex wraps to the
+    # first, so rings work whether or not the GeoJSON repeats the closing point
+    nxt = np.arange(1, len(xy) + 1)
+    ring_ends = np.flatnonzero(np.diff(ring_ids, append=-1))
+    ring_starts = np.concatenate(([0], ring_ends[:-1] + 1))
+    nxt[ring_ends] = ring_starts
+
+    # Shoelace terms, summed per ring
+    x_next, y_next = x[nxt], y[nxt]
+    cross = x * y_next - x_next * y
+    n_rings = len(ring_signs)
+    signed_area = np.bincount(ring_ids, cross, minlength=n_rings) / 2
+    moment_x = np.bincount(ring_ids, (x + x_next) * cross, minlength=n_rings) / 6
+    moment_y = np.bincount(ring_ids, (y + y_next) * cross, minlength=n_rings) / 6
+
+    # Orient every outline positive and every hole negative, whatever the winding
+    orientation = ring_signs * np.sign(signed_area)
+    area_m2 = float(np.sum(orientation * signed_area))
+    if area_m2 <= 0:
+        return ParcelGeometry(area_acres=0.0, centroid_lat=None, centroid_lng=None, bbox=bbox)
+
+    centroid_x = float(np.sum(orientation * moment_x)) / area_m2
+    centroid_y = float(np.sum(orientation * moment_y)) / area_m2
+    return ParcelGeometry(
+        area_acres=area_m2 / SQ_M_PER_ACRE,
+        centroid_lat=centroid_y / M_PER_DEG_LAT,
+        centroid_lng=centroid_x / m_per_deg_lng,
+        bbox=bbox,
+    )
+
+
+def geojson_geometry(parcel_geojson: dict) -> dict:
+    """
+    The Polygon or MultiPolygon geometry of a parcel, unwrapping a Feature.
+    Raises ValueError for anything else, and for rings PostGIS would reject:
+    fewer than 4 positions, or positions that aren't [lon, lat] numbers in range.
+    """
+    geometry = parcel_geojson if isinstance(parcel_geojson, dict) else {}
+    if geometry.get("type") == "Feature":
+        geometry = geometry.get("geometry") or {}
+    if geometry.get("type") not in ("Polygon", "MultiPolygon") or not geometry.get("coordinates"):
+        raise ValueError(f"Unsupported parcel geometry {geometry.get('type')!r} — expected a Polygon or MultiPolygon")
+
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+    if not isinstance(polygons, list):
+        raise ValueError("Parcel coordinates must be a list of polygons")
+    for polygon in polygons:
+        if not isinstance(polygon, list) or not polygon:
+            raise ValueError("Each parcel polygon must be a non-empty list of rings")
+        for ring in polygon:
+            _check_ring(ring)
+    return geometry
+
+
+def _check_ring(ring):
+    if not isinstance(ring, list) or len(ring) < 4:
+        raise ValueError("Each parcel ring needs at least 4 positions (3 corners plus the closing point)")
+    for position in ring:
+        if (
+            not isinstance(position, list)
+            or len(position) not in (2, 3)
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in position)
+        ):
+            raise ValueError(f"Parcel positions must be [lon, lat] number pairs, got {position!r}")
+        lng, lat = position[0], position[1]
+        if not (-180 <= lng <= 180 and -90 <= lat <= 90):
+            raise ValueError(f"Parcel position {position!r} is outside lon -180..180 / lat -90..90")
+
+
+def _polygons(parcel_geojson: dict) -> list:
+    """The polygons of a Feature / Polygon / MultiPolygon, each a list of rings."""
+    geometry = geojson_geometry(parcel_geojson)
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    return geometry["coordinates"]
+
+
+def _flatten(polygons: list) -> tuple:
+    """
+    All rings stacked into one (n_vertices, 2) array of lng/lat, with the ring
+    index of every vertex and +1 / -1 per ring for outlines / holes.
+    """
+    rings, signs = [], []
+    for polygon in polygons:
+        for i, ring in enumerate(polygon):
+            coords = np.asarray(ring, dtype=float)[:, :2]
+            if len(coords) >= 3:
+                rings.append(coords)
+                signs.append(1.0 if i == 0 else -1.0)
+    if not rings:
+        return np.empty((0, 2)), np.empty(0, dtype=np.intp), np.empty(0)
+    ring_ids = np.repeat(np.arange(len(rings)), [len(r) for r in rings])
+    return np.concatenate(rings), ring_ids, np.asarray(signs)
@@ -0,0 +1,64 @@
+"""
+DataDungeon — Simulation Progress Broker
+
+In-process publish/subscribe for simulation progress, feeding the
+GET /projects/{id}/results/stream Server-Sent Events endpoint.
+
+Publishers are the simulation executor's dispatcher threads; subscribers are
+SSE handlers running on the event loop. publish() hands each event to the
+subscriber's loop with call_soon_threadsafe, so it is safe to call from any thread.
+
+Events:
+  "status"   — {"status": "queued" | "running" | "complete" | "failed"}
+  "progress" — {"completed_runs", "n_simulations", "estimate": SimulationResult so far}
+  "result"   — the final SimulationResult
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    def __init__(self, project_id: int, loop: asyncio.AbstractEventLoop):
+        self.project_id = project_id
+        self.loop = loop
+        self.queue = asyncio.Queue()
+
+    async def get(self) -> tuple:
+        """Wait for the next (event, data) pair."""
+        return await self.queue.get()
+
+
+class ProgressBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)  # project_id → {Subscription}
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id: int) -> Subscription:
+        """Call from the event loop. Remember to unsubscribe() when the stream ends."""
+        subscription = Subscription(project_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def publish(self, project_id: int, event: str, data: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has closed — its stream is already gone
+                self.unsubscribe(subscription)
+
+
+progress_broker = ProgressBroker()
@@ -0,0 +1,166 @@
+"""
+DataDungeon — Project Input Cache
+
+A small process-local read-through cache of the project fields the simulation
+routes need: unit count, build year, parcel area, the boolean levers, the seed
+and the status. A slider session calls /whatif on every tick; with this cache
+only the first tick touches Postgres. The parcel area comes from the column
+measured at creation, so the polygon itself is never fetched.
+
+Invalidation:
+  - Any ORM write that changes a cached field drops the entry, both when the
+    change is flushed and again after the commit (so a reader can't re-cache
+    the old row between the two).
+  - Only settled projects ("complete" / "failed") are kept. While a simulation
+    is queued or running, every lookup goes to the database so the route sees
+    the status change as soon as it lands.
+  - Entries expire after PROJECT_CACHE_TTL_SECONDS, which bounds staleness for
+    writes made by another API process.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models.project import Project
+
+PROJECT_CACHE_MAX_ENTRIES = int(os.getenv("PROJECT_CACHE_MAX_ENTRIES", "4096"))
+PROJECT_CACHE_TTL_SECONDS = float(os.getenv("PROJECT_CACHE_TTL_SECONDS", "300"))
+
+# Statuses a project can sit in indefinitely — only these are cached
+SETTLED_STATUSES = ("complete", "failed")
+
+# Project columns read into a ProjectInputs. A write to any of them invalidates the entry.
+_COLUMNS = (
+    Project.id,
+    Project.project_name,
+    Project.unit_count,
+    Project.build_year,
+    Project.parcel_acres,
+    Project.greywater_recycling,
+    Project.pipeline_added,
+    Project.simulation_seed,
+    Project.status,
+)
+CACHED_FIELDS = tuple(column.key for column in _COLUMNS)
+
+
+@dataclass(frozen=True)
+class ProjectInputs:
+    id: int
+    project_name: str
+    unit_count: int
+    build_year: int
+    parcel_acres: float
+    greywater_recycling: bool
+    pipeline_added: bool
+    simulation_seed: int
+    status: str
+
+    @classmethod
+    def from_row(cls, row) -> "ProjectInputs":
+        return cls(
+            id=row.id,
+            project_name=row.project_name,
+            unit_count=row.unit_count,
+            build_year=row.build_year,
+            parcel_acres=row.parcel_acres,
+            greywater_recycling=row.greywater_recycling,
+            pipeline_added=row.pipeline_added,
+            simulation_seed=row.simulation_seed,
+            status=row.status,
+        )
+
+
+class ProjectCache:
+    def __init__(
+        self,
+        max_entries: int = PROJECT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = PROJECT_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # project_id → (stored_at, ProjectInputs)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, project_id: int):
+        """ProjectInputs for a project via a sync session, or None if it doesn't exist."""
+        cached = self._lookup(project_id)
+        if cached is not None:
+            return cached
+        row = db.execute(select(*_COLUMNS).where(Project.id == project_id)).first()
+        return self._store(row)
+
+    async def aget(self, db, project_id: int):
+        """Same as get(), with an AsyncSession."""
+        cached = self._lookup(project_id)
+        if cached is not None:
+            return cached
+        row = (await db.execute(select(*_COLUMNS).where(Project.id == project_id))).first()
+        return self._store(row)
+
+    def invalidate(self, project_id: int):
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _lookup(self, project_id: int):
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None:
+                stored_at, inputs = entry
+                if time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(project_id)
+                    self.hits += 1
+                    return inputs
+                del self._entries[project_id]
+            self.misses += 1
+            return None
+
+    def _store(self, row):
+        if row is None:
+            return None
+        inputs = ProjectInputs.from_row(row)
+        if inputs.status in SETTLED_STATUSES:
+            with self._lock:
+                self._entries[inputs.id] = (time.monotonic(), inputs)
+                self._entries.move_to_end(inputs.id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return inputs
+
+
+# One cache per API process
+project_cache = ProjectCache()
+
+
+# ---------------------------------------------------------------------------
+# Invalidation — fires for sync and async sessions alike
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Project, "after_update")
+def _invalidate_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in CACHED_FIELDS):
+        project_cache.invalidate(target.id)
+        state.session.info.setdefault("project_cache_dirty", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for project_id in session.info.pop("project_cache_dirty", ()):
+        project_cache.invalidate(project_id)
@@ -0,0 +1,163 @@
+"""
+DataDungeon — Report Cache
+
+Keeps rendered PDF reports so a repeat download, or a second click on the same
+slider state, is served without drawing the PDF again.
+
+Key (also the response's ETag):
+  SHA-256 of the project fields printed on the report, the normalized levers, the
+  simulation results, the report date and the layout version. Anything that would
+  change a byte of the PDF is in the key, so a stale report can never be served.
+  The date is included because the report prints "Generated <date>" — tomorrow's
+  download is a new report.
+
+The browser revalidates with If-None-Match; a matching ETag gets a 304 without
+the PDF being looked up or rendered (routers/report.py).
+
+Bounded by entry count and total size, evicting least-recently used first.
+One cache per worker process.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from services.report_generator import REPORT_LAYOUT_VERSION
+from services.result_cache import normalize_levers
+
+
+# ---------------------------------------------------------------------------
+# Configuration — override through backend/.env
+# ---------------------------------------------------------------------------
+
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+REPORT_CACHE_MAX_MB = float(os.getenv("REPORT_CACHE_MAX_MB", "64"))
+
+# Project columns that appear on the report
+REPORT_PROJECT_FIELDS = (
+    "id",
+    "project_name",
+    "unit_count",
+    "build_year",
+    "parcel_acres",
+    "irrigated_acres",
+    "parcel_centroid_lat",
+    "parcel_centroid_lng",
+    "greywater_recycling",
+    "pipeline_added",
+)
+
+
+def report_key(project, simulation_results: dict, levers: dict = None) -> str:
+    """Content hash of everything the report is drawn from."""
+    payload = json.dumps(
+        {
+            "layout": REPORT_LAYOUT_VERSION,
+            "date": date.today().isoformat(),
+            "project": {field: getattr(project, field) for field in REPORT_PROJECT_FIELDS},
+            "levers": normalize_levers(**levers) if levers else None,
+            "results": simulation_results,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class ReportCache:
+    """
+    Thread-safe LRU of rendered PDFs with an entry and a memory cap.
+
+    Rendering happens outside the lock — two requests racing on a cold key both
+    render, which is harmless because the same key produces the same report.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = REPORT_CACHE_MAX_ENTRIES,
+        max_bytes: int = int(REPORT_CACHE_MAX_MB * 1024 * 1024),
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key → PDF bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.render_seconds = 0.0
+
+    def get_or_render(self, key: str, render) -> bytes:
+        """Return the cached PDF for key, calling render() to build it on a miss."""
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pdf_bytes
+            self.misses += 1
+
+        started = time.perf_counter()
+        pdf_bytes = render()
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.render_seconds += elapsed
+            if key in self._entries:
+                self._remove(key)
+            # A report bigger than the whole budget is returned but never stored
+            if len(pdf_bytes) <= self.max_bytes:
+                self._entries[key] = pdf_bytes
+                self._bytes += len(pdf_bytes)
+                self._evict()
+        return pdf_bytes
+
+    def get(self, key: str):
+        """The cached PDF for key, or None. Only hits are counted — the caller decides whether to render."""
+        with self._lock:
+            pdf_bytes = self._entries.get(key)
+            if pdf_bytes is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return pdf_bytes
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "avg_render_ms": round(1000 * self.render_seconds / self.misses, 2) if self.misses else None,
+            }
+
+    def _remove(self, key):
+        self._bytes -= len(self._entries.pop(key))
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+
+# One cache per worker process
+report_cache = ReportCache()
@@ -0,0 +1,194 @@
+"""
+DataDungeon — Bulk Report Export
+
+Renders many PDF reports on a process pool and streams them back as one ZIP
+archive — the quarterly submission to the water district, in a single request.
+
+Flow:
+  1. The route validates every project up front (all exist, all simulated), so
+     errors are still ordinary 4xx responses, then hands ExportJobs to stream_zip().
+  2. Up to REPORT_EXPORT_IN_FLIGHT jobs are prepared at once. A job with levers
+     gets its results from cached_simulation() on the what-if pool (usually a cache
+     hit); a report already in the report cache is reused; anything else is
+     rendered on the export process pool.
+  3. Reports are written to the archive in request order as they finish. Each
+     PDF is yielded to the client and dropped as soon as it is written, so memory
+     holds the in-flight window, never the whole archive.
+  4. manifest.json, the last entry, lists every file with its project, levers and
+     ETag — or the error, for a report that failed to render. One bad report
+     doesn't abort the archive.
+
+The pool is separate from the simulation executor's, so a large export never
+delays POST /simulate. Bulk renders are not stored in the report cache — an
+export of hundreds of reports would flush the interactive downloads.
+
+Configure with REPORT_EXPORT_WORKERS and REPORT_EXPORT_IN_FLIGHT in backend/.env.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from types import SimpleNamespace
+from typing import Optional
+
+from services.report_cache import REPORT_PROJECT_FIELDS, report_cache, report_key
+from services.report_generator import generate_report, report_filename, report_template
+from services.result_cache import cached_simulation
+from services.whatif_runner import whatif_runner
+
+logger = logging.getLogger(__name__)
+
+REPORT_EXPORT_WORKERS = int(os.getenv("REPORT_EXPORT_WORKERS", "2"))
+REPORT_EXPORT_IN_FLIGHT = int(os.getenv("REPORT_EXPORT_IN_FLIGHT", str(2 * REPORT_EXPORT_WORKERS)))
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class ExportJob:
+    project: dict                    # REPORT_PROJECT_FIELDS + simulation_seed, from project_snapshot()
+    levers: Optional[dict] = None    # normalized levers, or None for the stored results
+    results: Optional[dict] = None   # stored results; computed from levers when None
+
+
+def project_snapshot(project) -> dict:
+    """The plain values a report needs from a Project row — picklable, and safe after the session closes."""
+    return {field: getattr(project, field) for field in REPORT_PROJECT_FIELDS + ("simulation_seed",)}
+
+
+# ---------------------------------------------------------------------------
+# Worker side — runs in the export processes
+# ---------------------------------------------------------------------------
+
+def _init_worker():
+    # Draw the template once per process, not on each process's first report
+    report_template()
+
+
+def _render(project: dict, results: dict, levers: Optional[dict]) -> bytes:
+    return generate_report(SimpleNamespace(**project), results, levers=levers)
+
+
+# ---------------------------------------------------------------------------
+# Streaming ZIP
+# ---------------------------------------------------------------------------
+
+class _ZipChunks:
+    """
+    Write-only sink for zipfile. It has no tell() or seek(), so zipfile writes
+    each entry's sizes after its data instead of seeking back — the archive can
+    be streamed front to back.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ReportExporter:
+    def __init__(self, workers: int = REPORT_EXPORT_WORKERS, in_flight: int = REPORT_EXPORT_IN_FLIGHT):
+        self.workers = workers
+        self.in_flight = in_flight
+        self._pool = None
+
+    def start(self):
+        # "spawn" for the same reason as the simulation executor — clean workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def stream_zip(self, jobs: list):
+        """Yield a ZIP archive of one report per job, in job order, a report at a time."""
+        if self._pool is None:
+            raise RuntimeError("Report exporter is not running")
+
+        sink = _ZipChunks()
+        manifest = []
+        pending = deque()
+        width = len(str(len(jobs)))
+        try:
+            # PDFs are already compressed — deflating them again costs CPU for nothing
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+                for i, job in enumerate(jobs, start=1):
+                    pending.append((i, job, asyncio.ensure_future(self._prepare(job))))
+                    # Window full, or the last job queued — write reports as they finish
+                    while len(pending) >= self.in_flight or (pending and i == len(jobs)):
+                        index, oldest, task = pending[0]
+                        await asyncio.wait([task])
+                        pending.popleft()
+                        self._write(archive, manifest, width, index, oldest, task)
+                        yield sink.take()
+                archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+            yield sink.take()
+        finally:
+            # Client went away mid-stream — stop what hasn't started
+            for _, _, task in pending:
+                task.cancel()
+
+    async def _prepare(self, job: ExportJob) -> tuple:
+        """(PDF bytes, ETag key) for one job."""
+        results = job.results
+        if results is None:
+            project = job.project
+            results = await whatif_runner.run(partial(
+                cached_simulation,
+                project_id=project["id"],
+                unit_count=project["unit_count"],
+                build_year=project["build_year"],
+                seed=project["simulation_seed"],
+                parcel_acres=project["parcel_acres"],
+                source="report",
+                **job.levers,
+            ))
+
+        key = report_key(SimpleNamespace(**job.project), results, job.levers)
+        pdf_bytes = report_cache.get(key)
+        if pdf_bytes is None:
+            loop = asyncio.get_running_loop()
+            pdf_bytes = await loop.run_in_executor(self._pool, _render, job.project, results, job.levers)
+        return pdf_bytes, key
+
+    def _write(self, archive, manifest: list, width: int, index: int, job: ExportJob, task: asyncio.Future):
+        name = f"{index:0{width}d}-{report_filename(job.project['project_name'])}"
+        entry = {"file": name, "project_id": job.project["id"], "levers": job.levers}
+        try:
+            # report_filename() already slugs the name; never let a path into the archive
+            if "/" in name or "\\" in name or ".." in name:
+                raise ValueError(f"Unsafe ZIP entry name {name!r}")
+            pdf_bytes, key = task.result()
+        except Exception as e:
+            logger.exception("Bulk export: report for project %s failed", job.project["id"])
+            entry.update(file=None, error=str(e) or type(e).__name__)
+        else:
+            archive.writestr(name, pdf_bytes)
+            entry["etag"] = f'"{key}"'
+        manifest.append(entry)
+
+
+# One exporter per API process
+report_exporter = ReportExporter()
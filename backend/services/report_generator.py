@@ -6,38 +6,34 @@ Works for both PASS and FAIL verdicts.
 
 Layout:
   1. Header bar — project name + report title
-  2. Project details — units, build year, levers applied
+  2. Project details — parcel, units, build year, levers applied
   3. Verdict banner — large PASS (green) or FAIL (red)
   4. Simulation summary — p_failure, first failure year, median deficit
   5. Fixed scenario results — table of 4 climate scenarios
   6. Failure probability by decade — table from failure_curve
   7. Data sources footer
+
+The page setup, header bar, logo and title are identical on every report, so they
+are drawn once per process into a template document (report_template(), built at
+startup by main.py) and every report starts from a copy of it. The logo is read
+and embedded into the template once instead of once per download.
 """
 
-from fpdf import FPDF
-from datetime import date
+import copy
+import re
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
-LOGO_PATH = Path(__file__).parent.parent / "image.png"
+from fpdf import FPDF
 
+from services.water_demand import irrigated_acres
 
-# ---------------------------------------------------------------------------
-# Parcel centroid helper
-# ---------------------------------------------------------------------------
+LOGO_PATH = Path(__file__).parent.parent / "image.png"
 
-def _calc_centroid(parcel_geojson: dict):
-    """Return (lat, lng) centroid of a GeoJSON Polygon or Feature, or (None, None)."""
-    try:
-        geojson = parcel_geojson or {}
-        if geojson.get("type") == "Feature":
-            coords = geojson["geometry"]["coordinates"][0]
-        else:
-            coords = geojson["coordinates"][0]
-        lngs = [c[0] for c in coords]
-        lats = [c[1] for c in coords]
-        return sum(lats) / len(lats), sum(lngs) / len(lngs)
-    except (KeyError, IndexError, TypeError, ZeroDivisionError):
-        return None, None
+# Bump when the layout changes — it is part of the report cache key, so cached
+# PDFs in the old layout stop being served (services/report_cache.py).
+REPORT_LAYOUT_VERSION = "2026.10"
 
 
 # ---------------------------------------------------------------------------
@@ -59,6 +55,25 @@ LIGHT_ROW   = (240, 243, 248)  # alternating table row (tint of NAVY)
 DARK_TEXT   = NAVY             # primary body text
 
 
+# ---------------------------------------------------------------------------
+# Static text
+# ---------------------------------------------------------------------------
+
+SCENARIO_LABELS = {
+    "baseline":         "Baseline  (historical average)",
+    "moderate_drought": "Moderate Drought  (CMIP6 SSP2-4.5, -21% supply)",
+    "severe_drought":   "Severe Drought  (CMIP6 SSP5-8.5, -43% supply)",
+    "reduced_snowpack": "Reduced Snowpack  (-29% snowpack, early melt)",
+}
+
+DATA_SOURCES = [
+    "USGS National Water Information System - Logan River gauge 10109000",
+    "Utah Division of Water Resources - Bear River Basin Study 2021",
+    "Cache County General Plan 2023 - Water Resources Element",
+    "CMIP6 Projections via Utah Climate Center, Utah State University",
+]
+
+
 # ---------------------------------------------------------------------------
 # Helper — set fill + text colour together
 # ---------------------------------------------------------------------------
@@ -119,26 +134,63 @@ def _scenario_row(pdf: FPDF, label: str, result: str, shade: bool = False):
     pdf.cell(55, 8, result, border="RTB", fill=True, ln=True)
 
 
+# ---------------------------------------------------------------------------
+# Template — the parts of page one that never change
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def report_template() -> FPDF:
+    """
+    Page one with the header bar, logo and title already drawn. Built once per
+    process; generate_report() works on a deep copy, never on this object.
+    """
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=20)
+    pdf.set_margins(left=15, top=15, right=15)
+
+    pdf.set_fill_color(*NAVY)
+    pdf.rect(0, 0, 210, 28, "F")
+
+    # Logo — top left of the header bar
+    if LOGO_PATH.exists():
+        pdf.image(str(LOGO_PATH), x=15, y=4, h=20)
+
+    pdf.set_xy(15, 7)
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.set_text_color(*WHITE)
+    pdf.cell(0, 8, "Water Viability Report", align="R", ln=True)
+    return pdf
+
+
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
 
+def report_filename(project_name: str) -> str:
+    """
+    PDF file name for a project. The name is user-supplied, so it is reduced to
+    [a-z0-9._-] — no "/" or ".." reaches a ZIP entry or a Content-Disposition header.
+    """
+    slug = re.sub(r"[^a-z0-9._-]+", "-", project_name.lower()).strip(".-")
+    slug = re.sub(r"\.{2,}", ".", slug)
+    return f"thallo-report-{slug or 'project'}.pdf"
+
+
 def generate_report(project, simulation_results: dict, levers: dict = None) -> bytes:
     """
     Build a PDF report and return the raw bytes.
 
     Args:
         project:            the SQLAlchemy Project object
-        simulation_results: the dict stored in project.simulation_results
+        simulation_results: a SimulationResult dict (see services/result_storage.py)
 
     Returns:
         bytes: the PDF file content, ready to stream to the client
     """
 
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=20)
-    pdf.set_margins(left=15, top=15, right=15)
+    pdf = copy.deepcopy(report_template())
+    pdf.set_creation_date(datetime.now(timezone.utc))
 
     verdict       = simulation_results.get("verdict", "UNKNOWN")
     p_fail        = simulation_results.get("p_failure_by_end_year", 0.0)
@@ -147,23 +199,14 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     deficit       = simulation_results.get("median_deficit_acre_feet")
     scenarios     = simulation_results.get("scenario_results", {})
     failure_curve = simulation_results.get("failure_curve", [])
+    n_runs        = simulation_results.get("n_simulations_run") or 1000
+    ci_low        = simulation_results.get("p_failure_ci_low")
+    ci_high       = simulation_results.get("p_failure_ci_high")
 
     # -----------------------------------------------------------------------
-    # 1. Header bar
+    # 1. Header bar — the bar, logo and title come from the template
     # -----------------------------------------------------------------------
 
-    pdf.set_fill_color(*NAVY)
-    pdf.rect(0, 0, 210, 28, "F")
-
-    # Logo — top left of the header bar
-    if LOGO_PATH.exists():
-        pdf.image(str(LOGO_PATH), x=15, y=4, h=20)
-
-    pdf.set_xy(15, 7)
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.set_text_color(*WHITE)
-    pdf.cell(0, 8, "Water Viability Report", align="R", ln=True)
-
     pdf.set_xy(15, 17)
     pdf.set_font("Helvetica", "", 9)
     pdf.set_text_color(*MUTED)
@@ -177,7 +220,7 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
 
     _section_heading(pdf, "Project Details")
 
-    lat, lng = _calc_centroid(project.parcel_geojson)
+    lat, lng = project.parcel_centroid_lat, project.parcel_centroid_lng
     centroid_str = f"{lat:.5f} N, {lng:.5f} W" if lat is not None else "N/A"
 
     # Apply lever adjustments to displayed values if provided
@@ -191,12 +234,20 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     displayed_grey       = grey_lever or project.greywater_recycling
     displayed_pipe       = pipe_lever or project.pipeline_added
 
+    # Irrigated area follows the home count, so re-estimate it when units are cut
+    displayed_irrigated = (
+        float(irrigated_acres(displayed_units, project.parcel_acres))
+        if unit_reduction_pct else project.irrigated_acres
+    )
+    area_str = f"{project.parcel_acres:,.2f} acres ({displayed_irrigated:,.2f} irrigated)"
+
     _kv_row(pdf, "Project Name",        project.project_name,               shade=False)
     _kv_row(pdf, "Parcel Center",       centroid_str,                       shade=True)
-    _kv_row(pdf, "Homes Proposed",      f"{displayed_units:,} units",       shade=False)
-    _kv_row(pdf, "Planned Build Year",  str(displayed_build_year),          shade=True)
-    _kv_row(pdf, "Greywater Recycling", "Yes" if displayed_grey else "No",  shade=False)
-    _kv_row(pdf, "Pipeline Added",      "Yes" if displayed_pipe else "No",  shade=True)
+    _kv_row(pdf, "Parcel Area",         area_str,                           shade=False)
+    _kv_row(pdf, "Homes Proposed",      f"{displayed_units:,} units",       shade=True)
+    _kv_row(pdf, "Planned Build Year",  str(displayed_build_year),          shade=False)
+    _kv_row(pdf, "Greywater Recycling", "Yes" if displayed_grey else "No",  shade=True)
+    _kv_row(pdf, "Pipeline Added",      "Yes" if displayed_pipe else "No",  shade=False)
 
     # -----------------------------------------------------------------------
     # 3. Verdict banner
@@ -236,14 +287,16 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     _section_heading(pdf, "Simulation Summary")
 
     p_fail_pct   = f"{p_fail * 100:.1f}%"
-    failed_count = round(p_fail * 1000)
+    failed_count = round(p_fail * n_runs)
 
     _kv_row(pdf, f"Chance of Water Shortage by {end_year}",
-            f"{p_fail_pct}  ({failed_count} of 1,000 simulated futures ran short)",
+            f"{p_fail_pct}  ({failed_count:,} of {n_runs:,} simulated futures ran short)",
             shade=False)
     _kv_row(pdf, "Pass Threshold", "15% or fewer futures must run short", shade=True)
-    _kv_row(pdf, "Monte Carlo Runs",
-            "1,000 independent simulations", shade=False)
+    runs_text = f"{n_runs:,} independent simulations"
+    if ci_low is not None and ci_high is not None:
+        runs_text += f"  (99% range {ci_low * 100:.1f}% - {ci_high * 100:.1f}%)"
+    _kv_row(pdf, "Monte Carlo Runs", runs_text, shade=False)
     _kv_row(pdf, "Simulation Horizon",
             f"{project.build_year} - {end_year}  (50 years)", shade=True)
     _kv_row(pdf, "Median First Failure Year",
@@ -264,14 +317,7 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     pdf.cell(120, 8, "Scenario", border=1, fill=True)
     pdf.cell(55,  8, "Result",   border=1, fill=True, ln=True)
 
-    scenario_labels = {
-        "baseline":         "Baseline  (historical average)",
-        "moderate_drought": "Moderate Drought  (CMIP6 SSP2-4.5, -21% supply)",
-        "severe_drought":   "Severe Drought  (CMIP6 SSP5-8.5, -43% supply)",
-        "reduced_snowpack": "Reduced Snowpack  (-29% snowpack, early melt)",
-    }
-
-    for i, (key, label) in enumerate(scenario_labels.items()):
+    for i, (key, label) in enumerate(SCENARIO_LABELS.items()):
         result = scenarios.get(key, "N/A")
         _scenario_row(pdf, label, result, shade=(i % 2 == 1))
 
@@ -284,7 +330,7 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     pdf.set_font("Helvetica", "", 9)
     pdf.set_text_color(*MUTED)
     pdf.cell(0, 5,
-        "Fraction of 1,000 simulations that experienced a water deficit by each year.",
+        f"Fraction of {n_runs:,} simulations that experienced a water deficit by each year.",
         ln=True)
     pdf.ln(2)
 
@@ -326,14 +372,8 @@ def generate_report(project, simulation_results: dict, levers: dict = None) -> b
     pdf.cell(0, 5, "Data Sources", ln=True)
 
     pdf.set_font("Helvetica", "", 8)
-    sources = [
-        "USGS National Water Information System - Logan River gauge 10109000",
-        "Utah Division of Water Resources - Bear River Basin Study 2021",
-        "Cache County General Plan 2023 - Water Resources Element",
-        "CMIP6 Projections via Utah Climate Center, Utah State University",
-    ]
     pdf.set_text_color(*MUTED)
-    for source in sources:
+    for source in DATA_SOURCES:
         pdf.cell(0, 4, f"  - {source}", ln=True)
 
     return bytes(pdf.output())
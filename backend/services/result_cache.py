@@ -0,0 +1,265 @@
+"""
+DataDungeon — Simulation Result Cache
+
+Memoizes run_simulation() results so /whatif, /report and the AI agent don't
+recompute a lever combination that was already evaluated a moment ago.
+A miss falls through to the simulation_runs table (services/run_store.py)
+before anything is computed.
+
+Key:
+  project id + project inputs (units, build year, parcel, seed) + normalized levers.
+  Because the project seed fixes the random draws, the same key always produces
+  the same result — caching never changes what the user sees.
+
+Backends (pick with RESULT_CACHE_URL in backend/.env):
+  - unset          → in-process LRU (default)
+  - redis://...    → any Redis-compatible server, shared between workers.
+                     Needs the optional `redis` package.
+
+Invalidation:
+  Entries are namespaced by project id. Editing a project's inputs drops its
+  namespace (see the SQLAlchemy listener at the bottom), and because the inputs
+  are part of the key, a stale entry can never be returned anyway.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+
+from models.project import Project
+from services.run_store import run_store
+from services.simulation_engine import ENGINE_VERSION, N_SIMULATIONS, SAMPLING_METHOD, calc_parcel_area_acres
+
+
+# ---------------------------------------------------------------------------
+# Configuration — override through backend/.env
+# ---------------------------------------------------------------------------
+
+RESULT_CACHE_URL = os.getenv("RESULT_CACHE_URL", "")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2048"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+
+# Project columns that change simulation output. Editing any of them invalidates the project.
+PROJECT_INPUT_FIELDS = ("unit_count", "build_year", "parcel_geojson", "parcel_acres", "simulation_seed")
+
+
+# ---------------------------------------------------------------------------
+# Backends — both store JSON strings under string keys
+# ---------------------------------------------------------------------------
+
+class MemoryBackend:
+    """
+    Bounded in-process LRU. One copy per worker process. Entries older than
+    ttl_seconds are dropped on access, the same expiry the Redis backend uses.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, ttl_seconds: int = RESULT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Redis-compatible backend. Works with any client exposing the redis-py
+    get / set(ex=) / scan_iter / delete methods, so a local stand-in server
+    or an in-memory fake can be dropped in for load tests.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl_seconds: int = RESULT_CACHE_TTL_SECONDS):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis  # optional dependency — only needed when RESULT_CACHE_URL is set
+
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def get(self, key: str):
+        return self.client.get(key)
+
+    def set(self, key: str, value: str):
+        self.client.set(key, value, ex=self.ttl_seconds)
+
+    def delete_prefix(self, prefix: str):
+        keys = list(self.client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self):
+        return None  # not tracked — the server owns eviction
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def normalize_levers(
+    unit_reduction_pct: float = 0.0,
+    greywater_recycling: bool = False,
+    pipeline_added: bool = False,
+    build_delay_years: int = 0,
+) -> dict:
+    """Canonical lever dict — 0.2 and 0.20000001 from a slider map to the same entry."""
+    return {
+        "unit_reduction_pct": round(float(unit_reduction_pct or 0.0), 4),
+        "greywater_recycling": bool(greywater_recycling),
+        "pipeline_added": bool(pipeline_added),
+        "build_delay_years": int(build_delay_years or 0),
+    }
+
+
+class ResultCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _prefix(project_id: int) -> str:
+        return f"simresult:{project_id}:"
+
+    def make_key(self, project_id: int, inputs: dict, levers: dict) -> str:
+        payload = json.dumps({"inputs": inputs, "levers": levers}, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+        return self._prefix(project_id) + digest
+
+    def get_or_compute(self, key: str, compute) -> dict:
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return json.loads(cached)
+
+        with self._lock:
+            self.misses += 1
+        result = compute()
+        self.backend.set(key, json.dumps(result))
+        return result
+
+    def invalidate_project(self, project_id: int):
+        self.backend.delete_prefix(self._prefix(project_id))
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": self.backend.name,
+            "entries": self.backend.size(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+
+
+def _make_backend():
+    if RESULT_CACHE_URL:
+        return RedisBackend.from_url(RESULT_CACHE_URL)
+    return MemoryBackend()
+
+
+result_cache = ResultCache(_make_backend())
+
+
+# ---------------------------------------------------------------------------
+# Main entry point
+# ---------------------------------------------------------------------------
+
+def cached_simulation(
+    project_id: int,
+    unit_count: int,
+    build_year: int,
+    seed: int,
+    parcel_geojson: dict = None,
+    n_simulations: int = N_SIMULATIONS,
+    source: str = "whatif",
+    parcel_acres: float = None,
+    **levers,
+) -> dict:
+    """
+    run_simulation() behind the result cache and the simulation_runs table.
+    Accepts the same lever keyword arguments as run_simulation (unit_reduction_pct,
+    greywater_recycling, pipeline_added, build_delay_years). source is recorded
+    on the stored run if this call is the one that computes it.
+
+    The parcel only matters through its area — pass parcel_acres when it's already
+    known (e.g. from the project cache) to skip the geometry.
+    """
+    if parcel_acres is None:
+        parcel_acres = calc_parcel_area_acres(parcel_geojson) if parcel_geojson else 0.0
+    levers = normalize_levers(**levers)
+    inputs = {
+        "unit_count": unit_count,
+        "build_year": build_year,
+        "seed": seed,
+        "parcel_acres": round(float(parcel_acres), 6),
+        "n_simulations": n_simulations,
+        "sampling": SAMPLING_METHOD,
+        "engine_version": ENGINE_VERSION,
+    }
+    key = result_cache.make_key(project_id, inputs, levers)
+
+    return result_cache.get_or_compute(
+        key,
+        lambda: run_store.get_or_run(
+            project_id=project_id,
+            unit_count=unit_count,
+            build_year=build_year,
+            seed=seed,
+            levers=levers,
+            parcel_acres=parcel_acres,
+            n_simulations=n_simulations,
+            source=source,
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Invalidation — any flush that changes a project's inputs drops its entries
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Project, "after_update")
+def _invalidate_on_edit(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in PROJECT_INPUT_FIELDS):
+        result_cache.invalidate_project(target.id)
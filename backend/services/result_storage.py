@@ -0,0 +1,123 @@
+"""
+DataDungeon — Simulation Result Storage
+
+Packs a SimulationResult into the Project's compact result columns and unpacks
+only the fields a caller asks for.
+
+Layout (see models/project.py):
+  - result_summary           — JSON of every scalar / small field
+  - failure_curve_start_year — the curve's first year; years are start + index
+  - failure_curve            — little-endian float32 P(failure by year)
+  - run_first_failure        — little-endian int16 per run, -1 = never failed
+  - run_deficits             — little-endian float32 per run, NaN = never failed
+
+A stored 1,000-run result is ~0.6 KB of JSON and 200 bytes of curve, plus 6 KB
+of per-run data that is only read when asked for — versus ~3 KB of JSON parsed
+and re-serialized on every poll before.
+"""
+
+import numpy as np
+from sqlalchemy.orm import undefer_group
+
+# Fields kept in result_summary — everything except the arrays
+SUMMARY_FIELDS = (
+    "verdict",
+    "p_failure_by_end_year",
+    "simulation_end_year",
+    "first_failure_year",
+    "median_deficit_acre_feet",
+    "scenario_results",
+    "scenario_details",
+    "n_simulations_run",
+    "p_failure_ci_low",
+    "p_failure_ci_high",
+)
+
+# Per-run distributions — opt-in through ?fields=, never part of the default read
+RUN_FIELDS = ("run_first_failure_years", "run_deficits_acre_feet")
+
+# What a read returns when no fields are requested: the full SimulationResult
+DEFAULT_FIELDS = SUMMARY_FIELDS + ("failure_curve",)
+
+ALL_FIELDS = DEFAULT_FIELDS + RUN_FIELDS
+
+
+def parse_fields(fields: str = None) -> tuple:
+    """Turn a comma-separated ?fields= value into a tuple. Raises ValueError on unknown names."""
+    if not fields:
+        return DEFAULT_FIELDS
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in ALL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown result fields: {', '.join(unknown)}. Valid fields: {', '.join(ALL_FIELDS)}")
+    return requested
+
+
+def loader_options(fields=DEFAULT_FIELDS) -> list:
+    """
+    Query options that fetch the deferred column groups these fields need in the
+    same SELECT. Required with async sessions, where deferred columns can't lazy-load.
+    """
+    options = []
+    if "failure_curve" in fields:
+        options.append(undefer_group("failure_curve"))
+    if any(field in RUN_FIELDS for field in fields):
+        options.append(undefer_group("runs"))
+    return options
+
+
+def store_results(project, results: dict, first_failure_idx=None, deficits=None):
+    """
+    Write a SimulationResult (and optionally the per-run outcomes behind it) to the
+    project's result columns. Does not commit.
+    """
+    curve = results["failure_curve"]
+    project.result_summary = {key: results.get(key) for key in SUMMARY_FIELDS}
+    project.failure_curve_start_year = curve[0]["year"] if curve else None
+    project.failure_curve = np.array([pt["p_failure"] for pt in curve], dtype="<f4").tobytes()
+
+    if first_failure_idx is not None:
+        project.run_first_failure = np.asarray(first_failure_idx).astype("<i2").tobytes()
+        project.run_deficits = np.asarray(deficits).astype("<f4").tobytes()
+    else:
+        project.run_first_failure = None
+        project.run_deficits = None
+
+
+def has_results(project) -> bool:
+    return project.result_summary is not None
+
+
+def load_results(project, fields=DEFAULT_FIELDS):
+    """
+    Rebuild the requested SimulationResult fields from the project's columns, or
+    None if the project has no results. Deferred columns are only touched (and
+    fetched from the database) when one of their fields is requested.
+    """
+    summary = project.result_summary
+    if summary is None:
+        return None
+
+    result = {key: summary.get(key) for key in fields if key in SUMMARY_FIELDS}
+    start_year = project.failure_curve_start_year
+
+    if "failure_curve" in fields:
+        curve = np.frombuffer(project.failure_curve or b"", dtype="<f4")
+        result["failure_curve"] = [
+            {"year": start_year + i, "p_failure": round(float(p), 4)}
+            for i, p in enumerate(curve)
+        ]
+
+    if "run_first_failure_years" in fields:
+        offsets = np.frombuffer(project.run_first_failure or b"", dtype="<i2")
+        result["run_first_failure_years"] = [
+            start_year + int(i) if i >= 0 else None for i in offsets
+        ]
+
+    if "run_deficits_acre_feet" in fields:
+        deficits = np.frombuffer(project.run_deficits or b"", dtype="<f4")
+        result["run_deficits_acre_feet"] = [
+            None if np.isnan(d) else round(float(d), 1) for d in deficits
+        ]
+
+    return result
@@ -0,0 +1,132 @@
+"""
+DataDungeon — Simulation Run Store
+
+The simulation_runs table as a second-level cache behind services/result_cache.py.
+
+  result_cache (memory / Redis)  →  simulation_runs (Postgres)  →  compute
+
+The in-memory cache is fast but lost on restart and per-process; this table
+survives restarts, is shared by every worker, and keeps the full history of
+lever combinations a project has been run with — with their per-run outcomes.
+
+A row matches only if everything that determines the result matches: project,
+levers, project inputs, engine version, sampling method, seed and run count.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from sqlalchemy.exc import IntegrityError
+
+from db.connection import SessionLocal
+from models.simulation_run import SimulationRun
+from services.result_storage import load_results, store_results
+from services.simulation_engine import (
+    ENGINE_VERSION,
+    N_SIMULATIONS,
+    SAMPLING_METHOD,
+    assemble_result,
+    simulate_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def run_key(
+    project_id: int,
+    unit_count: int,
+    build_year: int,
+    seed: int,
+    levers: dict,
+    parcel_acres: float = 0.0,
+    n_simulations: int = N_SIMULATIONS,
+) -> dict:
+    """The simulation_runs columns a stored run must match. levers must already be normalized."""
+    return {
+        "project_id": project_id,
+        "lever_hash": _digest(levers),
+        "input_hash": _digest({
+            "unit_count": unit_count,
+            "build_year": build_year,
+            "parcel_acres": round(float(parcel_acres), 6),
+        }),
+        "engine_version": ENGINE_VERSION,
+        "sampling": SAMPLING_METHOD,
+        "seed": seed,
+        "n_simulations": n_simulations,
+    }
+
+
+class RunStore:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def find(self, key: dict):
+        """Return the stored SimulationResult for key, or None."""
+        db = SessionLocal()
+        try:
+            # (project_id, lever_hash) narrows to a handful of rows via the index
+            run = db.query(SimulationRun).filter_by(**key).first()
+            result = load_results(run) if run else None
+        finally:
+            db.close()
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def save(self, key: dict, levers: dict, result: dict, first_failure_idx, deficits, source: str):
+        """Record a computed run. A concurrent identical insert is not an error — first one wins."""
+        db = SessionLocal()
+        try:
+            run = SimulationRun(**key, levers=levers, source=source)
+            store_results(run, result, first_failure_idx, deficits)
+            db.add(run)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        finally:
+            db.close()
+
+    def get_or_run(
+        self,
+        project_id: int,
+        unit_count: int,
+        build_year: int,
+        seed: int,
+        levers: dict,
+        parcel_acres: float = 0.0,
+        n_simulations: int = N_SIMULATIONS,
+        source: str = "whatif",
+    ) -> dict:
+        """Look the run up in simulation_runs; compute and record it if it isn't there."""
+        key = run_key(project_id, unit_count, build_year, seed, levers, parcel_acres, n_simulations)
+        found = self.find(key)
+        if found is not None:
+            return found
+
+        inputs = {"unit_count": unit_count, "build_year": build_year, "parcel_acres": parcel_acres, **levers}
+        first_failure_idx, deficits = simulate_batch(
+            start=0, stop=n_simulations, n_simulations=n_simulations, seed=seed, **inputs
+        )
+        result = assemble_result(first_failure_idx, deficits, **inputs)
+        self.save(key, levers, result, first_failure_idx, deficits, source)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+run_store = RunStore()
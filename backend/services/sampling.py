@@ -0,0 +1,113 @@
+"""
+DataDungeon — Monte Carlo Sampling Strategies
+
+Every Monte Carlo run needs one demand growth draw and one supply shock per year,
+and all of them are normal underneath (the supply shock is exp(sigma * z)).
+This module produces those standard normals as an (n_runs × n_dims) matrix
+using one of four strategies:
+
+  - "random"          — plain independent draws. The original behaviour.
+  - "antithetic"      — every draw z is paired with -z. A wet future is matched by
+                        an equally dry one, so the pair's average sits closer to
+                        the truth than two independent runs.
+  - "latin_hypercube" — each dimension is split into n_runs equal-probability strata
+                        and every stratum is hit exactly once, so no part of the
+                        growth or supply range is over- or under-sampled by luck.
+  - "sobol"           — a scrambled Sobol low-discrepancy sequence pushed through
+                        the normal inverse CDF. Fills the space most evenly;
+                        needs the optional `scipy` package.
+
+All strategies are randomized and driven by the caller's Generator, so the same
+seed always reproduces the same runs and independent seeds give unbiased,
+independent estimates. Compare them with benchmarks/sampling_benchmark.py.
+"""
+
+import math
+
+import numpy as np
+
+SAMPLING_METHODS = ("random", "antithetic", "latin_hypercube", "sobol")
+
+# Keep uniforms strictly inside (0, 1) before the inverse CDF
+_UNIFORM_EPS = 1e-12
+
+
+def standard_normals(rng: np.random.Generator, n_runs: int, n_dims: int, method: str = "random") -> np.ndarray:
+    """Return an (n_runs, n_dims) matrix of N(0, 1) draws using the given strategy."""
+    if method == "random":
+        return rng.standard_normal((n_runs, n_dims))
+    if method == "antithetic":
+        half = rng.standard_normal((-(-n_runs // 2), n_dims))
+        # Interleave z, -z so any prefix of the runs is still (almost) balanced
+        return np.stack([half, -half], axis=1).reshape(-1, n_dims)[:n_runs]
+    if method == "latin_hypercube":
+        return normal_ppf(_latin_hypercube(rng, n_runs, n_dims))
+    if method == "sobol":
+        return normal_ppf(_scrambled_sobol(rng, n_runs, n_dims))
+    raise ValueError(f"Unknown sampling method {method!r} — expected one of {SAMPLING_METHODS}")
+
+
+# ---------------------------------------------------------------------------
+# Uniform designs on [0, 1)^n_dims
+# ---------------------------------------------------------------------------
+
+def _latin_hypercube(rng: np.random.Generator, n_runs: int, n_dims: int) -> np.ndarray:
+    # One independent permutation of the strata per dimension, jittered within each stratum
+    strata = rng.permuted(np.tile(np.arange(n_runs), (n_dims, 1)), axis=1).T
+    return (strata + rng.random((n_runs, n_dims))) / n_runs
+
+
+def _scrambled_sobol(rng: np.random.Generator, n_runs: int, n_dims: int) -> np.ndarray:
+    try:
+        from scipy.stats import qmc  # optional dependency — only needed for "sobol"
+    except ImportError as e:
+        raise ImportError("The 'sobol' sampling method requires scipy (`pip install scipy`)") from e
+
+    # Sobol points are balanced in powers of two. Seeded engine runs ask for whole
+    # blocks of 256 (simulation_engine.block_size); any other size draws the next
+    # power of two up and truncates, which loses some of that balance.
+    m = max(0, math.ceil(math.log2(n_runs)))
+    return qmc.Sobol(d=n_dims, scramble=True, seed=rng).random_base2(m)[:n_runs]
+
+
+# ---------------------------------------------------------------------------
+# Normal inverse CDF
+# ---------------------------------------------------------------------------
+
+# Acklam's rational approximation — relative error below 1.2e-9 across (0, 1),
+# far finer than the Monte Carlo noise, and numpy-only.
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+_P_LOW = 0.02425
+
+
+def _tail(q: np.ndarray) -> np.ndarray:
+    num = ((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]
+    den = (((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1
+    return num / den
+
+
+def normal_ppf(u: np.ndarray) -> np.ndarray:
+    """Standard normal inverse CDF, elementwise."""
+    u = np.clip(u, _UNIFORM_EPS, 1 - _UNIFORM_EPS)
+    z = np.empty_like(u)
+
+    low = u < _P_LOW
+    high = u > 1 - _P_LOW
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    num = ((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]
+    den = ((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1
+    z[mid] = num * q / den
+
+    z[low] = _tail(np.sqrt(-2 * np.log(u[low])))
+    z[high] = -_tail(np.sqrt(-2 * np.log(1 - u[high])))
+    return z
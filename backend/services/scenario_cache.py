@@ -0,0 +1,161 @@
+"""
+DataDungeon — Scenario Path Cache
+
+Keeps the sampled Monte Carlo paths for each project in memory so what-if lever
+changes don't resample 50,000 supply shocks and 1,000 growth rates on every
+slider move.
+
+Why this works:
+  The levers (unit reduction, greywater, pipeline, build delay) never change the
+  random draws — they only change the demand scale, the irrigation offset, the
+  pipeline addition and which trend factors line up with the window. With a fixed
+  project seed (common random numbers) the paths are identical on every call, so
+  evaluating a new lever combination is just a re-threshold of cached arrays.
+
+Eviction:
+  - LRU — least recently used entry goes first
+  - TTL — entries older than SCENARIO_CACHE_TTL_SECONDS are dropped on access
+  - Memory cap — total array bytes stay under SCENARIO_CACHE_MAX_MB
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# Configuration — override through backend/.env
+# ---------------------------------------------------------------------------
+
+SCENARIO_CACHE_MAX_ENTRIES = int(os.getenv("SCENARIO_CACHE_MAX_ENTRIES", "256"))
+SCENARIO_CACHE_TTL_SECONDS = float(os.getenv("SCENARIO_CACHE_TTL_SECONDS", "1800"))
+SCENARIO_CACHE_MAX_MB = float(os.getenv("SCENARIO_CACHE_MAX_MB", "256"))
+
+
+# ---------------------------------------------------------------------------
+# Cached paths for one (seed, n_simulations) pair
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ScenarioPaths:
+    growth_rates: np.ndarray    # (n_runs,) sampled annual demand growth rates
+    growth_factors: np.ndarray  # (n_runs, horizon) — (1 + growth_rate) ** years_since_build
+    supply_shocks: np.ndarray   # (n_runs, horizon) lognormal supply multipliers
+
+    @property
+    def n_runs(self) -> int:
+        return len(self.growth_rates)
+
+    @property
+    def nbytes(self) -> int:
+        return self.growth_rates.nbytes + self.growth_factors.nbytes + self.supply_shocks.nbytes
+
+    def rows(self, start: int, stop: int) -> "ScenarioPaths":
+        """A view of runs [start, stop) — no copy."""
+        return ScenarioPaths(
+            growth_rates=self.growth_rates[start:stop],
+            growth_factors=self.growth_factors[start:stop],
+            supply_shocks=self.supply_shocks[start:stop],
+        )
+
+    @classmethod
+    def concat(cls, parts: list) -> "ScenarioPaths":
+        """Stack several path sets run-wise."""
+        return cls(
+            growth_rates=np.concatenate([p.growth_rates for p in parts]),
+            growth_factors=np.concatenate([p.growth_factors for p in parts]),
+            supply_shocks=np.concatenate([p.supply_shocks for p in parts]),
+        )
+
+    def freeze(self) -> "ScenarioPaths":
+        """Mark the arrays read-only — cached paths are shared between requests."""
+        for arr in (self.growth_rates, self.growth_factors, self.supply_shocks):
+            arr.setflags(write=False)
+        return self
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class ScenarioCache:
+    """
+    Thread-safe LRU cache of ScenarioPaths with TTL and a total memory cap.
+
+    FastAPI runs sync routes on a threadpool, so lookups and inserts take a lock.
+    Sampling happens outside the lock — two requests racing on a cold key both
+    sample, which is harmless because the same seed produces the same paths.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = SCENARIO_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SCENARIO_CACHE_TTL_SECONDS,
+        max_bytes: int = int(SCENARIO_CACHE_MAX_MB * 1024 * 1024),
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key → (inserted_at, ScenarioPaths)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_sample(self, key, sample) -> ScenarioPaths:
+        """Return cached paths for key, calling sample() to build them on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                inserted_at, paths = entry
+                if time.monotonic() - inserted_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return paths
+                self._remove(key)
+            self.misses += 1
+
+        paths = sample().freeze()
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Paths bigger than the whole budget are returned but never stored
+            if paths.nbytes <= self.max_bytes:
+                self._entries[key] = (time.monotonic(), paths)
+                self._bytes += paths.nbytes
+                self._evict()
+        return paths
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key):
+        _, paths = self._entries.pop(key)
+        self._bytes -= paths.nbytes
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+
+# One cache per worker process
+scenario_cache = ScenarioCache()
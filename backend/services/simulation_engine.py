@@ -4,7 +4,8 @@ DataDungeon — Water Simulation Engine
 Runs a 50-year water viability simulation for a development project in Cache County, Utah.
 Supports two modes:
   - Mode 1: Four fixed climate scenarios (deterministic)
-  - Mode 2: Monte Carlo — 1,000 runs with sampled supply and demand variability
+  - Mode 2: Monte Carlo — 1,000 runs with sampled supply and demand variability,
+            or adaptively as many as it takes to settle the verdict (up to 10,000)
 
 All supply and demand figures are in acre-feet per year.
 
@@ -17,9 +18,18 @@ Supply model:
 
 import json
 import math
+import os
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
-from services.water_demand import get_demand_for_year, calculate_irrigation_demand
+from services.parcel_geometry import measure_parcel
+from services.sampling import SAMPLING_METHODS, standard_normals
+from services.scenario_cache import ScenarioPaths, scenario_cache
+from services.water_demand import (
+    DEFAULT_GROWTH_RATE,
+    demand_from_growth_table,
+    growth_table,
+)
 
 # ---------------------------------------------------------------------------
 # County data — loaded once at module startup, not on every request
@@ -39,12 +49,41 @@ TREND_BASELINE_YEAR = 2026 # supply trend accumulates from this year regardless
 
 N_SIMULATIONS = 1000
 
+# Bump whenever a change to the model or the sampling alters results for the same
+# inputs and seed — stored runs from an older version are then never served.
+ENGINE_VERSION = "2026.10.1"
+
+# Integer seeds are sampled in blocks of this many runs (see sample_scenario_paths).
+# Sobol points are only balanced in powers of two, so "sobol" gets its own size.
+PATH_BLOCK_SIZE = 200
+SOBOL_BLOCK_SIZE = 256
+
+# How the random draws are laid out — see services/sampling.py. One setting for the
+# whole app so /simulate, /whatif and the agent always share the same futures.
+SAMPLING_METHOD = os.getenv("SIMULATION_SAMPLING", "random")
+if SAMPLING_METHOD not in SAMPLING_METHODS:
+    raise ValueError(f"SIMULATION_SAMPLING must be one of {SAMPLING_METHODS}, got {SAMPLING_METHOD!r}")
+if SAMPLING_METHOD == "sobol":
+    # Fail at startup rather than on the first simulation request
+    try:
+        import scipy.stats.qmc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("SIMULATION_SAMPLING=sobol requires scipy (`pip install scipy`)") from e
+
+# Adaptive Monte Carlo — run in blocks until the verdict is statistically settled
+ADAPTIVE_MIN_RUNS = 200
+ADAPTIVE_MAX_RUNS = 10_000
+CONFIDENCE_Z = 2.576  # two-sided 99% Wilson interval on p_failure
+
 GREYWATER_DEMAND_REDUCTION = 0.28  # EPA WaterSense standard — removes 28% of municipal demand
 PIPELINE_SUPPLY_ADDITION = 500     # acre-feet per year — supplemental well or water rights purchase
 
 # If P(failure by end year) exceeds this threshold the project verdict is FAIL
 FAIL_THRESHOLD = 0.15
 
+# The four named climate scenarios reported in every SimulationResult
+SCENARIO_KEYS = ("baseline", "moderate_drought", "severe_drought", "reduced_snowpack")
+
 
 # ---------------------------------------------------------------------------
 # Parcel area helper
@@ -52,39 +91,13 @@ FAIL_THRESHOLD = 0.15
 
 def calc_parcel_area_acres(parcel_geojson: dict) -> float:
     """
-    Calculate the area of a GeoJSON polygon in acres using the Shoelace formula
-    with a latitude correction for Cache County, Utah (~41.75° N).
+    Area of a GeoJSON parcel (Feature, Polygon or MultiPolygon, holes subtracted)
+    in acres. Returns 0.0 if the geometry is missing or malformed.
 
-    Handles both GeoJSON Feature objects and bare Polygon geometry objects.
-    Returns 0.0 if the geometry is missing or malformed.
+    Projects store this as Project.parcel_acres when they're created — pass that
+    as parcel_acres instead of handing the polygon to the engine.
     """
-    try:
-        geojson = parcel_geojson or {}
-        if geojson.get("type") == "Feature":
-            coords = geojson["geometry"]["coordinates"][0]
-        else:
-            coords = geojson["coordinates"][0]
-
-        # Meters per degree at this latitude
-        avg_lat = sum(c[1] for c in coords) / len(coords)
-        lat_rad = math.radians(avg_lat)
-        m_per_deg_lat = 111_139.0
-        m_per_deg_lng = 111_139.0 * math.cos(lat_rad)
-
-        # Shoelace formula on metre-projected coordinates
-        n = len(coords)
-        area_m2 = 0.0
-        for i in range(n):
-            j = (i + 1) % n
-            xi = coords[i][0] * m_per_deg_lng
-            yi = coords[i][1] * m_per_deg_lat
-            xj = coords[j][0] * m_per_deg_lng
-            yj = coords[j][1] * m_per_deg_lat
-            area_m2 += xi * yj - xj * yi
-
-        return abs(area_m2) / 2.0 / 4_047.0  # m² → acres
-    except (KeyError, IndexError, TypeError, ZeroDivisionError):
-        return 0.0
+    return measure_parcel(parcel_geojson).area_acres
 
 
 # ---------------------------------------------------------------------------
@@ -100,6 +113,9 @@ def run_simulation(
     build_delay_years: int = 0,
     parcel_geojson: dict = None,
     n_simulations: int = N_SIMULATIONS,
+    seed=None,
+    sampling: str = None,
+    parcel_acres: float = None,
 ) -> dict:
     """
     Run the full water viability simulation for a development project.
@@ -112,146 +128,738 @@ def run_simulation(
         unit_reduction_pct:  fraction to reduce unit count (0.2 = 20% fewer homes)
         build_delay_years:   years to push back the build start date
         parcel_geojson:      GeoJSON polygon used to compute outdoor irrigation demand
+        parcel_acres:        the parcel's area, if already known — skips the geometry
         n_simulations:       number of Monte Carlo runs (default 1,000)
+        seed:                int seed or numpy.random.Generator for the Monte Carlo draws.
+                             The same seed always produces the same 1,000 futures, so
+                             two calls that differ only in levers are directly comparable.
+                             None draws fresh, unreproducible randomness.
+        sampling:            how the draws are laid out — "random", "antithetic",
+                             "latin_hypercube" or "sobol" (see services/sampling.py).
+                             Defaults to SAMPLING_METHOD from SIMULATION_SAMPLING.
 
     Returns:
         dict matching the SimulationResult schema in schemas/simulation.py
     """
 
-    # --- Step 1: Apply what-if levers to inputs ---
+    levers = {
+        "unit_count": unit_count,
+        "build_year": build_year,
+        "greywater_recycling": greywater_recycling,
+        "pipeline_added": pipeline_added,
+        "unit_reduction_pct": unit_reduction_pct,
+        "build_delay_years": build_delay_years,
+        "parcel_geojson": parcel_geojson,
+        "parcel_acres": parcel_acres,
+    }
+    first_failure_idx, deficits = simulate_batch(
+        start=0, stop=n_simulations, n_simulations=n_simulations, seed=seed, sampling=sampling, **levers
+    )
+    return assemble_result(first_failure_idx, deficits, **levers)
+
+
+def run_adaptive_simulation(
+    unit_count: int,
+    build_year: int,
+    greywater_recycling: bool = False,
+    pipeline_added: bool = False,
+    unit_reduction_pct: float = 0.0,
+    build_delay_years: int = 0,
+    parcel_geojson: dict = None,
+    seed=None,
+    max_simulations: int = ADAPTIVE_MAX_RUNS,
+    sampling: str = None,
+    parcel_acres: float = None,
+) -> dict:
+    """
+    Same as run_simulation, but sized by the data instead of a fixed 1,000 runs.
+
+    Runs are drawn in blocks of block_size(sampling). After each block the Wilson
+    interval on p_failure is checked against FAIL_THRESHOLD; once the whole
+    interval sits on one side of it the verdict can't flip, so sampling stops.
+    Clear PASS/FAIL projects settle in a few hundred runs; projects near the
+    threshold keep going up to max_simulations.
+
+    The result carries n_simulations_run and the interval bounds so callers can
+    see how much evidence the verdict rests on.
+    """
+    levers = {
+        "unit_count": unit_count,
+        "build_year": build_year,
+        "greywater_recycling": greywater_recycling,
+        "pipeline_added": pipeline_added,
+        "unit_reduction_pct": unit_reduction_pct,
+        "build_delay_years": build_delay_years,
+        "parcel_geojson": parcel_geojson,
+        "parcel_acres": parcel_acres,
+    }
+    seed = integer_seed(seed)
+
+    sampling = sampling or SAMPLING_METHOD
+    step = block_size(sampling)
+    idx_parts, deficit_parts = [], []
+    for start in range(0, max_simulations, step):
+        stop = min(start + step, max_simulations)
+        first_failure_idx, deficits = simulate_batch(
+            start=start, stop=stop, n_simulations=N_SIMULATIONS, seed=seed, sampling=sampling, **levers
+        )
+        idx_parts.append(first_failure_idx)
+        deficit_parts.append(deficits)
+        if verdict_settled(np.concatenate(idx_parts)):
+            break
+
+    return assemble_result(np.concatenate(idx_parts), np.concatenate(deficit_parts), **levers)
+
+
+def wilson_interval(failures: int, n_runs: int, z: float = CONFIDENCE_Z) -> tuple:
+    """
+    Wilson score interval for a binomial proportion. Unlike the normal
+    approximation it stays inside [0, 1] and behaves at 0 or n_runs failures,
+    which is exactly where clear PASS projects sit.
+    """
+    if n_runs == 0:
+        return 0.0, 1.0
+    p = failures / n_runs
+    z2 = z * z
+    center = (p + z2 / (2 * n_runs)) / (1 + z2 / n_runs)
+    half_width = z * math.sqrt(p * (1 - p) / n_runs + z2 / (4 * n_runs * n_runs)) / (1 + z2 / n_runs)
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def verdict_settled(first_failure_idx: np.ndarray, min_runs: int = ADAPTIVE_MIN_RUNS) -> bool:
+    """True once the interval on p_failure lies entirely on one side of FAIL_THRESHOLD."""
+    n_runs = len(first_failure_idx)
+    if n_runs < min_runs:
+        return False
+    low, high = wilson_interval(int(np.count_nonzero(first_failure_idx >= 0)), n_runs)
+    return high <= FAIL_THRESHOLD or low > FAIL_THRESHOLD
+
+
+# ---------------------------------------------------------------------------
+# Batched building blocks
+#
+# run_simulation() = simulate_batch() over every run + assemble_result().
+# The simulation executor calls them separately so it can report progress
+# after each batch: assemble_result() on the runs finished so far is a valid
+# (if noisier) estimate of the final result.
+# ---------------------------------------------------------------------------
+
+def _apply_levers(
+    unit_count: int,
+    build_year: int,
+    greywater_recycling: bool = False,
+    pipeline_added: bool = False,
+    unit_reduction_pct: float = 0.0,
+    build_delay_years: int = 0,
+    parcel_geojson: dict = None,
+    parcel_acres: float = None,
+) -> dict:
+    """Step 1: Apply what-if levers to inputs. Returns the kernel's keyword arguments."""
     effective_unit_count = int(unit_count * (1 - unit_reduction_pct))
     effective_build_year = build_year + build_delay_years
     demand_multiplier = (1.0 - GREYWATER_DEMAND_REDUCTION) if greywater_recycling else 1.0
 
-    # Outdoor irrigation demand — fixed each year, not affected by greywater
-    # (greywater offsets indoor toilet flushing, not outdoor sprinklers)
-    parcel_acres = calc_parcel_area_acres(parcel_geojson) if parcel_geojson else 0.0
-    irrigation_demand_af = calculate_irrigation_demand(effective_unit_count, parcel_acres)
+    # The parcel drives outdoor irrigation demand — fixed each year, not affected by
+    # greywater (greywater offsets indoor toilet flushing, not outdoor sprinklers)
+    if parcel_acres is None:
+        parcel_acres = calc_parcel_area_acres(parcel_geojson) if parcel_geojson else 0.0
 
-    # Build the simulation window: 50 years starting from the build year.
+    # The simulation window is 50 years starting from the build year.
     # The supply trend is indexed from TREND_BASELINE_YEAR (2026) so that a project
     # built in 2035 correctly inherits 9 years of accumulated supply decline.
-    simulation_start = effective_build_year
-    simulation_end = effective_build_year + SIMULATION_HORIZON - 1
-    simulation_years = list(range(simulation_start, simulation_end + 1))
+    return {
+        "unit_count": effective_unit_count,
+        "simulation_start": effective_build_year,
+        "demand_multiplier": demand_multiplier,
+        "parcel_acres": parcel_acres,
+        "pipeline_added": pipeline_added,
+    }
 
-    # Pull values from county data
-    # development_allocation is the water reserved for new growth — not total county supply
-    development_allocation = COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"]
-    annual_trend = COUNTY_DATA["supply"]["annual_trend_rate"]
-    mc_supply = COUNTY_DATA["supply"]["monte_carlo"]
-    mc_demand = COUNTY_DATA["demand"]["demand_growth"]["monte_carlo"]
-    scenarios = COUNTY_DATA["climate_scenarios"]
+
+def simulate_batch(
+    start: int,
+    stop: int,
+    n_simulations: int = N_SIMULATIONS,
+    seed=None,
+    sampling: str = None,
+    **levers,
+) -> tuple:
+    """
+    Step 3: Mode 2 — Monte Carlo, for runs [start, stop) of an n_simulations set.
+
+    Each run samples slightly different supply shocks and demand growth rates from
+    probability distributions. Instead of looping run-by-run and year-by-year,
+    every draw is made up front: one growth rate per run and one supply shock per
+    (run, year). Supply and demand then become (runs × SIMULATION_HORIZON) matrices
+    and the failure statistics fall out of array operations.
+
+    The paths depend only on the seed and run count — never on the levers — so an
+    integer seed is served from the per-project scenario cache after the first call,
+    and batches of the same seed always line up with a single full run.
+
+    Args:
+        start, stop:   run index range to evaluate
+        n_simulations: size of the full run set the batch is taken from
+        seed:          as in run_simulation
+        sampling:      as in run_simulation
+        **levers:      run_simulation's project and lever arguments
+
+    Returns:
+        (first_failure_idx, deficits) for the batch — see _monte_carlo_outcomes
+    """
+    paths = _path_rows(seed, n_simulations, start, stop, sampling)
+    return _monte_carlo_outcomes(paths=paths, **_apply_levers(**levers))
+
+
+def assemble_result(first_failure_idx: np.ndarray, deficits: np.ndarray, **levers) -> dict:
+    """
+    Combine Monte Carlo outcomes with the fixed-scenario results into a
+    SimulationResult dict. Accepts run_simulation's project and lever arguments.
+    """
+    inputs = _apply_levers(**levers)
+    simulation_start = inputs["simulation_start"]
+    simulation_end = simulation_start + SIMULATION_HORIZON - 1
 
     # --- Step 2: Mode 1 — Four fixed scenarios ---
     # Each scenario applies a fixed modifier to the development allocation.
     # Drought reduces how much new development water is available.
+    # All four are evaluated as one (scenario × year) matrix.
+
+    scenarios = COUNTY_DATA["climate_scenarios"]
+    modifiers = [scenarios[key]["supply_modifier"] for key in SCENARIO_KEYS]
+
+    fixed = evaluate_scenarios(supply_modifiers=modifiers, **inputs)
 
     scenario_results = {}
+    scenario_details = {}
+
+    for i, key in enumerate(SCENARIO_KEYS):
+        verdict = "FAIL" if fixed["failed"][i] else "PASS"
+        failure_year = fixed["first_failure_year"][i]
+        scenario_results[key] = verdict
+        scenario_details[key] = {
+            "verdict": verdict,
+            "first_failure_year": int(failure_year) if fixed["failed"][i] else None,
+            "min_margin_acre_feet": round(float(fixed["min_margin_acre_feet"][i]), 1),
+        }
+
+    # --- Step 4: Build the output ---
+
+    monte_carlo = _summarize_monte_carlo(first_failure_idx, deficits, simulation_start)
+
+    return {
+        "verdict": monte_carlo["verdict"],
+        "p_failure_by_end_year": monte_carlo["p_failure_by_end_year"],
+        "simulation_end_year": simulation_end,
+        "first_failure_year": monte_carlo["first_failure_year"],
+        "median_deficit_acre_feet": monte_carlo["median_deficit_acre_feet"],
+        "failure_curve": monte_carlo["failure_curve"],
+        "scenario_results": scenario_results,
+        "scenario_details": scenario_details,
+        "n_simulations_run": monte_carlo["n_simulations_run"],
+        "p_failure_ci_low": monte_carlo["p_failure_ci_low"],
+        "p_failure_ci_high": monte_carlo["p_failure_ci_high"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Lever grid sweep
+# ---------------------------------------------------------------------------
+
+def sweep_levers(
+    unit_count: int,
+    build_year: int,
+    unit_reduction_pcts,
+    build_delay_years,
+    greywater_recycling: bool = False,
+    pipeline_added: bool = False,
+    parcel_geojson: dict = None,
+    n_simulations: int = N_SIMULATIONS,
+    seed=None,
+    sampling: str = None,
+    parcel_acres: float = None,
+) -> np.ndarray:
+    """
+    P(failure by end year) for every (build delay, unit reduction) pair in one call.
+
+    All grid points share the same sampled paths, so differences between cells are
+    real lever effects rather than sampling noise, and each cell equals what
+    run_simulation() returns for that lever combination with the same seed.
+
+    The unit-reduction axis is broadcast as an extra array dimension; the delay axis
+    is a short loop because each delay shifts which trend factors line up with the window.
+
+    Returns:
+        (len(build_delay_years), len(unit_reduction_pcts)) array of p_failure values
+    """
+    paths = get_scenario_paths(seed, n_simulations, sampling)
+    development_allocation = COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"]
+    demand_multiplier = (1.0 - GREYWATER_DEMAND_REDUCTION) if greywater_recycling else 1.0
+    if parcel_acres is None:
+        parcel_acres = calc_parcel_area_acres(parcel_geojson) if parcel_geojson else 0.0
+
+    # One (n_runs, horizon) demand block per unit-reduction column — identical for every delay
+    unit_counts = np.array([int(unit_count * (1 - pct)) for pct in unit_reduction_pcts])
+    demand = demand_from_growth_table(
+        unit_counts[:, None, None], paths.growth_factors, parcel_acres
+    ).total(demand_multiplier)
+
+    p_failure = np.empty((len(build_delay_years), len(unit_counts)))
+    for d, delay in enumerate(build_delay_years):
+        available = development_allocation * paths.supply_shocks * _trend_factors(build_year + delay)
+        if pipeline_added:
+            available += PIPELINE_SUPPLY_ADDITION
+        p_failure[d] = (demand > available).any(axis=2).mean(axis=1)
+
+    return p_failure
+
+
+# ---------------------------------------------------------------------------
+# Portfolio — every project drawing on one shared development allocation
+# ---------------------------------------------------------------------------
+
+def run_portfolio_simulation(
+    projects: list,
+    n_simulations: int = N_SIMULATIONS,
+    seed=None,
+    sampling: str = None,
+) -> dict:
+    """
+    Joint Monte Carlo for a set of projects that all draw on the same development
+    allocation.
+
+    Each run has one supply path and one regional demand growth rate, shared by every
+    project. Demands are summed in calendar years: a project adds nothing before its
+    build year and compounds from its own build year afterwards. The window runs from
+    the earliest build year to SIMULATION_HORIZON years past the latest one.
 
-    for key in ["baseline", "moderate_drought", "severe_drought", "reduced_snowpack"]:
-        modifier = scenarios[key]["supply_modifier"]
-        scenario_failed = False
-
-        for year in simulation_years:
-            # Trend counts from the baseline year — not from the simulation start
-            years_of_trend = year - TREND_BASELINE_YEAR
-            available = development_allocation * modifier * (1 + annual_trend) ** years_of_trend
-            if pipeline_added:
-                available += PIPELINE_SUPPLY_ADDITION
-
-            demand = (
-                get_demand_for_year(effective_unit_count, effective_build_year, year) * demand_multiplier
-                + irrigation_demand_af
-            )
-
-            if demand > available:
-                scenario_failed = True
-                break
-
-        scenario_results[key] = "FAIL" if scenario_failed else "PASS"
-
-    # --- Step 3: Mode 2 — Monte Carlo ---
-    # Run n_simulations independent simulations. Each samples slightly different
-    # supply shocks and demand growth rates from probability distributions.
-    #
-    # failure_counts[i] = how many simulations failed BY year i.
-    # When a simulation fails at year X, we increment every year from X onward.
-    # Dividing by n_simulations gives P(failure by that year).
-
-    failure_counts = [0] * len(simulation_years)
-    simulation_outcomes = []
-
-    for _ in range(n_simulations):
-        # Sample a demand growth rate for this run
-        growth_rate = float(np.clip(
-            np.random.normal(loc=mc_demand["mean"], scale=mc_demand["std_dev"]),
-            mc_demand["min_clamp"],
-            mc_demand["max_clamp"],
-        ))
-
-        sim_failed = False
-        first_failure_year = None
-        deficit_at_failure = None
-
-        for i, year in enumerate(simulation_years):
-            # Sample a supply shock — lognormal centered at 1.0
-            # sigma=0.11 reflects year-to-year variability in Bear River flows
-            supply_shock = float(np.random.lognormal(mean=0, sigma=mc_supply["sigma"]))
-            years_of_trend = year - TREND_BASELINE_YEAR
-            available = development_allocation * supply_shock * (1 + annual_trend) ** years_of_trend
-
-            if pipeline_added:
-                available += PIPELINE_SUPPLY_ADDITION
-
-            demand = (
-                get_demand_for_year(effective_unit_count, effective_build_year, year, growth_rate) * demand_multiplier
-                + irrigation_demand_af
-            )
-
-            if demand > available:
-                sim_failed = True
-                first_failure_year = year
-                deficit_at_failure = demand - available
-
-                for j in range(i, len(simulation_years)):
-                    failure_counts[j] += 1
-                break
-
-        simulation_outcomes.append({
-            "failed": sim_failed,
-            "first_failure_year": first_failure_year,
-            "deficit": deficit_at_failure,
+    A shortfall in the pool is a shortfall for every project already online, so a
+    project fails in a run at the first pool shortfall on or after its build year,
+    and projects with the same build year share one failure curve.
+
+    Scaling: projects only enter through per-build-year totals (bincount), and the
+    summed indoor demand is the run × year growth table times a year × year Toeplitz
+    matrix of those totals. Cost grows with runs × years², not with project count.
+
+    Args:
+        projects: list of dicts with unit_count, build_year, greywater_recycling,
+                  pipeline_added and parcel_geojson (or parcel_acres)
+        n_simulations, seed, sampling: as in run_simulation
+
+    Returns:
+        {
+            "simulation_start_year", "simulation_end_year",
+            "aggregate": {verdict, p_failure_by_end_year, first_failure_year,
+                          median_deficit_acre_feet, failure_curve},
+            "projects":  [{verdict, p_failure_by_end_year, first_failure_year,
+                           simulation_end_year, failure_curve}, ...]  — input order
+        }
+    """
+    if not projects:
+        raise ValueError("A portfolio needs at least one project")
+
+    development_allocation = COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"]
+
+    build_years = np.array([p["build_year"] for p in projects])
+    start = int(build_years.min())
+    offsets = build_years - start
+    horizon = int(offsets.max()) + SIMULATION_HORIZON
+    end = start + horizon - 1
+
+    # --- Per-project day-one demand, then totals per build-year offset ---
+    unit_counts = np.array([p["unit_count"] for p in projects])
+    indoor_multiplier = np.where(
+        [p.get("greywater_recycling", False) for p in projects], 1.0 - GREYWATER_DEMAND_REDUCTION, 1.0
+    )
+    parcel_acres = np.array([
+        p["parcel_acres"] if p.get("parcel_acres") is not None
+        else calc_parcel_area_acres(p["parcel_geojson"]) if p.get("parcel_geojson") else 0.0
+        for p in projects
+    ])
+    day_one = demand_from_growth_table(unit_counts, np.ones(len(projects)), parcel_acres)
+    pipelines = np.array([p.get("pipeline_added", False) for p in projects], dtype=float)
+
+    indoor_by_offset = np.bincount(offsets, day_one.indoor * indoor_multiplier, minlength=horizon)
+    irrigation_by_offset = np.bincount(offsets, day_one.irrigation, minlength=horizon)
+    pipelines_by_offset = np.bincount(offsets, pipelines, minlength=horizon)
+
+    # --- Shared paths over the whole calendar window ---
+    if _is_integer_seed(seed):
+        # Salted so a portfolio never reuses a single project's draws
+        rng = np.random.default_rng([int(seed), horizon, 0x504F5254])
+    else:
+        rng = np.random.default_rng(seed)
+    paths = _sample_paths(rng, n_simulations, sampling or SAMPLING_METHOD, horizon)
+
+    # toeplitz[k, t] = indoor demand of projects that have been online k years at year t
+    age = np.arange(horizon)[None, :] - np.arange(horizon)[:, None]
+    toeplitz = np.where(age >= 0, indoor_by_offset[np.clip(age, 0, None)], 0.0)
+    demand = paths.growth_factors @ toeplitz + np.cumsum(irrigation_by_offset)
+
+    available = (
+        development_allocation * paths.supply_shocks * _trend_factors(start, horizon)
+        + PIPELINE_SUPPLY_ADDITION * np.cumsum(pipelines_by_offset)
+    )
+    shortfall = demand > available
+
+    # next_shortfall[r, t] = first shortfall year index >= t in run r (horizon if none)
+    shortfall_idx = np.where(shortfall, np.arange(horizon), horizon)
+    next_shortfall = np.minimum.accumulate(shortfall_idx[:, ::-1], axis=1)[:, ::-1]
+
+    # --- Aggregate: the pool as a whole over the full window ---
+    first_failure_idx = np.where(next_shortfall[:, 0] < horizon, next_shortfall[:, 0], -1)
+    deficits = np.full(n_simulations, np.nan)
+    rows = np.flatnonzero(first_failure_idx >= 0)
+    cols = first_failure_idx[rows]
+    deficits[rows] = demand[rows, cols] - available[rows, cols]
+    aggregate = _summarize_monte_carlo(first_failure_idx, deficits, start, horizon)
+
+    # --- Per build year: first shortfall on or after it, within its own 50-year window ---
+    group_offsets, group_of_project = np.unique(offsets, return_inverse=True)
+    years_online = next_shortfall[:, group_offsets] - group_offsets  # (runs, groups)
+    failed = years_online < SIMULATION_HORIZON
+
+    n_groups = len(group_offsets)
+    flat = (np.arange(n_groups) * SIMULATION_HORIZON)[None, :] + years_online
+    failure_counts = np.cumsum(
+        np.bincount(flat[failed], minlength=n_groups * SIMULATION_HORIZON).reshape(n_groups, SIMULATION_HORIZON),
+        axis=1,
+    )
+    p_failure_curves = failure_counts / n_simulations
+
+    # Upper median of first-failure years among failing runs, per group
+    n_failed = failed.sum(axis=0)
+    sorted_years = np.sort(np.where(failed, years_online, SIMULATION_HORIZON), axis=0)
+    median_years = sorted_years[n_failed // 2, np.arange(n_groups)]
+
+    groups = []
+    for g, offset in enumerate(group_offsets):
+        group_start = start + int(offset)
+        p_failure = float(p_failure_curves[g, -1])
+        groups.append({
+            "verdict": "FAIL" if p_failure > FAIL_THRESHOLD else "PASS",
+            "p_failure_by_end_year": round(p_failure, 4),
+            "first_failure_year": group_start + int(median_years[g]) if n_failed[g] else None,
+            "simulation_end_year": group_start + SIMULATION_HORIZON - 1,
+            "failure_curve": [
+                {"year": group_start + i, "p_failure": round(float(p), 4)}
+                for i, p in enumerate(p_failure_curves[g])
+            ],
         })
 
-    # --- Step 4: Build the output ---
+    return {
+        "simulation_start_year": start,
+        "simulation_end_year": end,
+        "aggregate": {
+            key: aggregate[key]
+            for key in ("verdict", "p_failure_by_end_year", "first_failure_year",
+                        "median_deficit_acre_feet", "failure_curve")
+        },
+        "projects": [groups[g] for g in group_of_project],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Fixed-scenario evaluator
+# ---------------------------------------------------------------------------
+
+def evaluate_scenarios(
+    supply_modifiers,
+    unit_count: int,
+    simulation_start: int,
+    demand_multiplier: float = 1.0,
+    parcel_acres: float = 0.0,
+    pipeline_added: bool = False,
+    growth_rate: float = DEFAULT_GROWTH_RATE,
+) -> dict:
+    """
+    Evaluate any number of fixed climate scenarios in one call.
+
+    Supply and demand are both deterministic in fixed-scenario mode, so every
+    scenario is a row of one (n_scenarios × SIMULATION_HORIZON) margin matrix:
+        margin = allocation × modifier × trend + pipeline − demand
+    The first negative entry in a row is that scenario's failure year. Adding more
+    scenarios (e.g. every CMIP6 ensemble member) only adds rows to the matrix.
+
+    Args:
+        supply_modifiers:     sequence of supply multipliers, one per scenario
+        unit_count:           effective number of homes (levers already applied)
+        simulation_start:     first simulation year (effective build year)
+        demand_multiplier:    0.72 with greywater recycling (indoor demand only), otherwise 1.0
+        parcel_acres:         parcel area driving outdoor irrigation demand
+        pipeline_added:       if True, adds PIPELINE_SUPPLY_ADDITION to every year
+        growth_rate:          annual demand growth rate (default 1.9%)
+
+    Returns:
+        dict of (n_scenarios,) arrays:
+            failed               — True if demand exceeds supply in any year
+            first_failure_year   — first deficit year (meaningless where failed is False)
+            min_margin_acre_feet — tightest supply − demand over the window (negative = deficit)
+    """
+    development_allocation = COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"]
+    modifiers = np.asarray(supply_modifiers, dtype=float)
+
+    available = development_allocation * modifiers[:, None] * _trend_factors(simulation_start)
+    if pipeline_added:
+        available += PIPELINE_SUPPLY_ADDITION
+
+    # One demand trajectory, shared by every scenario
+    demand = demand_from_growth_table(
+        unit_count, growth_table([growth_rate], SIMULATION_HORIZON), parcel_acres
+    ).total(demand_multiplier)
+
+    margin = available - demand
+    shortfall = margin < 0
+
+    return {
+        "failed": shortfall.any(axis=1),
+        "first_failure_year": simulation_start + shortfall.argmax(axis=1),
+        "min_margin_acre_feet": margin.min(axis=1),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo paths
+# ---------------------------------------------------------------------------
+
+def _sample_paths(
+    rng: np.random.Generator,
+    n_runs: int,
+    sampling: str,
+    horizon: int = SIMULATION_HORIZON,
+) -> ScenarioPaths:
+    """Draw one growth rate per run and one supply shock per (run, year) from rng."""
+    mc_supply = COUNTY_DATA["supply"]["monte_carlo"]
+    mc_demand = COUNTY_DATA["demand"]["demand_growth"]["monte_carlo"]
+
+    # Column 0 drives demand growth, columns 1..horizon the yearly supply shocks
+    z = standard_normals(rng, n_runs, 1 + horizon, sampling)
+
+    growth_rates = np.clip(
+        mc_demand["mean"] + mc_demand["std_dev"] * z[:, 0],
+        mc_demand["min_clamp"],
+        mc_demand["max_clamp"],
+    )
+
+    # Supply shocks — lognormal centered at 1.0
+    # sigma=0.11 reflects year-to-year variability in Bear River flows
+    supply_shocks = np.exp(mc_supply["sigma"] * z[:, 1:])
+
+    # Demand growth compounds from the build year, which is always column 0 of the
+    # window — so the growth table doesn't depend on build year or any lever.
+    growth_factors = growth_table(growth_rates, horizon)
+
+    return ScenarioPaths(
+        growth_rates=growth_rates,
+        growth_factors=growth_factors,
+        supply_shocks=supply_shocks,
+    )
+
+
+def block_size(sampling: str) -> int:
+    """Runs per block for an integer seed — a whole power of two for "sobol"."""
+    return SOBOL_BLOCK_SIZE if sampling == "sobol" else PATH_BLOCK_SIZE
+
+
+def _sample_blocks(seed: int, first_block: int, last_block: int, sampling: str) -> ScenarioPaths:
+    """
+    Paths for blocks [first_block, last_block) of an integer seed. Block k always
+    comes from its own stream, default_rng([seed, k]), so the runs of a seed are
+    the same no matter how many of them a caller asks for.
+    """
+    return ScenarioPaths.concat([
+        _sample_paths(np.random.default_rng([seed, k]), block_size(sampling), sampling)
+        for k in range(first_block, last_block)
+    ])
 
-    p_failure_by_end_year = failure_counts[-1] / n_simulations
+
+def _is_integer_seed(seed) -> bool:
+    return seed is not None and not isinstance(seed, np.random.Generator)
+
+
+def integer_seed(seed) -> int:
+    """
+    seed as an int. Blocks are addressed by (seed, block), so a run set that is
+    drawn in batches needs one — a Generator or None is turned into a fresh one.
+    """
+    if _is_integer_seed(seed):
+        return int(seed)
+    return int(np.random.default_rng(seed).integers(2**31))
+
+
+def sample_scenario_paths(seed, n_simulations: int = N_SIMULATIONS, sampling: str = None) -> ScenarioPaths:
+    """
+    Draw the stochastic inputs for n_simulations runs in one go: one demand growth
+    rate per run and one supply shock per (run, year).
+
+    Args:
+        seed:          int seed, numpy.random.Generator, or None for fresh randomness.
+                       Each call gets its own Generator — no shared global state between
+                       concurrent requests. An integer seed is drawn in fixed-size blocks,
+                       so the first 1,000 of 10,000 runs are exactly the 1,000-run set.
+        n_simulations: number of Monte Carlo runs
+        sampling:      one of SAMPLING_METHODS; defaults to SAMPLING_METHOD. With an
+                       integer seed, stratified methods balance each block on its own.
+    """
+    sampling = sampling or SAMPLING_METHOD
+    if _is_integer_seed(seed):
+        n_blocks = -(-n_simulations // block_size(sampling))
+        return _sample_blocks(int(seed), 0, n_blocks, sampling).rows(0, n_simulations)
+
+    # default_rng() passes a Generator straight through
+    return _sample_paths(np.random.default_rng(seed), n_simulations, sampling)
+
+
+def get_scenario_paths(seed, n_simulations: int = N_SIMULATIONS, sampling: str = None) -> ScenarioPaths:
+    """
+    Return the Monte Carlo paths for a seed, from the scenario cache when possible.
+    Only integer seeds are cached — a Generator or None means the caller wants
+    its own stream.
+    """
+    sampling = sampling or SAMPLING_METHOD
+    if not _is_integer_seed(seed):
+        return sample_scenario_paths(seed, n_simulations, sampling)
+
+    seed = int(seed)
+    return scenario_cache.get_or_sample(
+        (seed, n_simulations, sampling),
+        lambda: sample_scenario_paths(seed, n_simulations, sampling),
+    )
+
+
+def _path_rows(seed, n_simulations: int, start: int, stop: int, sampling: str = None) -> ScenarioPaths:
+    """
+    Runs [start, stop) of a seed's paths. Rows inside the cached n_simulations set
+    are sliced from it; rows beyond it (adaptive escalation) are drawn block by block
+    without growing the cache. A Generator or None has no run set to slice, so just
+    stop - start fresh runs are drawn — batch with integer_seed() to get one.
+    """
+    if not _is_integer_seed(seed):
+        return _sample_paths(np.random.default_rng(seed), stop - start, sampling or SAMPLING_METHOD)
+    if stop > n_simulations:
+        sampling = sampling or SAMPLING_METHOD
+        size = block_size(sampling)
+        first_block = start // size
+        last_block = -(-stop // size)
+        offset = first_block * size
+        blocks = _sample_blocks(int(seed), first_block, last_block, sampling)
+        return blocks.rows(start - offset, stop - offset)
+    return get_scenario_paths(seed, n_simulations, sampling).rows(start, stop)
+
+
+@lru_cache(maxsize=256)
+def _trend_factors(simulation_start: int, horizon: int = SIMULATION_HORIZON) -> np.ndarray:
+    """
+    Supply trend multiplier for each year of a window starting at simulation_start.
+    Trend counts from TREND_BASELINE_YEAR — not from the simulation start — so a
+    project built in 2035 inherits 9 years of accumulated decline.
+    """
+    annual_trend = COUNTY_DATA["supply"]["annual_trend_rate"]
+    years_of_trend = simulation_start + np.arange(horizon) - TREND_BASELINE_YEAR
+    factors = (1 + annual_trend) ** years_of_trend
+    factors.setflags(write=False)
+    return factors
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo kernel
+# ---------------------------------------------------------------------------
+
+def _monte_carlo_outcomes(
+    paths: ScenarioPaths,
+    unit_count: int,
+    simulation_start: int,
+    demand_multiplier: float,
+    parcel_acres: float,
+    pipeline_added: bool,
+) -> tuple:
+    """
+    Evaluate every Monte Carlo run at once against a set of sampled paths.
+
+    Args:
+        paths:                sampled growth factors and supply shocks
+        unit_count:           effective number of homes (levers already applied)
+        simulation_start:     first simulation year (effective build year)
+        demand_multiplier:    0.72 with greywater recycling (indoor demand only), otherwise 1.0
+        parcel_acres:         parcel area driving outdoor irrigation demand
+        pipeline_added:       if True, adds PIPELINE_SUPPLY_ADDITION to every year
+
+    Returns:
+        (first_failure_idx, deficits) — two (n_runs,) arrays. first_failure_idx is the
+        index into the simulation window of the first year demand exceeds supply, or -1
+        if the run never fails. deficits holds demand - supply in that year (NaN if none).
+    """
+    development_allocation = COUNTY_DATA["supply"]["development_allocation_acre_feet_per_year"]
+
+    available = development_allocation * paths.supply_shocks * _trend_factors(simulation_start)
+    if pipeline_added:
+        available += PIPELINE_SUPPLY_ADDITION
+
+    # Demand is 0 before the build year, but the window starts at the build year,
+    # so every column compounds from the day-one base demand.
+    demand = demand_from_growth_table(unit_count, paths.growth_factors, parcel_acres).total(demand_multiplier)
+
+    shortfall = demand > available
+    failed = shortfall.any(axis=1)
+
+    # argmax returns the first True per row (or 0 for an all-False row, masked below)
+    first_failure_idx = np.where(failed, shortfall.argmax(axis=1), -1)
+
+    deficits = np.full(paths.n_runs, np.nan)
+    rows = np.flatnonzero(failed)
+    cols = first_failure_idx[rows]
+    deficits[rows] = demand[rows, cols] - available[rows, cols]
+
+    return first_failure_idx, deficits
+
+
+def _summarize_monte_carlo(
+    first_failure_idx: np.ndarray,
+    deficits: np.ndarray,
+    simulation_start: int,
+    horizon: int = SIMULATION_HORIZON,
+) -> dict:
+    """
+    Turn per-run outcomes into the Monte Carlo fields of a SimulationResult.
+
+    failure_counts[i] = how many simulations failed BY year i — a histogram of
+    first-failure indices, accumulated with cumsum. Dividing by the run count
+    gives P(failure by that year).
+    """
+    n_runs = len(first_failure_idx)
+    failed = first_failure_idx >= 0
+
+    failure_counts = np.cumsum(
+        np.bincount(first_failure_idx[failed], minlength=horizon)
+    )
+    p_failure_by_end_year = failure_counts[-1] / n_runs
 
     failure_curve = [
-        {"year": year, "p_failure": round(failure_counts[i] / n_simulations, 4)}
-        for i, year in enumerate(simulation_years)
+        {"year": simulation_start + i, "p_failure": round(float(failure_counts[i] / n_runs), 4)}
+        for i in range(horizon)
     ]
 
-    failed_sims = [s for s in simulation_outcomes if s["failed"]]
     first_failure_year = None
     median_deficit = None
 
-    if failed_sims:
-        failure_years = sorted(s["first_failure_year"] for s in failed_sims)
-        first_failure_year = failure_years[len(failure_years) // 2]
+    if failed.any():
+        # Upper median — matches sorted(values)[len // 2]
+        failure_idx = np.sort(first_failure_idx[failed])
+        first_failure_year = simulation_start + int(failure_idx[len(failure_idx) // 2])
 
-        deficits = sorted(s["deficit"] for s in failed_sims)
-        median_deficit = round(deficits[len(deficits) // 2], 1)
+        failed_deficits = np.sort(deficits[failed])
+        median_deficit = round(float(failed_deficits[len(failed_deficits) // 2]), 1)
 
     verdict = "FAIL" if p_failure_by_end_year > FAIL_THRESHOLD else "PASS"
+    ci_low, ci_high = wilson_interval(int(failure_counts[-1]), n_runs)
 
     return {
         "verdict": verdict,
-        "p_failure_by_end_year": round(p_failure_by_end_year, 4),
-        "simulation_end_year": simulation_end,
+        "p_failure_by_end_year": round(float(p_failure_by_end_year), 4),
         "first_failure_year": first_failure_year,
         "median_deficit_acre_feet": median_deficit,
         "failure_curve": failure_curve,
-        "scenario_results": scenario_results,
+        "n_simulations_run": n_runs,
+        "p_failure_ci_low": round(ci_low, 4),
+        "p_failure_ci_high": round(ci_high, 4),
     }
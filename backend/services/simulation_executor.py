@@ -0,0 +1,215 @@
+"""
+DataDungeon — Simulation Executor
+
+Runs POST /simulate jobs on a dedicated process pool so simulation code never
+runs on the API event loop or competes with request handling for the GIL.
+
+Flow:
+  1. The route marks the project "queued" and calls simulation_executor.submit().
+     The queue is bounded — when it is full, submit() raises QueueFullError and
+     the route answers 503 so clients back off instead of piling up work.
+  2. One dispatcher thread per worker process pulls the next job, marks the
+     project "running", and hands the Monte Carlo runs to the process pool one
+     sampling block (simulation_engine.block_size) at a time. After each batch it
+     publishes a partial estimate to the progress broker for the SSE stream.
+     Adaptive jobs stop as soon as the verdict is statistically settled, or carry
+     on past the usual run count up to ADAPTIVE_MAX_RUNS when it isn't.
+  3. When the last batch returns, the dispatcher writes the results, marks the
+     project "complete" (or "failed" if anything raised) and records the run in
+     simulation_runs.
+
+Because there are exactly as many dispatchers as worker processes, a project
+only becomes "running" when a process is actually free to run it.
+
+Configure with SIMULATION_WORKERS and SIMULATION_QUEUE_SIZE in backend/.env.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from db.connection import SessionLocal
+from models.project import Project
+from services.progress_broker import progress_broker
+from services.result_cache import normalize_levers
+from services.result_storage import store_results
+from services.run_store import run_key, run_store
+from services.simulation_engine import (
+    ADAPTIVE_MAX_RUNS,
+    N_SIMULATIONS,
+    SAMPLING_METHOD,
+    assemble_result,
+    block_size,
+    calc_parcel_area_acres,
+    integer_seed,
+    simulate_batch,
+    verdict_settled,
+)
+
+logger = logging.getLogger(__name__)
+
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", "2"))
+SIMULATION_QUEUE_SIZE = int(os.getenv("SIMULATION_QUEUE_SIZE", "32"))
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the job queue is at capacity."""
+
+
+def _set_status(project_id: int, status: str, results: dict = None, runs: tuple = None):
+    """runs is the (first_failure_idx, deficits) pair behind results, stored alongside them."""
+    db = SessionLocal()
+    try:
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if project:
+            project.status = status
+            if results is not None:
+                store_results(project, results, *(runs or ()))
+            db.commit()
+    finally:
+        db.close()
+
+    progress_broker.publish(project_id, "status", {"status": status})
+    if results is not None:
+        progress_broker.publish(project_id, "result", results)
+
+
+class SimulationExecutor:
+    def __init__(self, workers: int = SIMULATION_WORKERS, queue_size: int = SIMULATION_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = None
+        self._queue = None
+        self._dispatchers = []
+
+    def start(self):
+        # "spawn" gives each worker a clean interpreter — no inherited DB connections
+        # or locks from the API process.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch_loop, name=f"simulation-dispatch-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._dispatchers:
+            thread.start()
+
+    def shutdown(self):
+        if self._pool is None:
+            return
+        for _ in self._dispatchers:
+            self._queue.put(None)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    def submit(self, project_id: int, simulation_kwargs: dict, adaptive: bool = False):
+        """
+        Queue a simulation for a project. simulation_kwargs are run_simulation()'s
+        keyword arguments. adaptive=True sizes the run count like
+        run_adaptive_simulation() instead of using n_simulations as-is.
+        """
+        if self._pool is None:
+            raise RuntimeError("Simulation executor is not running")
+        try:
+            self._queue.put_nowait((project_id, simulation_kwargs, adaptive))
+        except queue.Full:
+            raise QueueFullError(f"Simulation queue is full ({self.queue_size} jobs waiting)")
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _dispatch_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            project_id, simulation_kwargs, adaptive = job
+            try:
+                self._run(project_id, simulation_kwargs, adaptive)
+            except Exception:
+                logger.exception("Simulation dispatcher failed for project %s", project_id)
+
+    def _run(self, project_id: int, simulation_kwargs: dict, adaptive: bool = False):
+        _set_status(project_id, "running")
+        kwargs = dict(simulation_kwargs)
+        n_simulations = kwargs.pop("n_simulations", N_SIMULATIONS)
+        seed = kwargs.pop("seed", None)
+        # Measure the parcel once rather than in every batch
+        parcel_geojson = kwargs.pop("parcel_geojson", None)
+        if kwargs.get("parcel_acres") is None:
+            kwargs["parcel_acres"] = calc_parcel_area_acres(parcel_geojson) if parcel_geojson else 0.0
+        max_runs = ADAPTIVE_MAX_RUNS if adaptive else n_simulations
+        try:
+            if max_runs <= 0:
+                raise ValueError(f"Nothing to simulate: {max_runs} runs requested")
+            # Batches of one seeded run set — together they equal run_simulation(),
+            # or run_adaptive_simulation() when adaptive: both step through the same
+            # sampling blocks, so the verdict is checked after the same run counts.
+            # An unseeded job still gets one integer seed, so every batch slices the
+            # same cached set.
+            batch_seed = integer_seed(seed)
+            batch_size = block_size(kwargs.get("sampling") or SAMPLING_METHOD)
+            idx_parts, deficit_parts = [], []
+            estimate = None
+            for start in range(0, max_runs, batch_size):
+                stop = min(start + batch_size, max_runs)
+                first_failure_idx, deficits = self._pool.submit(
+                    simulate_batch, start, stop, n_simulations, batch_seed, **kwargs
+                ).result()
+                idx_parts.append(first_failure_idx)
+                deficit_parts.append(deficits)
+
+                all_idx, all_deficits = np.concatenate(idx_parts), np.concatenate(deficit_parts)
+                estimate = assemble_result(all_idx, all_deficits, **kwargs)
+                if adaptive and verdict_settled(all_idx):
+                    break
+                if stop < max_runs:
+                    progress_broker.publish(project_id, "progress", {
+                        "completed_runs": stop,
+                        "n_simulations": max_runs,
+                        "estimate": estimate,
+                    })
+            results = estimate
+        except Exception:
+            # Mark the project as failed so the frontend doesn't poll forever
+            # waiting for a result that will never come.
+            logger.exception("Simulation failed for project %s", project_id)
+            _set_status(project_id, "failed")
+            return
+        _set_status(project_id, "complete", results=results, runs=(all_idx, all_deficits))
+        self._record_run(project_id, seed, kwargs, results, all_idx, all_deficits)
+
+    @staticmethod
+    def _record_run(project_id: int, seed, kwargs: dict, results: dict, first_failure_idx, deficits):
+        """Keep the run in simulation_runs so /whatif at the project's own levers is a lookup."""
+        if seed is None:
+            return  # unseeded runs can't be reproduced, so there is nothing to key them on
+        levers = normalize_levers(
+            greywater_recycling=kwargs.get("greywater_recycling", False),
+            pipeline_added=kwargs.get("pipeline_added", False),
+        )
+        key = run_key(
+            project_id,
+            kwargs["unit_count"],
+            kwargs["build_year"],
+            seed,
+            levers,
+            kwargs["parcel_acres"],
+            n_simulations=len(first_failure_idx),
+        )
+        try:
+            run_store.save(key, levers, results, first_failure_idx, deficits, source="simulate")
+        except Exception:
+            logger.exception("Could not record simulation run for project %s", project_id)
+
+
+# One executor per API process — started and stopped by the lifespan in main.py
+simulation_executor = SimulationExecutor()
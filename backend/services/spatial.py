@@ -0,0 +1,110 @@
+"""
+DataDungeon — Spatial Queries
+
+Every project's parcel is stored twice: the GeoJSON exactly as drawn (sent back
+to Mapbox untouched) and Project.parcel_geom, a PostGIS MultiPolygon in WGS 84.
+The geometry column carries two GiST indexes:
+
+  - on parcel_geom itself            — bounding-box queries (the map view)
+  - on geography(parcel_geom)        — distance queries in metres (nearby projects)
+
+so both endpoints are one indexed query no matter how many projects exist.
+
+Measurements use the geography type — areas and distances on the WGS 84
+spheroid rather than in degrees — so no projection has to be picked per parcel.
+"""
+
+import json
+
+from sqlalchemy import String, bindparam, func, select
+
+from models.project import Project
+from services.parcel_geometry import SQ_M_PER_ACRE, ParcelGeometry, geojson_geometry
+
+WGS84 = 4326
+
+# Project columns returned by the map endpoints — enough to draw and colour a parcel
+MAP_COLUMNS = (
+    Project.id,
+    Project.project_name,
+    Project.unit_count,
+    Project.build_year,
+    Project.status,
+    Project.result_summary["verdict"].as_string().label("verdict"),
+    Project.parcel_acres,
+    Project.parcel_centroid_lat,
+    Project.parcel_centroid_lng,
+    Project.parcel_bbox,
+    Project.parcel_geojson,
+)
+
+
+def parcel_geom_expr(parcel_geojson: dict):
+    """
+    SQL expression turning a GeoJSON parcel into a valid WGS 84 MultiPolygon.
+    Raises ValueError if the GeoJSON isn't a Polygon or MultiPolygon.
+
+    ST_MakeValid repairs hand-drawn self-intersections; ST_CollectionExtract keeps
+    only the polygonal part of the result.
+    """
+    geometry = bindparam("parcel", json.dumps(geojson_geometry(parcel_geojson)), type_=String, unique=True)
+    parsed = func.ST_SetSRID(func.ST_GeomFromGeoJSON(geometry), WGS84)
+    return func.ST_Multi(func.ST_CollectionExtract(func.ST_MakeValid(parsed), 3))
+
+
+def _geography(geom):
+    # Must render exactly as in the ix_projects_parcel_geog index for Postgres to use it
+    return func.geography(geom)
+
+
+async def measure_parcel(db, parcel_geojson: dict) -> ParcelGeometry:
+    """Area, centroid and bounding box of a GeoJSON parcel, measured by PostGIS."""
+    parcel = select(parcel_geom_expr(parcel_geojson).label("geom")).subquery()
+    geom = parcel.c.geom
+    centroid = func.geometry(func.ST_Centroid(_geography(geom)))
+    row = (await db.execute(select(
+        func.ST_Area(_geography(geom)).label("area_m2"),
+        func.ST_Y(centroid).label("lat"),
+        func.ST_X(centroid).label("lng"),
+        func.ST_XMin(geom).label("west"),
+        func.ST_YMin(geom).label("south"),
+        func.ST_XMax(geom).label("east"),
+        func.ST_YMax(geom).label("north"),
+    ))).one()
+
+    if not row.area_m2:
+        return ParcelGeometry(area_acres=0.0, centroid_lat=None, centroid_lng=None, bbox=None)
+    return ParcelGeometry(
+        area_acres=row.area_m2 / SQ_M_PER_ACRE,
+        centroid_lat=row.lat,
+        centroid_lng=row.lng,
+        bbox=(row.west, row.south, row.east, row.north),
+    )
+
+
+async def projects_in_bbox(db, west: float, south: float, east: float, north: float, limit: int) -> list:
+    """Projects whose parcel intersects the bounding box, in id order."""
+    envelope = func.ST_MakeEnvelope(west, south, east, north, WGS84)
+    result = await db.execute(
+        select(*MAP_COLUMNS)
+        .where(func.ST_Intersects(Project.parcel_geom, envelope))
+        .order_by(Project.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def projects_near(db, project_id: int, radius_m: float, limit: int) -> list:
+    """Other projects whose parcel comes within radius_m metres of this one, nearest first."""
+    origin = _geography(select(Project.parcel_geom).where(Project.id == project_id).scalar_subquery())
+    distance = func.ST_Distance(_geography(Project.parcel_geom), origin)
+    result = await db.execute(
+        select(*MAP_COLUMNS, distance.label("distance_m"))
+        .where(
+            Project.id != project_id,
+            func.ST_DWithin(_geography(Project.parcel_geom), origin, radius_m),
+        )
+        .order_by(distance, Project.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
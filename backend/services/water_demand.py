@@ -3,8 +3,20 @@ Water demand calculations for DataDungeon.
 
 All demand figures are in acre-feet per year.
 One acre-foot = 325,851 gallons — the standard unit for water management in Utah.
+
+Two ways in:
+  - Scalar functions (calculate_base_demand, calculate_irrigation_demand,
+    get_demand_for_year) answer one question about one year.
+  - The array API (growth_table, demand_trajectories, demand_from_growth_table)
+    returns whole trajectories — one row per Monte Carlo run, one column per year —
+    in a single call. The simulation engine uses this; the scalar functions are
+    thin wrappers over it.
 """
 
+from dataclasses import dataclass
+
+import numpy as np
+
 # --- Constants ---
 
 GALLONS_PER_ACRE_FOOT = 325_851
@@ -26,7 +38,7 @@ IRRIGATED_LOT_FRACTION = 0.45         # fraction of lot assumed to be irrigated
 MAX_IRRIGATED_ACRES_PER_UNIT = 0.25   # cap at ~10,890 sq ft per unit to avoid outliers on rural lots
 
 
-# --- Functions ---
+# --- Scalar functions ---
 
 def calculate_base_demand(unit_count: int) -> float:
     """
@@ -45,6 +57,7 @@ def calculate_base_demand(unit_count: int) -> float:
 
     Returns:
         float: acre-feet per year at build time
+               (an array of figures when unit_count is a numpy array)
     """
     daily_gallons = unit_count * PEOPLE_PER_UNIT * GPD_PER_CAPITA
     annual_gallons = daily_gallons * 365
@@ -75,13 +88,7 @@ def calculate_irrigation_demand(unit_count: int, parcel_acres: float) -> float:
         total     = 0.0045 * 500 = 2.25 irrigated acres
         demand    = 2.25 * 2.5   = 5.6 AF/year
     """
-    if unit_count <= 0 or parcel_acres <= 0:
-        return 0.0
-
-    lot_size_acres = parcel_acres / unit_count
-    irrigated_per_unit = min(lot_size_acres * IRRIGATED_LOT_FRACTION, MAX_IRRIGATED_ACRES_PER_UNIT)
-    total_irrigated_acres = irrigated_per_unit * unit_count
-    return total_irrigated_acres * IRRIGATION_NET_FEET_PER_YEAR
+    return float(irrigation_demand(unit_count, parcel_acres))
 
 
 def get_demand_for_year(
@@ -117,6 +124,99 @@ def get_demand_for_year(
     if year < build_year:
         return 0.0
 
-    base = calculate_base_demand(unit_count)
     years_of_growth = year - build_year
-    return base * (1 + growth_rate) ** years_of_growth
+    trajectory = demand_trajectories(unit_count, [growth_rate], years=years_of_growth + 1)
+    return float(trajectory.indoor[0, -1])
+
+
+# --- Array API ---
+
+@dataclass(frozen=True)
+class DemandTrajectories:
+    """
+    Demand for every (run, year), split into its two components so levers can act on
+    the right one — greywater recycling scales indoor demand only.
+    """
+    indoor: np.ndarray      # (..., n_runs, years) municipal demand, compounding with growth
+    irrigation: np.ndarray  # fixed outdoor demand, broadcastable against indoor
+
+    def total(self, indoor_multiplier: float = 1.0) -> np.ndarray:
+        """Total demand in acre-feet/year, with indoor demand scaled by indoor_multiplier."""
+        return self.indoor * indoor_multiplier + self.irrigation
+
+
+def irrigated_acres(unit_count, parcel_acres) -> np.ndarray:
+    """
+    Irrigated lawn and garden area in acres for unit_count homes on a parcel.
+    unit_count and parcel_acres may be numpy arrays.
+    """
+    units = np.asarray(unit_count, dtype=float)
+    acres = np.asarray(parcel_acres, dtype=float)
+
+    safe_units = np.where(units > 0, units, 1.0)
+    lot_size_acres = acres / safe_units
+    irrigated_per_unit = np.minimum(lot_size_acres * IRRIGATED_LOT_FRACTION, MAX_IRRIGATED_ACRES_PER_UNIT)
+    return np.where((units > 0) & (acres > 0), irrigated_per_unit * units, 0.0)
+
+
+def irrigation_demand(unit_count, parcel_acres) -> np.ndarray:
+    """
+    Vectorized calculate_irrigation_demand — unit_count and parcel_acres may be
+    numpy arrays (one entry per unit-reduction lever value, or per project).
+    """
+    return irrigated_acres(unit_count, parcel_acres) * IRRIGATION_NET_FEET_PER_YEAR
+
+
+def growth_table(growth_rates, years: int) -> np.ndarray:
+    """
+    Cumulative demand growth multipliers, (n_runs × years).
+
+    Column t is (1 + growth_rate) ** t, built as a running product of the yearly
+    factor rather than a fresh power per cell. Column 0 (the build year) is 1.
+    """
+    rates = np.atleast_1d(np.asarray(growth_rates, dtype=float))
+    table = np.ones((len(rates), years))
+    if years > 1:
+        table[:, 1:] = np.cumprod(
+            np.broadcast_to(1 + rates[:, None], (len(rates), years - 1)), axis=1
+        )
+    return table
+
+
+def demand_from_growth_table(unit_count, table: np.ndarray, parcel_acres: float = 0.0) -> DemandTrajectories:
+    """
+    Demand trajectories from a precomputed growth_table(). Year 0 is the build year.
+
+    unit_count may be a scalar or an array shaped to broadcast against table — for
+    example (n_units, 1, 1) gives one (n_runs × years) block per unit count.
+    """
+    return DemandTrajectories(
+        indoor=calculate_base_demand(unit_count) * table,
+        irrigation=irrigation_demand(unit_count, parcel_acres),
+    )
+
+
+def demand_trajectories(
+    unit_count,
+    growth_rates,
+    years: int,
+    parcel_acres: float = 0.0,
+) -> DemandTrajectories:
+    """
+    Full demand trajectory for every growth rate in one call.
+
+    Args:
+        unit_count:   number of homes in the development
+        growth_rates: sequence of annual growth rates, one per run
+        years:        trajectory length, starting at the build year
+        parcel_acres: parcel area for outdoor irrigation demand (0 = none)
+
+    Returns:
+        DemandTrajectories with indoor shaped (len(growth_rates), years)
+
+    Example:
+        500 units, growth rates [0.019, 0.025], 3 years
+        → indoor [[300.5, 306.2, 312.0],
+                  [300.5, 308.0, 315.7]]
+    """
+    return demand_from_growth_table(unit_count, growth_table(growth_rates, years), parcel_acres)
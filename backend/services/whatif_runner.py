@@ -0,0 +1,105 @@
+"""
+DataDungeon — What-If Runner
+
+Runs /whatif computations off the event loop and only spends worker time on the
+newest slider state from each client.
+
+Dragging a slider fires a burst of PATCH /whatif requests whose results are stale
+as soon as the next one arrives. Clients that tag requests with a client id and an
+increasing sequence number (X-Client-Id / X-Whatif-Seq headers) get:
+  - an immediate SupersededError for any request older than one already seen
+  - cancellation of the previous in-flight request when a newer one arrives.
+    A computation still waiting in the pool queue is dropped outright; one that
+    already started finishes in its thread but its result is discarded.
+
+Requests without a sequence number are simply run on the pool, unchanged. The AI
+agent uses the same pool to verify its suggestions, so the pool size bounds how
+many simulations the API process runs at once.
+
+The bookkeeping is only touched from the event loop thread, so it needs no lock.
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+WHATIF_WORKERS = int(os.getenv("WHATIF_WORKERS", "4"))
+
+# How many clients' last sequence numbers to remember
+MAX_TRACKED_CLIENTS = 10_000
+
+
+class SupersededError(Exception):
+    """The request was replaced by a newer one from the same client."""
+
+
+class _InFlight:
+    def __init__(self, seq: int, future: asyncio.Future):
+        self.seq = seq
+        self.future = future
+        self.superseded = False
+
+
+class WhatIfRunner:
+    def __init__(self, workers: int = WHATIF_WORKERS):
+        self.workers = workers
+        self._pool = None
+        self._in_flight = {}              # client_key → _InFlight
+        self._last_seq = OrderedDict()    # client_key → highest seq seen
+        self.superseded_count = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="whatif")
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, compute, client_key=None, seq: int = None):
+        """
+        Run compute() on the what-if pool and return its result.
+        Raises SupersededError if a newer request from client_key replaced this one.
+        """
+        loop = asyncio.get_running_loop()
+
+        if client_key is None or seq is None:
+            return await loop.run_in_executor(self._executor(), compute)
+
+        if seq <= self._last_seq.get(client_key, -1):
+            self.superseded_count += 1
+            raise SupersededError
+        self._remember(client_key, seq)
+
+        previous = self._in_flight.get(client_key)
+        if previous is not None:
+            previous.superseded = True
+            previous.future.cancel()
+
+        entry = _InFlight(seq, loop.run_in_executor(self._executor(), compute))
+        self._in_flight[client_key] = entry
+        try:
+            return await entry.future
+        except asyncio.CancelledError:
+            # Cancelled by a newer request → report it. Cancelled for any other
+            # reason (client disconnected, shutdown) → let it propagate.
+            if entry.superseded:
+                self.superseded_count += 1
+                raise SupersededError
+            raise
+        finally:
+            if self._in_flight.get(client_key) is entry:
+                del self._in_flight[client_key]
+
+    def _remember(self, client_key, seq: int):
+        self._last_seq[client_key] = seq
+        self._last_seq.move_to_end(client_key)
+        while len(self._last_seq) > MAX_TRACKED_CLIENTS:
+            self._last_seq.popitem(last=False)
+
+
+# One runner per API process — shut down by the lifespan in main.py
+whatif_runner = WhatIfRunner()
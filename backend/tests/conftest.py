@@ -0,0 +1,19 @@
+"""
+Shared setup for the backend tests. Run from backend/:
+
+    python -m pytest -q
+
+Everything here is seeded and runs without a database or a model backend.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# The app imports modules as `services.…`, `models.…` from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("SIMULATION_SAMPLING", "random")
+# Engines connect lazily — nothing here opens a connection
+os.environ.setdefault("DATABASE_URL", "postgresql://datadungeon@localhost/datadungeon_test")
+os.environ.setdefault("AGENT_LLM_BACKEND", "local")
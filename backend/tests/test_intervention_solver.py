@@ -0,0 +1,50 @@
+"""The solver's answers sit exactly on the engine's pass/fail boundary."""
+
+import pytest
+
+from services.ai_agent import _solver_fallback
+from services.intervention_solver import MAX_UNIT_REDUCTION_PCT, find_minimal_interventions
+from services.simulation_engine import FAIL_THRESHOLD, run_simulation
+
+SEED = 42
+PROJECT = {"unit_count": 1000, "build_year": 2030, "parcel_acres": 50.0}
+
+
+def _p_failure(levers: dict) -> float:
+    return run_simulation(**PROJECT, **levers, seed=SEED)["p_failure_by_end_year"]
+
+
+@pytest.fixture(scope="module")
+def solutions():
+    return find_minimal_interventions(**PROJECT, seed=SEED)
+
+
+def test_project_fails_without_intervention():
+    assert _p_failure({}) > FAIL_THRESHOLD
+
+
+def test_unit_cut_lands_on_the_boundary(solutions):
+    cuts = [s for s in solutions if s["searched"] == "unit_reduction_pct" and s["levers"]["unit_reduction_pct"] > 0]
+    assert cuts
+    for solution in cuts:
+        levers = solution["levers"]
+        # Passes at the reported cut, fails one whole percent below it
+        assert _p_failure(levers) <= FAIL_THRESHOLD
+        smaller = {**levers, "unit_reduction_pct": round(levers["unit_reduction_pct"] - 0.01, 2)}
+        assert _p_failure(smaller) > FAIL_THRESHOLD
+
+
+def test_reported_p_failure_reproduces_on_the_slider(solutions):
+    for solution in solutions:
+        assert solution["projected_p_failure"] == pytest.approx(_p_failure(solution["levers"]), abs=5e-4)
+
+
+def test_no_single_axis_fix_is_reported_as_unfixable():
+    # Fails with every infrastructure combination, even at the largest cut or delay searched
+    oversized = {**PROJECT, "unit_count": 3000}
+    solutions = find_minimal_interventions(**oversized, seed=SEED)
+    assert solutions == []
+
+    fallback = _solver_fallback(solutions)
+    assert fallback["unfixable"] is True
+    assert fallback["recommendations"] == []
@@ -0,0 +1,46 @@
+"""Tool answers are checked against the agent's schema before anyone sees them."""
+
+import pytest
+
+from services.ai_agent import _SUGGEST_TOOL
+from services.llm_client import LLMError, check_arguments
+
+
+def _suggestion(**overrides) -> dict:
+    return {
+        "unit_reduction_pct": 0.2,
+        "greywater_recycling": True,
+        "pipeline_added": False,
+        "build_delay_years": 2,
+        "explanation": "Cut units and recycle greywater.",
+        **overrides,
+    }
+
+
+def test_well_formed_answer_passes():
+    arguments = {"interventions": [_suggestion(), _suggestion(build_delay_years=0)]}
+    assert check_arguments(arguments, _SUGGEST_TOOL) is arguments
+
+
+@pytest.mark.parametrize("overrides", [
+    {"unit_reduction_pct": 1.5},
+    {"unit_reduction_pct": -0.1},
+    {"unit_reduction_pct": float("nan")},
+    {"build_delay_years": 50},
+    {"build_delay_years": True},
+    {"greywater_recycling": "yes"},
+])
+def test_out_of_range_or_mistyped_lever_is_rejected(overrides):
+    with pytest.raises(LLMError):
+        check_arguments({"interventions": [_suggestion(), _suggestion(**overrides)]}, _SUGGEST_TOOL)
+
+
+@pytest.mark.parametrize("count", [0, 1, 4])
+def test_intervention_count_is_bounded(count):
+    with pytest.raises(LLMError):
+        check_arguments({"interventions": [_suggestion()] * count}, _SUGGEST_TOOL)
+
+
+def test_answer_without_interventions_is_rejected():
+    with pytest.raises(LLMError):
+        check_arguments({"suggestions": []}, _SUGGEST_TOOL)
@@ -0,0 +1,49 @@
+"""Round-trip tests for the compact result columns."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services.result_storage import ALL_FIELDS, DEFAULT_FIELDS, load_results, store_results
+from services.simulation_engine import run_simulation, simulate_batch
+
+PROJECT = {"unit_count": 800, "build_year": 2030, "parcel_acres": 50.0}
+
+
+def _stored(results, runs=None):
+    project = SimpleNamespace()
+    store_results(project, results, *(runs or (None, None)))
+    return project
+
+
+def test_round_trip_returns_the_original_result():
+    results = run_simulation(**PROJECT, seed=42)
+    loaded = load_results(_stored(results))
+
+    assert set(loaded) == set(DEFAULT_FIELDS)
+    for key in DEFAULT_FIELDS:
+        if key != "failure_curve":
+            assert loaded[key] == results[key], key
+    # The curve is stored as float32 and read back rounded to 4 places
+    assert [pt["year"] for pt in loaded["failure_curve"]] == [pt["year"] for pt in results["failure_curve"]]
+    for got, want in zip(loaded["failure_curve"], results["failure_curve"]):
+        assert got["p_failure"] == pytest.approx(want["p_failure"], abs=1e-4)
+
+
+def test_round_trip_keeps_per_run_outcomes():
+    first_failure_idx, deficits = simulate_batch(start=0, stop=1000, n_simulations=1000, seed=42, **PROJECT)
+    results = run_simulation(**PROJECT, seed=42)
+    loaded = load_results(_stored(results, (first_failure_idx, deficits)), ALL_FIELDS)
+
+    start_year = results["failure_curve"][0]["year"]
+    assert loaded["run_first_failure_years"] == [
+        start_year + int(i) if i >= 0 else None for i in first_failure_idx
+    ]
+    assert loaded["run_deficits_acre_feet"] == [
+        None if np.isnan(d) else pytest.approx(float(d), abs=0.05) for d in deficits
+    ]
+
+
+def test_missing_results_load_as_none():
+    assert load_results(SimpleNamespace(result_summary=None)) is None
@@ -0,0 +1,78 @@
+"""Seeded regression tests for the Monte Carlo engine."""
+
+import numpy as np
+import pytest
+
+from services.simulation_engine import (
+    N_SIMULATIONS,
+    run_adaptive_simulation,
+    run_simulation,
+    simulate_batch,
+    sweep_levers,
+)
+
+SEED = 42
+PROJECT = {"unit_count": 800, "build_year": 2030, "parcel_acres": 50.0}
+
+
+def test_same_seed_gives_identical_results():
+    assert run_simulation(**PROJECT, seed=SEED) == run_simulation(**PROJECT, seed=SEED)
+
+
+def test_different_seeds_give_different_futures():
+    a = run_simulation(**PROJECT, seed=SEED)
+    b = run_simulation(**PROJECT, seed=SEED + 1)
+    assert a["failure_curve"] != b["failure_curve"]
+
+
+@pytest.mark.parametrize("sampling", ["random", "antithetic", "latin_hypercube"])
+def test_sweep_cell_matches_run_simulation(sampling):
+    reductions, delays = [0.0, 0.25, 0.5], [0, 3, 7]
+    grid = sweep_levers(
+        **PROJECT,
+        unit_reduction_pcts=reductions,
+        build_delay_years=delays,
+        greywater_recycling=True,
+        seed=SEED,
+        sampling=sampling,
+    )
+    for d, delay in enumerate(delays):
+        for r, reduction in enumerate(reductions):
+            result = run_simulation(
+                **PROJECT,
+                greywater_recycling=True,
+                unit_reduction_pct=reduction,
+                build_delay_years=delay,
+                seed=SEED,
+                sampling=sampling,
+            )
+            assert grid[d, r] == pytest.approx(result["p_failure_by_end_year"], abs=5e-4)
+
+
+def test_batches_are_slices_of_the_full_run_set():
+    full_idx, full_deficits = simulate_batch(start=0, stop=N_SIMULATIONS, n_simulations=N_SIMULATIONS, seed=SEED, **PROJECT)
+    idx, deficits = simulate_batch(start=200, stop=400, n_simulations=N_SIMULATIONS, seed=SEED, **PROJECT)
+    np.testing.assert_array_equal(idx, full_idx[200:400])
+    np.testing.assert_array_equal(deficits, full_deficits[200:400])
+
+
+@pytest.mark.parametrize("unit_count", [500, 550])
+def test_adaptive_run_is_a_prefix_of_the_fixed_run_set(unit_count):
+    # 500 units settles early; 550 sits near the threshold and escalates past 1,000 runs
+    project = {**PROJECT, "unit_count": unit_count}
+    adaptive = run_adaptive_simulation(**project, seed=SEED)
+    fixed = run_simulation(**project, seed=SEED, n_simulations=adaptive["n_simulations_run"])
+
+    for key in ("verdict", "p_failure_by_end_year", "first_failure_year", "median_deficit_acre_feet", "failure_curve"):
+        assert adaptive[key] == fixed[key], key
+
+
+def test_unseeded_batch_past_the_run_set_is_full_size():
+    idx, deficits = simulate_batch(start=N_SIMULATIONS, stop=N_SIMULATIONS + 200, n_simulations=N_SIMULATIONS, seed=None, **PROJECT)
+    assert len(idx) == len(deficits) == 200
+
+
+def test_same_generator_state_gives_identical_results():
+    a = run_simulation(**PROJECT, seed=np.random.default_rng(7))
+    b = run_simulation(**PROJECT, seed=np.random.default_rng(7))
+    assert a == b
@@ -36,6 +36,9 @@ export default function Results() {
   // What-if
   const [levers, setLevers]             = useState(DEFAULT_LEVERS)
   const leversInitialized               = useRef(false)
+  // What-if sequencing — the backend cancels older in-flight requests from this tab
+  const whatIfSeq                       = useRef(0)
+  const clientId                        = useRef(Math.random().toString(36).slice(2))
   const [whatIfResult, setWhatIfResult] = useState(null)
   const [whatIfLoading, setWhatIfLoading] = useState(false)
 
@@ -73,8 +76,11 @@ export default function Results() {
       .catch(() => {})
   }, [id])
 
-  // Poll for simulation results
+  // Stream simulation results over Server-Sent Events.
+  // Falls back to polling if the stream can't be opened or drops.
   useEffect(() => {
+    let source = null
+
     const poll = async () => {
       try {
         const res = await api.get(`/projects/${id}/results`)
@@ -92,9 +98,39 @@ export default function Results() {
         clearInterval(intervalRef.current)
       }
     }
-    poll()
-    intervalRef.current = setInterval(poll, POLL_INTERVAL_MS)
-    return () => clearInterval(intervalRef.current)
+
+    const startPolling = () => {
+      poll()
+      intervalRef.current = setInterval(poll, POLL_INTERVAL_MS)
+    }
+
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+    } else {
+      source = new EventSource(`${api.defaults.baseURL}/projects/${id}/results/stream`)
+      source.addEventListener('status', e => {
+        const { status: s } = JSON.parse(e.data)
+        setStatus(s === 'complete' ? 'running' : s)  // wait for the result event
+        if (s === 'failed') {
+          setError('The simulation encountered an error. Please try again.')
+          source.close()
+        }
+      })
+      source.addEventListener('result', e => {
+        setResults(JSON.parse(e.data))
+        setStatus('complete')
+        source.close()
+      })
+      source.onerror = () => {
+        source.close()
+        startPolling()
+      }
+    }
+
+    return () => {
+      if (source) source.close()
+      clearInterval(intervalRef.current)
+    }
   }, [id])
 
   // Debounced what-if re-simulation when levers change
@@ -114,13 +150,18 @@ export default function Results() {
 
     setWhatIfLoading(true)
     const timer = setTimeout(async () => {
+      const seq = ++whatIfSeq.current
       try {
-        const res = await api.patch(`/projects/${id}/whatif`, levers)
+        const res = await api.patch(`/projects/${id}/whatif`, levers, {
+          headers: { 'X-Client-Id': clientId.current, 'X-Whatif-Seq': seq },
+        })
         setWhatIfResult(res.data)
       } catch (err) {
+        // 409 = superseded by a newer slider state; its response will update the chart
+        if (err.response?.status === 409) return
         console.error('What-if error:', err)
       } finally {
-        setWhatIfLoading(false)
+        if (seq === whatIfSeq.current) setWhatIfLoading(false)
       }
     }, 400)
 